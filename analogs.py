@@ -0,0 +1,136 @@
+"""
+Nearest historical analogs for scenarios
+KD-tree over standardized six-dimensional growth vectors of every country-year
+
+The index is built once from the history store at startup. Unfiltered
+queries use the KD-tree; country-filtered queries scan the (contiguous,
+small) per-country slices directly. The slim runtime skips the KD-tree
+(and the scikit-learn import) and scans every row, with the same results.
+Distances are Euclidean in standard deviation units, and are compared
+against the distribution of
+nearest-neighbour distances within the historical data itself to flag
+scenarios that lie outside anything observed.
+"""
+
+import numpy as np
+
+from history_store import DATA_COLUMNS
+from config import SCENARIO_INPUT_FIELDS, ANALOG_EXTRAPOLATION_PERCENTILE
+
+
+# Scenario input -> dataset column (same order as DATA_COLUMNS after Year)
+INPUT_COLUMNS = dict(zip(SCENARIO_INPUT_FIELDS, DATA_COLUMNS[1:]))
+TARGET_COLUMN = 'GDP_Growth_Rate'
+
+
+class AnalogIndex:
+    """Standardized country-year vectors with a KD-tree and per-country row ranges"""
+
+    # Rows per block when scanning without the KD-tree, and extra candidates
+    # kept from the approximate distances for exact re-ranking
+    SCAN_BLOCK = 512
+    SCAN_MARGIN = 8
+
+    def __init__(self, countries, years, inputs, gdp, country_slices, use_tree=True,
+                 reference_distances=None):
+        self.countries = countries
+        self.years = years
+        self.inputs = inputs
+        self.gdp = gdp
+        self.country_slices = country_slices
+
+        self.mean = inputs.mean(axis=0)
+        self.scale = inputs.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        self.points = (inputs - self.mean) / self.scale
+        self.all_rows = np.arange(len(self.points))
+        self.tree = None
+        if use_tree:
+            from sklearn.neighbors import KDTree
+            self.tree = KDTree(self.points)
+
+        # Typical distance from a historical country-year to its nearest other one
+        # (depends on the data only, so it can be precomputed with a snapshot)
+        if reference_distances is None:
+            reference_distances = np.sort(self._nearest(self.points, 2, self.all_rows)[0][:, 1])
+        self.reference_distances = reference_distances
+        self.extrapolation_distance = float(np.percentile(reference_distances, ANALOG_EXTRAPOLATION_PERCENTILE))
+
+    @classmethod
+    def from_store(cls, store, use_tree=True, reference_distances=None):
+        """Build from a HistoryStore (rows with any missing value are skipped)"""
+        columns = list(INPUT_COLUMNS.values())
+        inputs = np.column_stack([store.column(column) for column in columns])
+        gdp = np.asarray(store.column(TARGET_COLUMN), dtype=np.float64)
+        years = np.asarray(store.column('Year'))
+        valid = np.isfinite(inputs).all(axis=1) & np.isfinite(gdp)
+
+        # Dropping invalid rows keeps each country's rows contiguous
+        row_country = np.empty(len(gdp), dtype=object)
+        slices = {}
+        offset = 0
+        for country in store.countries:
+            start, stop = store.country_rows(country)
+            row_country[start:stop] = country
+            count = int(valid[start:stop].sum())
+            if count:
+                slices[country] = (offset, offset + count)
+                offset += count
+        keep = np.flatnonzero(valid)
+
+        return cls(row_country[keep], years[keep], inputs[keep], gdp[keep], slices, use_tree, reference_distances)
+
+    def __len__(self):
+        return len(self.gdp)
+
+    def standardize(self, inputs):
+        return (np.asarray(inputs, dtype=np.float64) - self.mean) / self.scale
+
+    def query(self, inputs, k, countries=None):
+        """
+        k nearest country-years for each row of inputs (shape (n, 6))
+
+        Returns: (distances, row indices), each shape (n, <=k)
+        """
+        points = self.standardize(inputs)
+        if countries is None:
+            rows = self.all_rows
+        else:
+            rows = np.concatenate([np.arange(*self.country_slices[c]) for c in countries])
+        return self._nearest(points, k, rows)
+
+    def _nearest(self, points, k, rows):
+        """k nearest of the given rows: KD-tree over all rows, blockwise scan otherwise"""
+        k = min(k, len(rows))
+        if self.tree is not None and len(rows) == len(self.points):
+            return self.tree.query(points, k=k)
+
+        # Candidates by |a|^2 + |b|^2 - 2ab (BLAS), then exact distances to rank them
+        n_candidates = min(k + self.SCAN_MARGIN, len(rows))
+        distances = np.empty((len(points), k))
+        indices = np.empty((len(points), k), dtype=np.int64)
+        candidates = self.points[rows]
+        candidate_norms = (candidates ** 2).sum(axis=1)
+        for start in range(0, len(points), self.SCAN_BLOCK):
+            block = points[start:start + self.SCAN_BLOCK]
+            approx = candidate_norms[None, :] - 2 * block @ candidates.T
+            nearest = np.argpartition(approx, n_candidates - 1, axis=1)[:, :n_candidates]
+            d = np.sqrt(((block[:, None, :] - candidates[nearest]) ** 2).sum(axis=2))
+            order = d.argsort(axis=1, kind='stable')[:, :k]
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + len(block)] = np.take_along_axis(d, order, axis=1)
+            indices[start:start + len(block)] = rows[nearest]
+        return distances, indices
+
+    def distance_percentile(self, distances):
+        """Share of historical country-years whose nearest neighbour is closer than `distances`"""
+        return np.searchsorted(self.reference_distances, distances) / len(self.reference_distances)
+
+    def record(self, row, distance):
+        return {
+            'country': self.countries[row],
+            'year': int(self.years[row]),
+            'inputs': {field: round(float(v), 2) for field, v in zip(INPUT_COLUMNS, self.inputs[row])},
+            'actual_gdp_growth': round(float(self.gdp[row]), 2),
+            'distance': round(float(distance), 4)
+        }
@@ -8,14 +8,75 @@ Example: "If exports grow 10% and investment grows 5%, what happens to GDP?"
 This is NOT a forecasting tool - it's a scenario simulator!
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g, send_file
 from flask_cors import CORS
-import joblib
-import pandas as pd
 import numpy as np
 import traceback
+import cProfile
+import hmac
+import json
+import os
+import re
+import time
+import uuid
 
-from config import DATASET_PATH
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from history_store import HistoryStore, DATA_COLUMNS, LEGACY_FIELDS, lttb_indices
+from profiling import StageTimer, start_sampling
+from artifacts import artifact_path, model_path, serving_artifacts
+from conformal import ConformalTable
+from scenario_store import ScenarioStore, artifacts_version
+from validation import validate_scenario_input, validate_scenarios
+from jobs import JobManager, FINAL_STATUSES, ARRAYS_FILE
+from analogs import AnalogIndex, INPUT_COLUMNS
+from shadow import ShadowEvaluator
+from capture import RequestCapture
+from country_resolver import CountryResolver
+from config import (
+    DATASET_PATH,
+    MODEL_BACKEND,
+    DATA_STORE_DIR,
+    SCENARIO_ENCODER_PATH,
+    FEATURE_INFO_PATH,
+    SCENARIO_INPUT_FIELDS,
+    RESPONSE_CURVES_PATH,
+    RESPONSE_META_PATH,
+    CONFORMAL_PATH,
+    BATCH_MAX_SCENARIOS,
+    SCENARIO_DB_PATH,
+    SCENARIO_SET_MAX,
+    JOB_STREAM_INTERVAL,
+    ANALOG_DEFAULT_K,
+    ANALOG_MAX_K,
+    ADMIN_TOKEN,
+    PROFILE_MAX_SECONDS,
+    PROFILE_DEFAULT_INTERVAL_MS,
+    PROFILE_DIR,
+    SLOW_REQUEST_MS,
+    SLIM_RUNTIME,
+    SLIM_HISTORY_DIR,
+    SLIM_ANALOG_REFERENCE_PATH,
+    SLIM_MODEL_PATH,
+    CANDIDATE_BACKEND,
+    CANDIDATE_MODEL_PATH,
+    CANDIDATE_CONFORMAL_PATH,
+    CANDIDATE_TRAFFIC_FRACTION,
+    SHADOW_MODE,
+    CAPTURE_SAMPLE_RATE,
+    CAPTURE_EXCLUDED_PREFIXES
+)
+
+if SLIM_RUNTIME:
+    # Pure NumPy serving: pandas, scikit-learn and joblib are never imported
+    import slim_runtime
+else:
+    import joblib
+    import pandas as pd
+    from model_backends import load_backend
 
 app = Flask(__name__)
 CORS(app)
@@ -24,19 +85,44 @@ CORS(app)
 model = None
 encoder = None
 feature_info = None
-df_history = None
+history_store = None
+response_curves = None
+response_meta = None
+conformal_table = None
+scenario_store = None
+model_version = None
+job_manager = None
+analog_index = None
+candidate_evaluator = None
+candidate_version = None
+candidate_conformal_table = None
+request_capture = None
+country_resolver = None
+
+# Curve index within the response curve array
+RESPONSE_CURVE_KINDS = {'baseline': 0, 'pd': 1, 'ice': 2}
+
+CANDIDATE_INTERVALS_NOTE = ('Served by the candidate model, which has no calibrated prediction intervals; '
+                            'the primary model\'s intervals do not apply')
 
 
 def load_model_and_data():
     """Load scenario model, encoder, and historical data"""
-    global model, encoder, feature_info, df_history
+    global model, encoder, feature_info, history_store, response_curves, response_meta, conformal_table
+    global scenario_store, model_version, job_manager, analog_index
+    global candidate_evaluator, candidate_version, candidate_conformal_table, request_capture, country_resolver
     
     # Load Scenario Model & Encoder
     try:
-        model = joblib.load("gdp_scenario_model.pkl")
-        encoder = joblib.load("country_encoder_scenario.pkl")
-        feature_info = joblib.load("feature_info_scenario.pkl")
-        print(f"✅ Scenario Model loaded")
+        if SLIM_RUNTIME:
+            model = slim_runtime.load_model(MODEL_BACKEND)
+            encoder = slim_runtime.load_encoder()
+            feature_info = slim_runtime.load_feature_info()
+        else:
+            model = load_backend(MODEL_BACKEND)
+            encoder = joblib.load(SCENARIO_ENCODER_PATH)
+            feature_info = joblib.load(FEATURE_INFO_PATH)
+        print(f"✅ Scenario Model loaded ({MODEL_BACKEND}{', slim runtime' if SLIM_RUNTIME else ''})")
         print(f"✅ Encoder loaded")
         print(f"✅ Feature info loaded")
     except Exception as e:
@@ -45,30 +131,186 @@ def load_model_and_data():
         encoder = None
         feature_info = None
     
-    # Load Historical Data
+    # Candidate model for A/B routing and shadow evaluation (same encoder as the primary)
+    if CANDIDATE_BACKEND:
+        try:
+            if SLIM_RUNTIME:
+                candidate_path = CANDIDATE_MODEL_PATH or artifact_path(SLIM_MODEL_PATH, CANDIDATE_BACKEND)
+                candidate = slim_runtime.load_model(CANDIDATE_BACKEND, candidate_path)
+            else:
+                candidate_path = CANDIDATE_MODEL_PATH or model_path(CANDIDATE_BACKEND)
+                candidate = load_backend(CANDIDATE_BACKEND, candidate_path)
+            # Intervals are calibrated per model: a custom candidate artifact never borrows
+            # the default table of its backend
+            candidate_conformal_path = CANDIDATE_CONFORMAL_PATH
+            if candidate_conformal_path is None and CANDIDATE_MODEL_PATH is None:
+                candidate_conformal_path = artifact_path(CONFORMAL_PATH, CANDIDATE_BACKEND)
+            candidate_conformal_table = None
+            if candidate_conformal_path is not None:
+                try:
+                    candidate_conformal_table = ConformalTable.load(candidate_conformal_path)
+                except Exception as e:
+                    print(f"⚠️ Candidate prediction interval table not found. Error: {e}")
+            if candidate_conformal_table is None:
+                print("⚠️ Candidate-served responses will not include prediction intervals")
+            candidate_version = artifacts_version([path for path in (candidate_path, candidate_conformal_path) if path])
+            candidate_evaluator = ShadowEvaluator(candidate, CANDIDATE_TRAFFIC_FRACTION, SHADOW_MODE)
+            print(f"✅ Candidate model loaded ({CANDIDATE_BACKEND}, {candidate_path}): "
+                  f"{CANDIDATE_TRAFFIC_FRACTION:.0%} of traffic, shadow {'on' if SHADOW_MODE else 'off'}")
+        except Exception as e:
+            print(f"⚠️ Candidate model not available. Error: {e}")
+            candidate_evaluator = None
+            candidate_version = None
+            candidate_conformal_table = None
+    
+    # Load conformal interval table (lookup only, no extra inference)
     try:
-        df_history = pd.read_csv(DATASET_PATH)
-        df_history = df_history[[
-            'Country', 'Year', 'GDP_Growth_Rate',
-            'Exports of goods and services_Growth_Rate',
-            'Imports of goods and services_Growth_Rate'
-        ]]
-        df_history.columns = [
-            'Country', 'Year', 'GDP_Growth', 
-            'Exports_Growth', 'Imports_Growth'
-        ]
+        conformal_table = ConformalTable.load(artifact_path(CONFORMAL_PATH, MODEL_BACKEND))
+        print(f"✅ Prediction interval table loaded (levels: {conformal_table.levels})")
+    except Exception as e:
+        print(f"⚠️ Prediction interval table not found. Error: {e}")
+        conformal_table = None
+    
+    # Load Historical Data into the pre-sorted, year-indexed store
+    # (binary per-country store from ingest_data.py when available, CSV otherwise)
+    analog_reference = None
+    try:
+        if os.path.exists(os.path.join(DATA_STORE_DIR, 'index.json')):
+            history_store = HistoryStore.from_directory(DATA_STORE_DIR)
+        elif SLIM_RUNTIME:
+            # Snapshot of DATASET_PATH taken at export time, not an ingested store version
+            history_store = HistoryStore.from_directory(SLIM_HISTORY_DIR)
+            history_store.version = None
+            analog_reference = np.load(SLIM_ANALOG_REFERENCE_PATH)
+        else:
+            history_store = HistoryStore.from_frame(pd.read_csv(DATASET_PATH))
+        year_min, year_max = history_store.year_range
         print(f"✅ Historical data loaded")
-        print(f"   Countries: {df_history['Country'].nunique()}")
-        print(f"   Years: {df_history['Year'].min()} - {df_history['Year'].max()}")
+        print(f"   Countries: {len(history_store.countries)}")
+        print(f"   Years: {year_min} - {year_max}")
     except Exception as e:
         print(f"⚠️ Historical Data Error: {e}")
-        df_history = pd.DataFrame()
+        history_store = None
+    
+    # Country names shared by every endpoint: dataset names, ISO codes, aliases, suggestions
+    country_resolver = CountryResolver(
+        encoder.classes_.tolist() if encoder is not None else [],
+        history_store.countries if history_store is not None else []
+    )
+    print(f"✅ Country resolver built ({len(country_resolver)} names, codes and aliases)")
+    
+    # Nearest-analog index over the historical country-years
+    try:
+        analog_index = AnalogIndex.from_store(history_store, use_tree=not SLIM_RUNTIME,
+                                              reference_distances=analog_reference)
+        print(f"✅ Analog index built ({len(analog_index)} country-years)")
+    except Exception as e:
+        print(f"⚠️ Analog index not available. Error: {e}")
+        analog_index = None
+    
+    # Load precomputed response curves (memory-mapped, never copied)
+    try:
+        response_curves = np.load(artifact_path(RESPONSE_CURVES_PATH, MODEL_BACKEND), mmap_mode='r')
+        with np.load(artifact_path(RESPONSE_META_PATH, MODEL_BACKEND)) as meta:
+            response_meta = {key: meta[key] for key in meta.files}
+        print(f"✅ Response curves loaded")
+        print(f"   Shape: {response_curves.shape}")
+    except Exception as e:
+        print(f"⚠️ Response curves not found. Error: {e}")
+        response_curves = None
+        response_meta = None
+    
+    # Saved scenario sets; cached results are keyed by the model artifacts' content hash
+    try:
+        if SLIM_RUNTIME:
+            model_version = slim_runtime.load_manifest()['models'][MODEL_BACKEND]['model_version']
+        else:
+            model_version = artifacts_version(serving_artifacts(MODEL_BACKEND))
+        scenario_store = ScenarioStore(SCENARIO_DB_PATH)
+        print(f"✅ Scenario store opened: {SCENARIO_DB_PATH} (model version {model_version})")
+    except Exception as e:
+        print(f"⚠️ Scenario store not available. Error: {e}")
+        scenario_store = None
+    
+    # Background jobs (the worker pool starts with the first job)
+    try:
+        job_manager = JobManager(model_version=model_version)
+        print(f"✅ Job queue ready ({job_manager.workers} workers)")
+    except Exception as e:
+        print(f"⚠️ Job queue not available. Error: {e}")
+        job_manager = None
+    
+    # Sampled request capture for replay_traffic.py
+    if CAPTURE_SAMPLE_RATE > 0:
+        try:
+            request_capture = RequestCapture(CAPTURE_SAMPLE_RATE)
+            print(f"✅ Capturing {CAPTURE_SAMPLE_RATE:.1%} of requests to {request_capture.directory}/")
+        except Exception as e:
+            print(f"⚠️ Request capture not available. Error: {e}")
+            request_capture = None
 
 
 # Load on startup
 load_model_and_data()
 
 
+def is_admin_request():
+    """Check the X-Admin-Token header against ADMIN_TOKEN"""
+    token = request.headers.get('X-Admin-Token', '')
+    return ADMIN_TOKEN is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+@app.before_request
+def start_request_timing():
+    """Start stage timing and, if requested by an admin, a cProfile capture"""
+    g.request_start = time.perf_counter()
+    g.stage_timer = StageTimer()
+    g.profiler = None
+    if request.headers.get('X-Profile') and is_admin_request():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def finish_request_timing(response):
+    """Save cProfile captures, log slow requests with their stage timings, sample for replay"""
+    elapsed_ms = (time.perf_counter() - g.request_start) * 1000
+    
+    if g.profiler is not None:
+        g.profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{os.getpid()}.prof"
+        g.profiler.dump_stats(os.path.join(PROFILE_DIR, profile_name))
+        response.headers['X-Profile-File'] = profile_name
+    
+    if elapsed_ms > SLOW_REQUEST_MS and request.endpoint not in ('profile_worker', 'get_profile'):
+        stages = ', '.join(f"{name}={ms:.2f}ms" for name, ms in g.stage_timer.timings.items())
+        print(f"🐢 Slow request: {request.method} {request.path} {elapsed_ms:.2f}ms"
+              f" (status {response.status_code}){' [' + stages + ']' if stages else ''}")
+    
+    if (request_capture is not None and not request.path.startswith(CAPTURE_EXCLUDED_PREFIXES)
+            and request_capture.sampled()):
+        request_capture.record(
+            request.method,
+            request.url_rule.rule if request.url_rule is not None else None,
+            request.path,
+            request.query_string.decode('utf-8', 'replace'),
+            request.get_json(silent=True),
+            request.headers.get('X-Client-Id'),
+            response.status_code,
+            elapsed_ms
+        )
+    
+    if 'model_variant' in g:
+        response.headers['X-Model-Variant'] = g.model_variant
+    
+    response.headers['Server-Timing'] = ', '.join(
+        [f"{name.replace('.', '-')};dur={ms}" for name, ms in g.stage_timer.timings.items()]
+        + [f"total;dur={elapsed_ms:.3f}"]
+    )
+    return response
+
+
 @app.route('/')
 def home():
     """API information"""
@@ -81,13 +323,27 @@ def home():
         'use_case': 'What-if analysis, not forecasting',
         'example': 'If exports grow 10% and investment grows 5%, what happens to GDP?',
         'model_loaded': model is not None,
+        'model': model.metadata() if model is not None else None,
+        'model_version': model_version,
         'encoder_loaded': encoder is not None,
-        'data_loaded': not df_history.empty if df_history is not None else False,
+        'data_loaded': history_store is not None and len(history_store) > 0,
+        'data_version': history_store.version if history_store is not None else None,
         'endpoints': {
             '/': 'GET - API information',
             '/api/countries': 'GET - List all countries',
-            '/api/history': 'GET - Historical data for a country',
-            '/simulate': 'POST - Simulate economic scenario'
+            '/api/history': 'GET - Historical data for one or more countries',
+            '/api/baseline': 'GET - Baseline growth rates for a country',
+            '/api/response-curve': 'GET - GDP response to one input, others at baseline',
+            '/api/analogs': 'GET/POST - Nearest historical country-years to a scenario',
+            '/api/candidate': 'GET - Candidate model A/B routing and shadow disagreement stats',
+            '/simulate': 'POST - Simulate economic scenario',
+            '/simulate/batch': 'POST - Simulate many scenarios in one call',
+            '/api/scenarios': 'GET - List saved scenario sets / POST - Save a scenario set',
+            '/api/scenarios/<name>': 'GET - Export a scenario set / DELETE - Delete it',
+            '/api/scenarios/<name>/run': 'POST - Results for a saved set (cached per model version)',
+            '/jobs': 'GET - List jobs / POST - Submit a sweep, monte_carlo or backtest job',
+            '/jobs/<id>': 'GET - Job status (?stream=1 for NDJSON progress) / DELETE - Cancel',
+            '/jobs/<id>/result': 'GET - Job result summary (?format=npz for the arrays)'
         }
     })
 
@@ -96,96 +352,245 @@ def home():
 def get_countries():
     """Get list of all available countries"""
     try:
-        if df_history is None or df_history.empty:
+        if history_store is None or len(history_store) == 0:
             return jsonify({'error': 'Historical data not available'}), 500
         
-        countries = sorted(df_history['Country'].unique().tolist())
+        countries = list(history_store.countries)
         return jsonify(countries)
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve countries', 'details': str(e)}), 500
 
 
+def _series_to_json(values):
+    """Convert a NumPy series to a JSON-safe list (NaN -> None)"""
+    if values.dtype.kind == 'f':
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    return values.tolist()
+
+
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    """Get historical GDP data for a specific country"""
+    """
+    Get historical data for one or more countries
+    
+    Query parameters:
+        country:   Country name, repeat for several countries (required)
+        year_from: First year to include (optional)
+        year_to:   Last year to include (optional)
+        fields:    Comma-separated columns, any of the nine dataset columns
+                   or their short aliases (default: GDP/Exports/Imports growth)
+        format:    records (default), columnar or arrow
+        points:    Downsample each series to N points with LTTB (optional)
+        downsample_field: Field that drives the downsampling (default: GDP growth)
+    """
     try:
-        country = request.args.get('country')
+        countries = request.args.getlist('country')
         
-        if not country:
+        if not countries or not all(countries):
             return jsonify({'error': 'Missing required parameter: country'}), 400
         
-        if df_history is None or df_history.empty:
+        if history_store is None or len(history_store) == 0:
             return jsonify({'error': 'Historical data not available'}), 500
         
-        country_data = df_history[df_history['Country'] == country].sort_values('Year')
+        fmt = request.args.get('format', 'records')
+        if fmt not in ('records', 'columnar', 'arrow'):
+            return jsonify({
+                'error': f'Invalid format: {fmt}',
+                'available_formats': ['records', 'columnar', 'arrow']
+            }), 400
+        if fmt == 'arrow' and pa is None:
+            return jsonify({'error': 'Arrow format not available (pyarrow is not installed)'}), 501
+        
+        fields = request.args.get('fields')
+        fields = [f.strip() for f in fields.split(',')] if fields else LEGACY_FIELDS
+        fields = [f for f in fields if f not in ('Country', 'Year')]
+        unknown_fields = [f for f in fields if HistoryStore.resolve_field(f) is None]
+        if unknown_fields:
+            return jsonify({
+                'error': f'Unknown fields: {", ".join(unknown_fields)}',
+                'available_fields': DATA_COLUMNS[1:]
+            }), 400
+        
+        try:
+            year_from, year_to, points = (
+                int(request.args[name]) if request.args.get(name) else None
+                for name in ('year_from', 'year_to', 'points')
+            )
+        except ValueError:
+            return jsonify({'error': 'year_from, year_to and points must be integers'}), 400
+        if points is not None and points < 3:
+            return jsonify({'error': 'points must be at least 3 (LTTB keeps the first and last year)'}), 400
+        
+        downsample_field = request.args.get('downsample_field', 'GDP_Growth_Rate')
+        if points is not None and HistoryStore.resolve_field(downsample_field) is None:
+            return jsonify({'error': f'Unknown downsample_field: {downsample_field}'}), 400
+        
+        resolved = country_resolver.resolve_many(countries)
+        missing = [c for c, r in zip(countries, resolved) if r is None or r not in history_store]
+        if missing:
+            return jsonify({
+                'error': f'No data found for country: {", ".join(missing)}',
+                'suggestions': {c: country_resolver.suggest(c) for c in missing}
+            }), 404
+        countries = list(dict.fromkeys(resolved))
         
-        if country_data.empty:
-            return jsonify({'error': f'No data found for country: {country}'}), 404
+        series_by_country = history_store.query(countries, fields, year_from, year_to)
         
-        data_json = country_data.replace({np.nan: None}).to_dict(orient='records')
-        return jsonify(data_json)
+        if points is not None:
+            downsample_column = HistoryStore.resolve_field(downsample_field)
+            for country, series in series_by_country.items():
+                start, stop = history_store.country_rows(country, year_from, year_to)
+                idx = lttb_indices(series['Year'], history_store.column(downsample_column, start, stop), points)
+                series_by_country[country] = {name: values[idx] for name, values in series.items()}
+        
+        if fmt == 'arrow':
+            columns = {
+                'Country': [c for c, s in series_by_country.items() for _ in range(len(s['Year']))],
+                'Year': np.concatenate([s['Year'] for s in series_by_country.values()])
+            }
+            for field in fields:
+                columns[field] = np.concatenate([s[field] for s in series_by_country.values()])
+            table = pa.table(columns)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return app.response_class(sink.getvalue().to_pybytes(), mimetype='application/vnd.apache.arrow.stream')
+        
+        if fmt == 'columnar':
+            return jsonify({
+                'fields': ['Year'] + fields,
+                'countries': {
+                    country: {name: _series_to_json(values) for name, values in series.items()}
+                    for country, series in series_by_country.items()
+                }
+            })
+        
+        # Row-oriented records (original response shape)
+        records = []
+        for country, series in series_by_country.items():
+            columns = {name: _series_to_json(values) for name, values in series.items()}
+            for i in range(len(columns['Year'])):
+                record = {'Country': country}
+                record.update({name: values[i] for name, values in columns.items()})
+                records.append(record)
+        return jsonify(records)
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve historical data', 'details': str(e)}), 500
 
 
-def validate_scenario_input(data):
+# Example scenario returned with validation errors
+SCENARIO_EXAMPLE = {
+    'Country': 'United States',
+    'Population_Growth_Rate': 1.0,
+    'Exports_Growth_Rate': 10.0,
+    'Imports_Growth_Rate': 5.0,
+    'Investment_Growth_Rate': 8.0,
+    'Consumption_Growth_Rate': 3.0,
+    'Govt_Spend_Growth_Rate': 2.0
+}
+
+
+def scenario_features(validated_data, country_code):
+    """Model feature row: country code followed by the six growth rates"""
+    return [country_code] + [validated_data[field] for field in SCENARIO_INPUT_FIELDS]
+
+
+def scenario_summary(validated_data):
+    """Echo of the simulated scenario in the response"""
+    return {
+        'country': validated_data['Country'],
+        'population_growth': validated_data['Population_Growth_Rate'],
+        'exports_growth': validated_data['Exports_Growth_Rate'],
+        'imports_growth': validated_data['Imports_Growth_Rate'],
+        'investment_growth': validated_data['Investment_Growth_Rate'],
+        'consumption_growth': validated_data['Consumption_Growth_Rate'],
+        'govt_spend_growth': validated_data['Govt_Spend_Growth_Rate']
+    }
+
+
+def resolve_scenario_countries(scenarios):
     """
-    Validate incoming scenario simulation request
+    Replace each scenario's Country by its dataset name (any case, ISO code or alias)
     
-    Returns: (is_valid, error_message, validated_data)
+    Returns: (model country codes, indices of countries the model does not know)
     """
-    required_fields = [
-        'Country',
-        'Population_Growth_Rate',
-        'Exports_Growth_Rate',
-        'Imports_Growth_Rate',
-        'Investment_Growth_Rate',
-        'Consumption_Growth_Rate',
-        'Govt_Spend_Growth_Rate'
-    ]
+    names, codes = country_resolver.encode([s['Country'] for s in scenarios])
+    for scenario, name in zip(scenarios, names):
+        if name is not None:
+            scenario['Country'] = name
+    return codes, np.flatnonzero(codes < 0)
+
+
+def unknown_country_error(country):
+    """Error entry for a country the model does not know, with the closest names"""
+    return {
+        'message': f"Country '{country}' not found in training data",
+        'suggestions': country_resolver.suggest(country)
+    }
+
+
+def predict_routed(X):
+    """
+    Predict with the model variant this request is routed to (A/B)
     
-    # Check if data exists
-    if not data:
-        return False, 'Request body is empty', None
+    Requests served by the primary are mirrored to the candidate in the
+    background; the variant is returned in the X-Model-Variant header.
+    """
+    if candidate_evaluator is None:
+        with g.stage_timer.stage('model.predict'):
+            return model.predict_batch(X)
     
-    # Check for missing fields
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return False, f'Missing required fields: {", ".join(missing_fields)}', None
+    variant = candidate_evaluator.route(request.headers.get('X-Client-Id'))
+    served = candidate_evaluator.candidate if variant == 'candidate' else model
+    start = time.perf_counter()
+    with g.stage_timer.stage('model.predict'):
+        predictions = served.predict_batch(X)
+    candidate_evaluator.record_served(variant, (time.perf_counter() - start) * 1000, len(X))
+    if variant == 'primary':
+        candidate_evaluator.mirror(X, predictions)
+    g.model_variant = variant
+    return predictions
+
+
+def served_conformal_table():
+    """
+    Interval table of the model variant that served this request
+
+    Returns: (table or None, note when the candidate served without intervals)
+    """
+    if g.get('model_variant') != 'candidate':
+        return conformal_table, None
+    if candidate_conformal_table is None:
+        return None, CANDIDATE_INTERVALS_NOTE
+    return candidate_conformal_table, None
+
+
+def predict_validated(validated, routed=False):
+    """
+    Predict validated scenarios (countries known to the encoder) in one model call
     
-    validated_data = {}
+    routed: serve through A/B routing (never for results cached per model version)
     
-    # Validate country
-    try:
-        validated_data['Country'] = str(data['Country']).strip()
-        if not validated_data['Country']:
-            return False, 'Country name cannot be empty', None
-    except Exception:
-        return False, 'Invalid Country value', None
-    
-    # Validate numeric fields
-    numeric_fields = [
-        'Population_Growth_Rate',
-        'Exports_Growth_Rate',
-        'Imports_Growth_Rate',
-        'Investment_Growth_Rate',
-        'Consumption_Growth_Rate',
-        'Govt_Spend_Growth_Rate'
-    ]
+    Returns: (predictions, intervals or None, intervals note or None)
+    """
+    with g.stage_timer.stage('country.resolve'):
+        country_codes, _ = resolve_scenario_countries(validated)
     
-    for field in numeric_fields:
-        try:
-            value = float(data[field])
-            
-            # Check for reasonable ranges (-100% to +100%)
-            if not -100 <= value <= 100:
-                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
-            
-            validated_data[field] = value
-        except (ValueError, TypeError):
-            return False, f'Invalid {field} value: must be a number', None
+    X = np.empty((len(validated), 1 + len(SCENARIO_INPUT_FIELDS)), dtype=np.float64)
+    X[:, 0] = country_codes
+    X[:, 1:] = [[v[field] for field in SCENARIO_INPUT_FIELDS] for v in validated]
+    
+    if routed:
+        predictions = predict_routed(X)
+    else:
+        with g.stage_timer.stage('model.predict'):
+            predictions = model.predict_batch(X)
     
-    return True, None, validated_data
+    table, intervals_note = served_conformal_table()
+    intervals = None
+    if table is not None:
+        intervals = table.intervals(country_codes, X[:, 1:], predictions)
+    return predictions, intervals, intervals_note
 
 
 @app.route('/simulate', methods=['POST'])
@@ -211,30 +616,15 @@ def simulate_scenario():
         data = request.get_json()
         
         # Validate input
-        is_valid, error_msg, validated_data = validate_scenario_input(data)
+        with g.stage_timer.stage('validate_scenario_input'):
+            is_valid, error_msg, validated_data = validate_scenario_input(data)
         
         if not is_valid:
             return jsonify({
                 'error': 'Invalid input',
                 'message': error_msg,
-                'required_fields': [
-                    'Country',
-                    'Population_Growth_Rate',
-                    'Exports_Growth_Rate',
-                    'Imports_Growth_Rate',
-                    'Investment_Growth_Rate',
-                    'Consumption_Growth_Rate',
-                    'Govt_Spend_Growth_Rate'
-                ],
-                'example': {
-                    'Country': 'United States',
-                    'Population_Growth_Rate': 1.0,
-                    'Exports_Growth_Rate': 10.0,
-                    'Imports_Growth_Rate': 5.0,
-                    'Investment_Growth_Rate': 8.0,
-                    'Consumption_Growth_Rate': 3.0,
-                    'Govt_Spend_Growth_Rate': 2.0
-                }
+                'required_fields': ['Country'] + SCENARIO_INPUT_FIELDS,
+                'example': SCENARIO_EXAMPLE
             }), 400
         
         # Check if model is loaded
@@ -244,45 +634,40 @@ def simulate_scenario():
                 'message': 'Scenario model is not available. Please train the model first.'
             }), 500
         
-        # Check if country is in encoder
-        try:
-            country_code = encoder.transform([validated_data['Country']])[0]
-        except ValueError:
+        # Resolve the country (dataset name, ISO code or alias) to its model code
+        with g.stage_timer.stage('country.resolve'):
+            country_codes, unknown = resolve_scenario_countries([validated_data])
+        if len(unknown):
             return jsonify({
                 'error': 'Unknown country',
-                'message': f"Country '{validated_data['Country']}' not found in training data",
+                **unknown_country_error(validated_data['Country']),
                 'available_countries': encoder.classes_.tolist()[:10]
             }), 400
+        country_code = int(country_codes[0])
         
         # Prepare features (CURRENT YEAR - no lagging)
-        features = [
-            country_code,
-            validated_data['Population_Growth_Rate'],
-            validated_data['Exports_Growth_Rate'],
-            validated_data['Imports_Growth_Rate'],
-            validated_data['Investment_Growth_Rate'],
-            validated_data['Consumption_Growth_Rate'],
-            validated_data['Govt_Spend_Growth_Rate']
-        ]
+        features = scenario_features(validated_data, country_code)
         
         # Make prediction
-        predicted_gdp = model.predict([features])[0]
+        predicted_gdp = predict_routed(np.array([features], dtype=np.float64))[0]
         
-        return jsonify({
-            'scenario': {
-                'country': validated_data['Country'],
-                'population_growth': validated_data['Population_Growth_Rate'],
-                'exports_growth': validated_data['Exports_Growth_Rate'],
-                'imports_growth': validated_data['Imports_Growth_Rate'],
-                'investment_growth': validated_data['Investment_Growth_Rate'],
-                'consumption_growth': validated_data['Consumption_Growth_Rate'],
-                'govt_spend_growth': validated_data['Govt_Spend_Growth_Rate']
-            },
+        result = {
+            'scenario': scenario_summary(validated_data),
             'predicted_gdp_growth': round(predicted_gdp, 2),
             'model_type': 'Scenario Simulator (Concurrent Indicators)',
             'interpretation': f'If these growth rates occur simultaneously, GDP is predicted to grow by {round(predicted_gdp, 2)}%',
             'note': 'This is a sensitivity analysis tool, not a forecast'
-        })
+        }
+        table, intervals_note = served_conformal_table()
+        if table is not None:
+            result['prediction_intervals'] = table.intervals(
+                [country_code], [features[1:]], [predicted_gdp]
+            )[0]
+        elif intervals_note:
+            result['prediction_intervals'] = None
+            result['intervals_note'] = intervals_note
+        
+        return jsonify(result)
     
     except Exception as e:
         # Log full error for debugging
@@ -296,6 +681,582 @@ def simulate_scenario():
         }), 500
 
 
+@app.route('/simulate/batch', methods=['POST'])
+def simulate_batch():
+    """
+    Simulate many scenarios with a single model call
+    
+    Expected JSON body:
+    {
+        "scenarios": [
+            {"Country": "United States", "Population_Growth_Rate": 1.0, ...},
+            ...
+        ]
+    }
+    
+    Returns one result per scenario, in request order
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Invalid input', 'message': 'Request body must be a JSON object'}), 400
+        scenarios = data.get('scenarios')
+        
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'Request body must contain a non-empty "scenarios" list',
+                'example': {'scenarios': [SCENARIO_EXAMPLE]}
+            }), 400
+        
+        if len(scenarios) > BATCH_MAX_SCENARIOS:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'At most {BATCH_MAX_SCENARIOS} scenarios per request'
+            }), 400
+        
+        # Validate every scenario, report all failures at once
+        validated = []
+        errors = []
+        with g.stage_timer.stage('validate_scenario_input'):
+            for index, scenario in enumerate(scenarios):
+                is_valid, error_msg, validated_data = validate_scenario_input(scenario)
+                if is_valid:
+                    validated.append(validated_data)
+                else:
+                    errors.append({'index': index, 'message': error_msg})
+        if errors:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'{len(errors)} invalid scenario(s)',
+                'errors': errors[:100],
+                'required_fields': ['Country'] + SCENARIO_INPUT_FIELDS
+            }), 400
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Scenario model is not available. Please train the model first.'
+            }), 500
+        
+        with g.stage_timer.stage('country.resolve'):
+            _, unknown = resolve_scenario_countries(validated)
+        if len(unknown):
+            return jsonify({
+                'error': 'Unknown country',
+                'message': f'{len(unknown)} scenario(s) reference countries not in training data',
+                'errors': [{'index': int(i), **unknown_country_error(validated[i]['Country'])} for i in unknown[:100]]
+            }), 400
+        
+        predictions, intervals, intervals_note = predict_validated(validated, routed=True)
+        
+        results = []
+        for i, validated_data in enumerate(validated):
+            result = {
+                'scenario': scenario_summary(validated_data),
+                'predicted_gdp_growth': round(float(predictions[i]), 2)
+            }
+            if intervals is not None:
+                result['prediction_intervals'] = intervals[i]
+            elif intervals_note:
+                result['prediction_intervals'] = None
+            results.append(result)
+        
+        response = {
+            'results': results,
+            'count': len(results),
+            'model_type': 'Scenario Simulator (Concurrent Indicators)',
+            'note': 'This is a sensitivity analysis tool, not a forecast'
+        }
+        if intervals_note:
+            response['intervals_note'] = intervals_note
+        return jsonify(response)
+    
+    except Exception as e:
+        print(f"❌ Batch Simulation Error: {e}")
+        print(traceback.format_exc())
+        
+        return jsonify({
+            'error': 'Simulation failed',
+            'message': 'An unexpected error occurred during batch simulation',
+            'details': str(e)
+        }), 500
+
+
+@app.route('/api/scenarios', methods=['GET'])
+def list_scenario_sets():
+    """List saved scenario sets"""
+    if scenario_store is None:
+        return jsonify({'error': 'Scenario store not available'}), 500
+    return jsonify({'sets': scenario_store.list_sets()})
+
+
+@app.route('/api/scenarios', methods=['POST'])
+def save_scenario_set():
+    """
+    Save (or replace) a named scenario set
+    
+    Expected JSON body (also the format returned by GET /api/scenarios/<name>):
+    {
+        "name": "trade-policy",
+        "description": "optional",
+        "scenarios": [
+            {"label": "optional", "Country": "United States", "Population_Growth_Rate": 1.0, ...},
+            ...
+        ]
+    }
+    """
+    try:
+        if scenario_store is None:
+            return jsonify({'error': 'Scenario store not available'}), 500
+        
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Invalid input', 'message': 'Request body must be a JSON object'}), 400
+        name = str(data.get('name', '')).strip()
+        scenarios = data.get('scenarios')
+        
+        if not name:
+            return jsonify({'error': 'Invalid input', 'message': 'Missing required field: name'}), 400
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'Request body must contain a non-empty "scenarios" list'
+            }), 400
+        if len(scenarios) > SCENARIO_SET_MAX:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'At most {SCENARIO_SET_MAX} scenarios per set'
+            }), 400
+        
+        validated, errors = validate_scenarios(scenarios)
+        if errors:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'{len(errors)} invalid scenario(s)',
+                'errors': errors[:100]
+            }), 400
+        
+        # Stored (and hashed) under dataset names; unknown countries are reported when run
+        resolve_scenario_countries(validated)
+        summary = scenario_store.save_set(name, validated, description=data.get('description'))
+        return jsonify(summary), 201
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to save scenario set', 'details': str(e)}), 500
+
+
+@app.route('/api/scenarios/<name>', methods=['GET'])
+def get_scenario_set(name):
+    """Export a saved scenario set"""
+    if scenario_store is None:
+        return jsonify({'error': 'Scenario store not available'}), 500
+    scenario_set = scenario_store.get_set(name)
+    if scenario_set is None:
+        return jsonify({'error': f'No scenario set named: {name}'}), 404
+    return jsonify(scenario_set)
+
+
+@app.route('/api/scenarios/<name>', methods=['DELETE'])
+def delete_scenario_set(name):
+    """Delete a saved scenario set"""
+    if scenario_store is None:
+        return jsonify({'error': 'Scenario store not available'}), 500
+    if not scenario_store.delete_set(name):
+        return jsonify({'error': f'No scenario set named: {name}'}), 404
+    return jsonify({'deleted': name})
+
+
+@app.route('/api/scenarios/<name>/run', methods=['POST'])
+def run_scenario_set(name):
+    """
+    Results for every scenario of a saved set under the current model
+    
+    Cached results are read in one query; only scenarios without a result
+    for the current model version are predicted (in one batch) and stored.
+    """
+    try:
+        if scenario_store is None:
+            return jsonify({'error': 'Scenario store not available'}), 500
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Scenario model is not available. Please train the model first.'
+            }), 500
+        
+        with g.stage_timer.stage('store.read'):
+            rows = scenario_store.set_results(name, model_version)
+        if rows is None:
+            return jsonify({'error': f'No scenario set named: {name}'}), 404
+        
+        # Compute each missing scenario once, even if the set repeats it
+        missing = {}
+        for row in rows:
+            if row['predicted'] is None:
+                missing.setdefault(row['hash'], row)
+        missing_rows = list(missing.values())
+        unknown = set(resolve_scenario_countries(missing_rows)[1].tolist())
+        to_compute = [row for i, row in enumerate(missing_rows) if i not in unknown]
+        
+        if to_compute:
+            predictions, intervals, _ = predict_validated(to_compute)
+            with g.stage_timer.stage('store.write'):
+                scenario_store.store_results(
+                    model_version, [row['hash'] for row in to_compute], predictions, intervals
+                )
+            for i, row in enumerate(to_compute):
+                row['predicted'] = float(predictions[i])
+                row['intervals'] = intervals[i] if intervals is not None else None
+        
+        results = []
+        for row in rows:
+            computed = missing.get(row['hash'], row)
+            result = {'hash': row['hash'], 'label': row['label'], 'scenario': scenario_summary(row)}
+            if computed['predicted'] is None:
+                result['error'] = f"Country '{row['Country']}' not found in training data"
+            else:
+                result['predicted_gdp_growth'] = round(computed['predicted'], 2)
+                if computed['intervals'] is not None:
+                    result['prediction_intervals'] = computed['intervals']
+            results.append(result)
+        
+        return jsonify({
+            'name': name,
+            'model_version': model_version,
+            'count': len(results),
+            'cached': sum(1 for row in rows if row['hash'] not in missing),
+            'computed': len(to_compute),
+            'results': results
+        })
+    
+    except Exception as e:
+        print(f"❌ Scenario Set Error: {e}")
+        print(traceback.format_exc())
+        return jsonify({'error': 'Failed to run scenario set', 'details': str(e)}), 500
+
+
+def prepare_job_params(job_type, params):
+    """
+    Resolve the country of sweep / monte_carlo jobs and fill unspecified
+    inputs from its history: base and mean default to the historical mean,
+    std to the historical standard deviation
+    
+    Returns: (params, error message or None)
+    """
+    if job_type not in ('sweep', 'monte_carlo'):
+        return params, None
+    
+    country = str(params.get('Country', '')).strip()
+    if not country:
+        return None, 'Missing required parameter: Country'
+    scenario = {'Country': country}
+    codes, unknown = resolve_scenario_countries([scenario])
+    if len(unknown):
+        return None, f"Country '{country}' not found in training data"
+    
+    country = scenario['Country']
+    params = {**params, 'Country': country, 'country_code': int(codes[0])}
+    if history_store is None or country not in history_store:
+        return params, None
+    
+    means = history_store.baseline(country)
+    start, stop = history_store.country_rows(country)
+    for key in (['base'] if job_type == 'sweep' else ['mean', 'std']):
+        given = params.get(key) or {}
+        filled = {}
+        for field, column in INPUT_COLUMNS.items():
+            if field in given:
+                filled[field] = given[field]
+            elif key == 'std':
+                filled[field] = round(float(np.nanstd(history_store.column(column, start, stop))), 4)
+            else:
+                filled[field] = round(float(means[column]), 4)
+        params[key] = filled
+    return params, None
+
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List recent jobs"""
+    if job_manager is None:
+        return jsonify({'error': 'Job queue not available'}), 500
+    return jsonify({'jobs': job_manager.list()})
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submit a long-running job; returns immediately with the job id
+    
+    Expected JSON body:
+    {"type": "sweep", "params": {"Country": "India", "axes": [{"field": "Exports_Growth_Rate", "min": -20, "max": 20, "steps": 401}]}}
+    {"type": "monte_carlo", "params": {"Country": "India", "samples": 1000000}}
+    {"type": "backtest", "params": {"backend": "random_forest", "start_year": 2010}}
+    """
+    try:
+        if job_manager is None:
+            return jsonify({'error': 'Job queue not available'}), 500
+        
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Invalid input', 'message': 'Request body must be a JSON object'}), 400
+        job_type = data.get('type')
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'Invalid input', 'message': '"params" must be an object'}), 400
+        
+        params, error_msg = prepare_job_params(job_type, params)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        try:
+            job, deduplicated = job_manager.submit(job_type, params)
+        except ValueError as e:
+            return jsonify({'error': 'Invalid input', 'message': str(e)}), 400
+        
+        return jsonify({'job': job, 'deduplicated': deduplicated}), 202
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to submit job', 'details': str(e)}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Job status and progress
+    
+    With ?stream=1 the response is NDJSON: one status line whenever progress
+    changes, ending with the final status.
+    """
+    if job_manager is None:
+        return jsonify({'error': 'Job queue not available'}), 500
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f'No job with id: {job_id}'}), 404
+    
+    if request.args.get('stream', '').lower() not in ('1', 'true'):
+        return jsonify(job)
+    
+    def stream():
+        last = None
+        while True:
+            current = job_manager.get(job_id)
+            state = (current['status'], current['chunks_done'])
+            if state != last:
+                yield json.dumps(current) + '\n'
+                last = state
+            if current['status'] in FINAL_STATUSES:
+                return
+            time.sleep(JOB_STREAM_INTERVAL)
+    
+    return Response(stream(), mimetype='application/x-ndjson')
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    if job_manager is None:
+        return jsonify({'error': 'Job queue not available'}), 500
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': f'No job with id: {job_id}'}), 404
+    return jsonify(job)
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Result summary of a finished job; ?format=npz downloads the full arrays"""
+    if job_manager is None:
+        return jsonify({'error': 'Job queue not available'}), 500
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f'No job with id: {job_id}'}), 404
+    if job['status'] != 'done':
+        return jsonify({
+            'error': 'Result not available',
+            'message': f"Job is {job['status']}",
+            'job': job
+        }), 409
+    
+    if request.args.get('format') == 'npz':
+        return send_file(
+            os.path.abspath(job_manager.result_path(job_id, ARRAYS_FILE)),
+            mimetype='application/octet-stream',
+            as_attachment=True,
+            download_name=f'{job_id}.npz'
+        )
+    with open(job_manager.result_path(job_id)) as f:
+        summary = json.load(f)
+    return jsonify({'job': job, 'result': summary})
+
+
+def parse_analog_inputs(data):
+    """
+    The six growth-rate inputs of an analog query
+    
+    Returns: (list of floats in model order, error message or None)
+    """
+    if not isinstance(data, dict):
+        return None, 'Each scenario must be an object'
+    missing = [field for field in SCENARIO_INPUT_FIELDS if data.get(field) in (None, '')]
+    if missing:
+        return None, f'Missing required fields: {", ".join(missing)}'
+    values = []
+    for field in SCENARIO_INPUT_FIELDS:
+        try:
+            value = float(data[field])
+        except (ValueError, TypeError):
+            return None, f'Invalid {field} value: must be a number'
+        if not np.isfinite(value):
+            return None, f'Invalid {field} value: must be a number'
+        if not -100 <= value <= 100:
+            return None, f'{field} value {value} is outside reasonable range (-100 to 100)'
+        values.append(value)
+    return values, None
+
+
+def find_analogs(inputs, k, countries=None):
+    """Nearest country-years plus the extrapolation check, per row of inputs"""
+    distances, rows = analog_index.query(inputs, k, countries)
+    percentiles = analog_index.distance_percentile(distances[:, 0])
+    return [
+        {
+            'analogs': [analog_index.record(r, d) for r, d in zip(row_ids, row_distances)],
+            'nearest_distance': round(float(row_distances[0]), 4),
+            'distance_percentile': round(float(percentile), 4),
+            'extrapolation': bool(row_distances[0] > analog_index.extrapolation_distance)
+        }
+        for row_ids, row_distances, percentile in zip(rows, distances, percentiles)
+    ]
+
+
+@app.route('/api/analogs', methods=['GET', 'POST'])
+def get_analogs():
+    """
+    Nearest historical country-years to a scenario's growth rates
+    
+    GET:  /api/analogs?Population_Growth_Rate=1&Exports_Growth_Rate=10&...&k=5[&country=India&country=China]
+    POST: {"scenarios": [{...six growth rates..., "Country": "India"}, ...],
+           "k": 5, "countries": ["India", "China"], "same_country": false}
+    
+    Distances are in standard-deviation units; 'extrapolation' is true when
+    the nearest analog is further away than ANALOG_EXTRAPOLATION_PERCENTILE
+    of historical country-years are from their own nearest neighbour.
+    """
+    try:
+        if analog_index is None:
+            return jsonify({'error': 'Analog index not available'}), 500
+        
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return jsonify({'error': 'Invalid input', 'message': 'Request body must be a JSON object'}), 400
+            scenarios = data.get('scenarios')
+            countries = data.get('countries') or None  # [] means no filter, as on GET
+            same_country = bool(data.get('same_country', False))
+            k = data.get('k', ANALOG_DEFAULT_K)
+        else:
+            scenarios = [request.args.to_dict()]
+            countries = request.args.getlist('country') or None
+            same_country = False
+            k = request.args.get('k', ANALOG_DEFAULT_K)
+        
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'Request body must contain a non-empty "scenarios" list'
+            }), 400
+        if len(scenarios) > BATCH_MAX_SCENARIOS:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'At most {BATCH_MAX_SCENARIOS} scenarios per request'
+            }), 400
+        
+        try:
+            k = int(k)
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid input', 'message': 'k must be an integer'}), 400
+        if not 1 <= k <= ANALOG_MAX_K:
+            return jsonify({'error': 'Invalid input', 'message': f'k must be between 1 and {ANALOG_MAX_K}'}), 400
+        
+        if countries is not None:
+            if not isinstance(countries, list):
+                countries = [countries]
+            countries = [str(c).strip() for c in countries]
+            resolved = country_resolver.resolve_many(countries)
+            unknown = [c for c, r in zip(countries, resolved) if r not in analog_index.country_slices]
+            if unknown:
+                return jsonify({
+                    'error': f'No data found for country: {", ".join(unknown)}',
+                    'suggestions': {c: country_resolver.suggest(c) for c in unknown}
+                }), 404
+            countries = list(dict.fromkeys(resolved))
+        
+        inputs = []
+        errors = []
+        scenario_countries = []
+        for index, scenario in enumerate(scenarios):
+            values, error_msg = parse_analog_inputs(scenario)
+            country = country_resolver.resolve(str(scenario.get('Country', '')).strip()) if same_country and not error_msg else None
+            if error_msg:
+                errors.append({'index': index, 'message': error_msg})
+            elif same_country and country not in analog_index.country_slices:
+                errors.append({'index': index, 'message': 'same_country needs a Country with historical data'})
+            else:
+                inputs.append(values)
+                scenario_countries.append(country)
+        if errors:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'{len(errors)} invalid scenario(s)',
+                'errors': errors[:100],
+                'required_fields': SCENARIO_INPUT_FIELDS
+            }), 400
+        inputs = np.asarray(inputs, dtype=np.float64)
+        
+        with g.stage_timer.stage('analogs.query'):
+            if same_country:
+                results = [None] * len(inputs)
+                scenario_countries = np.array(scenario_countries, dtype=object)
+                for country in np.unique(scenario_countries):
+                    idx = np.flatnonzero(scenario_countries == country)
+                    for i, result in zip(idx, find_analogs(inputs[idx], k, [country])):
+                        results[i] = result
+            else:
+                results = find_analogs(inputs, k, countries)
+        
+        if request.method == 'GET':
+            return jsonify({**results[0], 'k': k, 'countries': countries})
+        return jsonify({'results': results, 'count': len(results), 'k': k})
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to find analogs', 'details': str(e)}), 500
+
+
+@app.route('/api/candidate', methods=['GET'])
+def get_candidate_stats():
+    """
+    Candidate model evaluation: per-variant request counts and latency
+    percentiles (A/B), and shadow disagreement with the primary
+    """
+    if candidate_evaluator is None:
+        return jsonify({
+            'error': 'No candidate model',
+            'message': 'Set CANDIDATE_BACKEND (and optionally CANDIDATE_MODEL_PATH) to evaluate a candidate'
+        }), 404
+
+    return jsonify({
+        'primary': {'backend': MODEL_BACKEND, 'model_version': model_version},
+        'candidate': {
+            'backend': CANDIDATE_BACKEND,
+            'model_version': candidate_version,
+            'model': candidate_evaluator.candidate.metadata()
+        },
+        **candidate_evaluator.stats()
+    })
+
+
 @app.route('/api/baseline', methods=['GET'])
 def get_baseline():
     """
@@ -308,23 +1269,28 @@ def get_baseline():
         if not country:
             return jsonify({'error': 'Missing required parameter: country'}), 400
         
-        # Load full dataset
-        df = pd.read_csv(DATASET_PATH)
-        country_data = df[df['Country'] == country]
+        if history_store is None or len(history_store) == 0:
+            return jsonify({'error': 'Historical data not available'}), 500
         
-        if country_data.empty:
-            return jsonify({'error': f'No data found for country: {country}'}), 404
+        resolved = country_resolver.resolve(country)
+        if resolved is None or resolved not in history_store:
+            return jsonify({
+                'error': f'No data found for country: {country}',
+                'suggestions': country_resolver.suggest(country)
+            }), 404
+        country = resolved
         
-        # Calculate average growth rates
+        # Precomputed per-country means (computed from the store if not precomputed)
+        means = history_store.baseline(country)
         baseline = {
             'country': country,
             'baseline_rates': {
-                'population': round(country_data['Population_Growth_Rate'].mean(), 2),
-                'exports': round(country_data['Exports of goods and services_Growth_Rate'].mean(), 2),
-                'imports': round(country_data['Imports of goods and services_Growth_Rate'].mean(), 2),
-                'investment': round(country_data['Gross capital formation_Growth_Rate'].mean(), 2),
-                'consumption': round(country_data['Final consumption expenditure_Growth_Rate'].mean(), 2),
-                'govt_spend': round(country_data['Government_Expenditure_Growth_Rate'].mean(), 2)
+                'population': round(means['Population_Growth_Rate'], 2),
+                'exports': round(means['Exports of goods and services_Growth_Rate'], 2),
+                'imports': round(means['Imports of goods and services_Growth_Rate'], 2),
+                'investment': round(means['Gross capital formation_Growth_Rate'], 2),
+                'consumption': round(means['Final consumption expenditure_Growth_Rate'], 2),
+                'govt_spend': round(means['Government_Expenditure_Growth_Rate'], 2)
             },
             'note': 'These are historical averages. Use as baseline for scenario simulations.'
         }
@@ -335,6 +1301,205 @@ def get_baseline():
         return jsonify({'error': 'Failed to calculate baseline', 'details': str(e)}), 500
 
 
+@app.route('/api/response-curve', methods=['GET'])
+def get_response_curve():
+    """
+    Get the precomputed GDP response to one or more scenario inputs
+    
+    Query parameters:
+        country: Country name (required)
+        input:   Scenario input field, e.g. Exports_Growth_Rate (default: all)
+        kind:    baseline (others at country mean), pd or ice (default: baseline)
+        values:  Comma-separated input values to interpolate at (default: grid)
+    
+    Curves are served from memory with linear interpolation - the model
+    is never evaluated at request time.
+    """
+    try:
+        country = request.args.get('country')
+        input_field = request.args.get('input')
+        kind = request.args.get('kind', 'baseline')
+        values = request.args.get('values')
+        
+        if not country:
+            return jsonify({'error': 'Missing required parameter: country'}), 400
+        
+        if response_curves is None or encoder is None:
+            return jsonify({
+                'error': 'Response curves not available',
+                'message': 'Please train the model first.'
+            }), 500
+        
+        if kind not in RESPONSE_CURVE_KINDS:
+            return jsonify({
+                'error': f'Invalid kind: {kind}',
+                'available_kinds': list(RESPONSE_CURVE_KINDS)
+            }), 400
+        
+        if input_field is None:
+            input_fields = SCENARIO_INPUT_FIELDS
+        elif input_field in SCENARIO_INPUT_FIELDS:
+            input_fields = [input_field]
+        else:
+            return jsonify({
+                'error': f'Invalid input: {input_field}',
+                'available_inputs': SCENARIO_INPUT_FIELDS
+            }), 400
+        
+        x_query = None
+        if values:
+            try:
+                x_query = np.array([float(v) for v in values.split(',')])
+            except ValueError:
+                return jsonify({'error': 'Invalid values: must be comma-separated numbers'}), 400
+            if not np.isfinite(x_query).all():
+                return jsonify({'error': 'Invalid values: must be comma-separated finite numbers'}), 400
+        
+        names, codes = country_resolver.encode([country])
+        country_code = codes[0]
+        if country_code < 0:
+            return jsonify({
+                'error': f'No data found for country: {country}',
+                'suggestions': country_resolver.suggest(country)
+            }), 404
+        country = names[0]
+        
+        grid = response_meta['grid']
+        baselines = response_meta['baselines'][country_code]
+        ice_years = response_meta['ice_years'][country_code]
+        ice_years = ice_years[ice_years >= 0]
+        
+        curves = {}
+        for field in input_fields:
+            j = SCENARIO_INPUT_FIELDS.index(field)
+            x_grid = grid[j]
+            if kind == 'ice':
+                y_grid = response_curves[country_code, j, 2:2 + len(ice_years)]
+            else:
+                y_grid = response_curves[country_code, j, RESPONSE_CURVE_KINDS[kind]][None, :]
+            
+            if x_query is None:
+                x_out = x_grid
+                y_out = np.asarray(y_grid)
+            else:
+                x_out = x_query
+                y_out = np.array([np.interp(x_query, x_grid, y) for y in y_grid])
+            
+            curve = {
+                'x': np.round(x_out.astype(float), 4).tolist(),
+                'baseline_value': round(float(baselines[j]), 4),
+                'grid_range': [round(float(x_grid[0]), 4), round(float(x_grid[-1]), 4)]
+            }
+            if kind == 'ice':
+                curve['y'] = np.round(y_out.astype(float), 4).tolist()
+            else:
+                curve['y'] = np.round(y_out[0].astype(float), 4).tolist()
+            if x_query is not None:
+                # np.interp holds the end values outside the precomputed grid
+                curve['clamped'] = bool(((x_query < x_grid[0]) | (x_query > x_grid[-1])).any())
+            curves[field] = curve
+        
+        result = {
+            'country': country,
+            'kind': kind,
+            'curves': curves
+        }
+        if kind == 'ice':
+            result['ice_years'] = ice_years.tolist()
+        
+        return jsonify(result)
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to retrieve response curve', 'details': str(e)}), 500
+
+
+# Stack sampler running in this worker (one at a time)
+profile_sampler = None
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9]+-[0-9a-f]{8}$')
+
+
+@app.route('/admin/profile', methods=['POST'])
+def profile_worker():
+    """
+    Start the sampling profiler on this worker; poll /admin/profile/<id> for the result
+    
+    Parameters (JSON body or query string):
+        seconds:     Sampling duration (default 5, max PROFILE_MAX_SECONDS)
+        interval_ms: Sampling interval in milliseconds (default 5)
+    
+    Requires the X-Admin-Token header. Sampling runs on a background thread,
+    so the worker keeps serving requests (which are what gets sampled). The
+    result is written to PROFILE_DIR and can be fetched through any worker
+    on the host; it can be fed directly to flamegraph.pl or opened in speedscope.
+    """
+    global profile_sampler
+    if ADMIN_TOKEN is None:
+        return not_found(None)
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden', 'message': 'Invalid or missing X-Admin-Token'}), 403
+    
+    data = request.get_json(silent=True) or request.args
+    if not hasattr(data, 'get'):
+        return jsonify({'error': 'Invalid input', 'message': 'Request body must be a JSON object'}), 400
+    try:
+        seconds = float(data.get('seconds', 5))
+        interval_ms = float(data.get('interval_ms', PROFILE_DEFAULT_INTERVAL_MS))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'seconds and interval_ms must be numbers'}), 400
+    
+    if not 0 < seconds <= PROFILE_MAX_SECONDS or interval_ms <= 0:
+        return jsonify({
+            'error': f'seconds must be in (0, {PROFILE_MAX_SECONDS}] and interval_ms positive'
+        }), 400
+    
+    if profile_sampler is not None and profile_sampler.is_alive():
+        return jsonify({'error': 'Profiler busy', 'message': 'This worker is already being sampled'}), 409
+    
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    profile_sampler = start_sampling(seconds, interval_ms / 1000,
+                                     os.path.join(PROFILE_DIR, f'{profile_id}.collapsed'))
+    return jsonify({
+        'profile_id': profile_id,
+        'pid': os.getpid(),
+        'seconds': seconds,
+        'interval_ms': interval_ms,
+        'result': f'/admin/profile/{profile_id}'
+    }), 202
+
+
+@app.route('/admin/profile/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    Collapsed stacks of a finished sampling run (202 while it is still sampling)
+    """
+    if ADMIN_TOKEN is None:
+        return not_found(None)
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden', 'message': 'Invalid or missing X-Admin-Token'}), 403
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return jsonify({'error': f'Profile not found: {profile_id}'}), 404
+    
+    path = os.path.join(PROFILE_DIR, f'{profile_id}.collapsed')
+    if os.path.exists(path + '.json'):
+        with open(path + '.json') as f:
+            rounds = json.load(f)['samples']
+        response = send_file(os.path.abspath(path), mimetype='text/plain', as_attachment=True,
+                             download_name=f'profile-{profile_id}.collapsed')
+        response.headers['X-Profile-Samples'] = str(rounds)
+        return response
+    if os.path.exists(path + '.running'):
+        with open(path + '.running') as f:
+            running = json.load(f)
+        return jsonify({
+            'profile_id': profile_id,
+            'status': 'running',
+            'remaining_seconds': round(max(running['until'] - time.time(), 0.0), 3)
+        }), 202
+    return jsonify({'error': f'Profile not found: {profile_id}'}), 404
+
+
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors"""
@@ -342,7 +1507,8 @@ def not_found(e):
         'error': 'Endpoint not found',
         'message': 'The requested endpoint does not exist',
         'available_endpoints': [
-            '/', '/api/countries', '/api/history', '/simulate', '/api/baseline'
+            '/', '/api/countries', '/api/history', '/simulate', '/simulate/batch',
+            '/api/baseline', '/api/response-curve', '/api/analogs', '/api/candidate', '/api/scenarios', '/jobs'
         ]
     }), 404
 
@@ -0,0 +1,31 @@
+"""
+Artifact naming shared by training, serving and the slim runtime
+(kept free of scikit-learn / pandas imports)
+"""
+
+import os
+
+from config import SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH, CONFORMAL_PATH
+
+
+def artifact_path(path, name):
+    """
+    Per-backend variant of a model-dependent artifact path
+
+    The random forest keeps the original file names; other backends get a
+    suffix, e.g. gdp_scenario_model_linear.pkl.
+    """
+    if name == 'random_forest':
+        return path
+    root, ext = os.path.splitext(path)
+    return f'{root}_{name}{ext}'
+
+
+def model_path(name):
+    """Model artifact path for a backend"""
+    return artifact_path(SCENARIO_MODEL_PATH, name)
+
+
+def serving_artifacts(name):
+    """Files whose content determines the served predictions of a backend"""
+    return [model_path(name), SCENARIO_ENCODER_PATH, artifact_path(CONFORMAL_PATH, name)]
@@ -0,0 +1,127 @@
+"""
+GDP Economic Scenario Simulator - Backend Benchmark
+Accuracy vs latency comparison of every model backend on the same folds
+
+Usage:
+    python benchmark_backends.py
+    python benchmark_backends.py --folds 3 --backends random_forest linear --json results.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+warnings.filterwarnings('ignore')
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold
+from sklearn.metrics import r2_score, mean_absolute_error
+
+from model_backends import BACKENDS, get_backend
+from train_scenario_model import prepare_features
+from config import DATASET_PATH
+
+
+def median_time(fn, repeats):
+    """Median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def benchmark_backend(name, X, y, folds, batch_rows=10000, single_repeats=200, batch_repeats=5):
+    """Cross-validated accuracy plus artifact size, load time and predict latency"""
+    backend_cls = get_backend(name)
+    r2_scores, mae_scores = [], []
+    fit_times = []
+
+    for train_idx, test_idx in folds:
+        start = time.perf_counter()
+        backend = backend_cls().fit(X[train_idx], y[train_idx])
+        fit_times.append(time.perf_counter() - start)
+        y_pred = backend.predict_batch(X[test_idx])
+        r2_scores.append(r2_score(y[test_idx], y_pred))
+        mae_scores.append(mean_absolute_error(y[test_idx], y_pred))
+
+    # Serving characteristics of the last fold's model
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, f'{name}.pkl')
+        backend.save(path)
+        artifact_mb = os.path.getsize(path) / 1e6
+        load_ms = median_time(lambda: joblib.load(path), repeats=5)
+
+    rng = np.random.default_rng(42)
+    single_row = X[:1]
+    batch = X[rng.integers(0, len(X), size=batch_rows)]
+    backend.predict_batch(single_row)  # warm-up
+    single_ms = median_time(lambda: backend.predict_batch(single_row), single_repeats)
+    batch_ms = median_time(lambda: backend.predict_batch(batch), batch_repeats)
+
+    return {
+        'backend': name,
+        'r2': float(np.mean(r2_scores)),
+        'r2_std': float(np.std(r2_scores)),
+        'mae': float(np.mean(mae_scores)),
+        'fit_s': float(np.mean(fit_times)),
+        'artifact_mb': artifact_mb,
+        'load_ms': load_ms,
+        'predict_1_ms': single_ms,
+        f'predict_{batch_rows // 1000}k_ms': batch_ms
+    }
+
+
+def print_table(results):
+    """Print results as a fixed-width table"""
+    columns = list(results[0].keys())
+    rows = [
+        [f'{value:.4f}' if isinstance(value, float) else str(value) for value in row.values()]
+        for row in results
+    ]
+    widths = [max(len(col), *(len(row[i]) for row in rows)) for i, col in enumerate(columns)]
+    print('  '.join(col.rjust(w) for col, w in zip(columns, widths)))
+    print('  '.join('-' * w for w in widths))
+    for cells in rows:
+        print('  '.join(cell.rjust(w) for cell, w in zip(cells, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark model backends on identical folds')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP ECONOMIC SCENARIO SIMULATOR - Backend Benchmark")
+    print("=" * 60)
+
+    df = pd.read_csv(DATASET_PATH)
+    X, y, _, _ = prepare_features(df, fit_encoder=True)
+    X = X.to_numpy(dtype=np.float64)
+    y = y.to_numpy(dtype=np.float64)
+    folds = list(KFold(n_splits=args.folds, shuffle=True, random_state=42).split(X))
+    print(f"\n📂 {len(X)} samples, {args.folds} folds (shared by every backend)\n")
+
+    results = []
+    for name in args.backends:
+        print(f"🤖 Benchmarking {name}...")
+        results.append(benchmark_backend(name, X, y, folds))
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
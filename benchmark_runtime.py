@@ -0,0 +1,208 @@
+"""
+GDP Economic Scenario Simulator - Serving Runtime Benchmark
+Cold start, memory and output parity of the full and slim serving runtimes
+
+Each measurement runs in a fresh interpreter (SLIM_RUNTIME=0 / 1): the time
+to import app_scenario (modules plus artifact loading), the resident set
+size afterwards, and warm /simulate latency. The responses of a fixed set
+of requests are captured in both runtimes and compared.
+
+Usage:
+    python train_scenario_model.py --export-slim   # once, after training
+    python benchmark_runtime.py --repeats 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+HEAVY_MODULES = ['pandas', 'sklearn', 'joblib', 'scipy']
+
+SCENARIO = {
+    'Country': 'India',
+    'Population_Growth_Rate': 1.2,
+    'Exports_Growth_Rate': 6.0,
+    'Imports_Growth_Rate': 5.0,
+    'Investment_Growth_Rate': 15.0,
+    'Consumption_Growth_Rate': 4.0,
+    'Govt_Spend_Growth_Rate': 3.0
+}
+
+
+def parity_requests(countries):
+    """
+    Fixed request set covering every read-only endpoint
+
+    Returns (method, url, body, expected status) tuples
+    """
+    rng = np.random.default_rng(0)
+    inputs = {k: v for k, v in SCENARIO.items() if k != 'Country'}
+    batch = [
+        {'Country': str(rng.choice(countries)),
+         **{field: round(float(rng.uniform(-20, 20)), 3) for field in inputs}}
+        for _ in range(2000)
+    ]
+    return [
+        ('GET', '/', None, 200),
+        ('GET', '/api/countries', None, 200),
+        ('GET', '/api/history?country=India', None, 200),
+        ('GET', '/api/history?country=India&country=China&fields=GDP_Growth,Exports_Growth&format=columnar',
+         None, 200),
+        ('GET', '/api/baseline?country=India', None, 200),
+        ('GET', '/api/response-curve?country=India&input=Exports_Growth_Rate&kind=ice', None, 200),
+        ('POST', '/simulate', SCENARIO, 200),
+        ('POST', '/simulate', {**SCENARIO, 'Country': 'Nowhere'}, 400),
+        ('POST', '/simulate/batch', {'scenarios': batch}, 200),
+        ('GET', '/api/analogs?' + '&'.join(f'{k}={v}' for k, v in inputs.items()) + '&k=10', None, 200),
+        ('POST', '/api/analogs', {'scenarios': batch[:500], 'k': 5}, 200),
+        ('POST', '/api/analogs', {'scenarios': batch[:200], 'k': 3, 'same_country': True}, 200)
+    ]
+
+
+def rss_mb():
+    """Current and peak resident set size (MB) from /proc"""
+    status = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.strip()
+    return int(status['VmRSS'].split()[0]) / 1024, int(status['VmHWM'].split()[0]) / 1024
+
+
+def child(capture_path):
+    """Runs inside the measured interpreter"""
+    start = time.perf_counter()
+    import app_scenario
+    startup_ms = (time.perf_counter() - start) * 1000
+    rss_after_start, _ = rss_mb()
+
+    client = app_scenario.app.test_client()
+    client.post('/simulate', json=SCENARIO)
+    timings = []
+    for _ in range(200):
+        t = time.perf_counter()
+        client.post('/simulate', json=SCENARIO)
+        timings.append((time.perf_counter() - t) * 1000)
+
+    result = {
+        'startup_ms': startup_ms,
+        'rss_mb': rss_after_start,
+        'simulate_ms': float(np.median(timings)),
+        'modules': len(sys.modules),
+        'heavy_modules': [m for m in HEAVY_MODULES if m in sys.modules]
+    }
+
+    if capture_path:
+        responses = []
+        for method, url, body, expected in parity_requests(app_scenario.encoder.classes_.tolist()):
+            response = client.open(url, method=method, json=body)
+            responses.append({'request': f'{method} {url[:60]}', 'expected': expected,
+                              'status': response.status_code, 'body': response.get_json()})
+        with open(capture_path, 'w') as f:
+            json.dump(responses, f)
+    result['peak_rss_mb'] = rss_mb()[1]
+    print(json.dumps(result))
+
+
+def run_child(slim, capture_path, work_dir):
+    env = {
+        **os.environ,
+        'SLIM_RUNTIME': '1' if slim else '0',
+        'JOBS_DIR': os.path.join(work_dir, 'jobs'),
+        'SCENARIO_DB_PATH': os.path.join(work_dir, 'scenarios.db'),
+        'SLOW_REQUEST_MS': '1e9'
+    }
+    command = [sys.executable, __file__, '--child']
+    if capture_path:
+        command += ['--capture', capture_path]
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare_responses(full_path, slim_path):
+    """
+    Return the requests that failed in either runtime or whose bodies differ
+
+    A request only counts as identical when both runtimes answered it with its
+    expected status, so two matching error responses are not parity
+    """
+    with open(full_path) as f:
+        full = json.load(f)
+    with open(slim_path) as f:
+        slim = json.load(f)
+    mismatches = []
+    for a, b in zip(full, slim):
+        if a['status'] != a['expected'] or b['status'] != b['expected']:
+            mismatches.append(f"{a['request']} (status {a['status']} full, {b['status']} slim, "
+                              f"expected {a['expected']})")
+        elif a['body'] != b['body']:
+            mismatches.append(a['request'])
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the full and slim serving runtimes')
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreters per runtime')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--capture', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.capture)
+        return
+
+    print("=" * 60)
+    print("GDP ECONOMIC SCENARIO SIMULATOR - Serving Runtime Benchmark")
+    print("=" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        captures = {}
+        for name, slim in (('full', False), ('slim', True)):
+            print(f"\n🚀 {name} runtime: {args.repeats} cold starts...")
+            captures[name] = os.path.join(work_dir, f'{name}.json')
+            runs = [run_child(slim, captures[name] if i == 0 else None, work_dir) for i in range(args.repeats)]
+            results[name] = {
+                'startup_ms': float(np.median([r['startup_ms'] for r in runs])),
+                'rss_mb': float(np.median([r['rss_mb'] for r in runs])),
+                'peak_rss_mb': runs[0]['peak_rss_mb'],
+                'simulate_ms': float(np.median([r['simulate_ms'] for r in runs])),
+                'modules': runs[0]['modules'],
+                'heavy_modules': runs[0]['heavy_modules']
+            }
+        mismatches = compare_responses(captures['full'], captures['slim'])
+
+    print(f"\n{'':>22}{'full':>12}{'slim':>12}")
+    for key, label in (('startup_ms', 'import + load (ms)'), ('rss_mb', 'RSS after start (MB)'),
+                       ('peak_rss_mb', 'peak RSS (MB)'), ('simulate_ms', '/simulate warm (ms)'),
+                       ('modules', 'modules imported')):
+        print(f"{label:>22}{results['full'][key]:>12.1f}{results['slim'][key]:>12.1f}")
+    for name in ('full', 'slim'):
+        print(f"   {name}: heavy modules loaded: {', '.join(results[name]['heavy_modules']) or 'none'}")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} response(s) differ between runtimes:")
+        for request in mismatches:
+            print(f"   {request}")
+    else:
+        print(f"\n✅ All {len(parity_requests(['India']))} parity responses identical")
+    results['mismatches'] = mismatches
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to: {args.json}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
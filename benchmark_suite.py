@@ -0,0 +1,362 @@
+"""
+GDP Economic Scenario Simulator - Performance Regression Suite
+Offline training and inference benchmarks compared against a committed baseline
+
+Workloads (no server needed): dataset CSV load, prepare_features, random
+forest fit at several n_jobs, joblib model load, predict_batch at several
+batch sizes, and history store build / query / baseline lookups. Inputs are
+fixed (the committed dataset, seeded row samples, MODEL_PARAMS), so runs are
+comparable across commits on the same machine.
+
+Each workload is timed like timeit: the number of calls per sample is
+calibrated until a sample takes at least --min-sample-ms (those calls are
+the first warm-up), then --warmup more samples are discarded and --repeats
+samples are recorded with the garbage collector disabled. Times are per call.
+A workload regresses when its median exceeds the baseline median by more
+than the threshold. Regressed workloads are measured again (--confirm times)
+and judged on the median of all their samples pooled, so one noisy run can
+neither fail nor pass the check on its own; if any regression remains, the
+process exits with status 1. Fits with more
+n_jobs than either the baseline machine or this one has CPUs only measure
+oversubscription, so they are skipped in the comparison.
+
+Usage:
+    python benchmark_suite.py                          # compare with benchmark_baseline.json
+    python benchmark_suite.py --only predict history --json report.json
+    python benchmark_suite.py --update-baseline        # record a new baseline (same machine!)
+"""
+
+import argparse
+import gc
+import hashlib
+import itertools
+import json
+import os
+import platform
+import tempfile
+import time
+import warnings
+warnings.filterwarnings('ignore')
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from model_backends import RandomForestBackend
+from history_store import HistoryStore, DATA_COLUMNS
+from train_scenario_model import prepare_features
+from config import (
+    DATASET_PATH,
+    BENCHMARK_BASELINE_PATH,
+    BENCHMARK_REGRESSION_THRESHOLD,
+    BENCHMARK_FIT_N_JOBS,
+    BENCHMARK_PREDICT_ROWS,
+    BENCHMARK_SEED
+)
+
+
+STATUS_ICONS = {'ok': '✅', 'regression': '❌', 'improvement': '🚀', 'new': '🆕', 'skipped': '⏭️'}
+
+# Fields that must match for timings to be comparable with the baseline
+ENVIRONMENT_KEYS = ['python', 'machine', 'cpu_count', 'numpy', 'pandas', 'scikit-learn', 'joblib',
+                    'dataset_sha256']
+
+
+def environment():
+    """Interpreter, library versions, hardware and dataset fingerprint"""
+    with open(DATASET_PATH, 'rb') as f:
+        dataset_sha256 = hashlib.sha256(f.read()).hexdigest()[:16]
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+        'joblib': joblib.__version__,
+        'dataset_sha256': dataset_sha256
+    }
+
+
+def calibrate(fn, min_sample_ms):
+    """Calls per sample (1, 2, 4, ...) so that one sample lasts at least min_sample_ms"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if (time.perf_counter() - start) * 1000 >= min_sample_ms:
+            return number
+        number *= 2
+
+
+def measure(fn, repeats, warmup, min_sample_ms):
+    """Per-call wall times (ms) of `repeats` samples, after warm-up"""
+    number = calibrate(fn, min_sample_ms)
+    for _ in range(warmup):
+        for _ in range(number):
+            fn()
+
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) * 1000 / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples, number
+
+
+def summarize(samples, number, rows=None):
+    """Robust statistics of the per-call samples"""
+    samples = np.asarray(samples)
+    q1, median, q3, p95 = np.percentile(samples, [25, 50, 75, 95])
+    mean = samples.mean()
+    stats = {
+        'median_ms': median,
+        'mean_ms': mean,
+        'stdev_ms': samples.std(ddof=1) if len(samples) > 1 else 0.0,
+        'min_ms': samples.min(),
+        'p95_ms': p95,
+        'iqr_ms': q3 - q1
+    }
+    stats = {key: round(float(value), 6) for key, value in stats.items()}
+    stats['cv'] = round(stats['stdev_ms'] / mean, 4) if mean > 0 else 0.0
+    stats['samples'] = len(samples)
+    stats['calls_per_sample'] = number
+    if rows:
+        stats['rows'] = rows
+        stats['rows_per_s'] = round(rows / median * 1000, 1)
+    return stats
+
+
+def workloads(df, selected, tmp_dir):
+    """
+    Yield (name, fn, rows, n_jobs) for every workload; n_jobs is None except for fits
+
+    Expensive setup (the serving model fit, the history store) only runs when
+    one of its workloads is selected. Sampled inputs are drawn either way, so
+    they never depend on the selection.
+    """
+    yield 'dataset.load_csv', lambda: pd.read_csv(DATASET_PATH), len(df), None
+    frame = df.copy()
+    yield 'features.prepare', lambda: prepare_features(frame, fit_encoder=True), len(frame), None
+
+    X, y, _, _ = prepare_features(df.copy(), fit_encoder=True)
+    X = X.to_numpy(dtype=np.float64)
+    y = y.to_numpy(dtype=np.float64)
+    for n_jobs in BENCHMARK_FIT_N_JOBS:
+        yield (f'forest.fit[n_jobs={n_jobs}]',
+               lambda n_jobs=n_jobs: RandomForestBackend(n_jobs=n_jobs).fit(X, y), len(X), n_jobs)
+
+    rng = np.random.default_rng(BENCHMARK_SEED)
+    batches = {rows: X[rng.integers(0, len(X), size=rows)] for rows in BENCHMARK_PREDICT_ROWS}
+    serving = ['model.load'] + [f'predict[rows={rows}]' for rows in BENCHMARK_PREDICT_ROWS]
+    if any(map(selected, serving)):
+        # The serving configuration (MODEL_PARAMS), fitted on the full dataset
+        backend = RandomForestBackend().fit(X, y)
+        path = backend.save(os.path.join(tmp_dir, 'model.pkl'))
+        yield 'model.load', lambda: joblib.load(path), None, None
+        for rows, batch in batches.items():
+            yield f'predict[rows={rows}]', lambda batch=batch: backend.predict_batch(batch), rows, None
+
+    countries = sorted(df['Country'].unique())
+    order = [countries[i] for i in rng.permutation(len(countries))]
+    history = ['history.build', 'history.query[1 country]', 'history.query[10 countries]',
+               'history.baseline']
+    if any(map(selected, history)):
+        store = HistoryStore.from_frame(df)
+        single = itertools.cycle(order)
+        groups = itertools.cycle([order[i:i + 10] for i in range(0, len(order) - 9, 10)])
+        fields = DATA_COLUMNS[1:]
+        yield 'history.build', lambda: HistoryStore.from_frame(df), len(df), None
+        yield ('history.query[1 country]',
+               lambda: store.query([next(single)], fields, year_from=1990), None, None)
+        yield ('history.query[10 countries]',
+               lambda: store.query(next(groups), fields, year_from=1990), None, None)
+        yield 'history.baseline', lambda: store.baseline(next(single)), None, None
+
+
+def run_suite(selected, repeats, fit_repeats, warmup, min_sample_ms):
+    """Measure every selected workload; returns ({name: stats}, {name: per-call samples})"""
+    df = pd.read_csv(DATASET_PATH)
+    results = {}
+    all_samples = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, fn, rows, n_jobs in workloads(df, selected, tmp_dir):
+            if not selected(name):
+                continue
+            print(f"⏱️  {name}...", flush=True)
+            samples, number = measure(fn, repeats if n_jobs is None else fit_repeats, warmup, min_sample_ms)
+            results[name] = summarize(samples, number, rows)
+            if n_jobs is not None:
+                results[name]['n_jobs'] = n_jobs
+            all_samples[name] = samples
+    return results, all_samples
+
+
+def pool_runs(stats, samples, more_samples):
+    """Stats of a workload over the samples of two runs (per-call times, so calls per sample may differ)"""
+    samples = list(samples) + list(more_samples)
+    return samples, {**stats, **summarize(samples, stats['calls_per_sample'], stats.get('rows'))}
+
+
+def compare(results, baseline, threshold, cpu_count=None):
+    """
+    Per-workload change of the median against the baseline
+
+    Fits whose n_jobs exceed the CPU count recorded with the baseline, or
+    cpu_count (this machine's), are skipped: their timings only reflect
+    oversubscription of the cores either side had.
+    """
+    baseline_results = baseline.get('results', {}) if baseline else {}
+    recorded_cpus = baseline.get('environment', {}).get('cpu_count') if baseline else None
+    cpu_limit = min((cpus for cpus in (recorded_cpus, cpu_count) if cpus), default=None)
+    comparison = {}
+    for name, stats in results.items():
+        base = baseline_results.get(name)
+        if base is None:
+            comparison[name] = {'baseline_median_ms': None, 'change': None, 'status': 'new'}
+            continue
+        if cpu_limit is not None and stats.get('n_jobs', 1) > cpu_limit:
+            comparison[name] = {'baseline_median_ms': base['median_ms'], 'change': None, 'status': 'skipped'}
+            continue
+        change = stats['median_ms'] / base['median_ms'] - 1
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparison[name] = {'baseline_median_ms': base['median_ms'], 'change': round(change, 4),
+                            'status': status}
+    return comparison
+
+
+def environment_differences(current, recorded):
+    return [f"{key} {recorded.get(key)} → {current.get(key)}"
+            for key in ENVIRONMENT_KEYS if recorded.get(key) != current.get(key)]
+
+
+def print_report(results, comparison):
+    """Fixed-width table of medians, spread and change against the baseline"""
+    width = max(len(name) for name in results)
+    print(f"\n{'workload':<{width}}  {'median ms':>11}  {'p95 ms':>11}  {'cv':>6}"
+          f"  {'baseline ms':>11}  {'change':>8}")
+    for name, stats in results.items():
+        entry = comparison[name]
+        base = f"{entry['baseline_median_ms']:.4f}" if entry['baseline_median_ms'] is not None else '-'
+        change = f"{entry['change']:+.1%}" if entry['change'] is not None else '-'
+        print(f"{name:<{width}}  {stats['median_ms']:>11.4f}  {stats['p95_ms']:>11.4f}"
+              f"  {stats['cv']:>6.1%}  {base:>11}  {change:>8}  {STATUS_ICONS[entry['status']]}")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline performance regression suite')
+    parser.add_argument('--only', nargs='+', help='Run only workloads whose name starts with one of these')
+    parser.add_argument('--repeats', type=int, default=15, help='Recorded samples per workload')
+    parser.add_argument('--fit-repeats', type=int, default=3, help='Recorded samples per forest fit')
+    parser.add_argument('--warmup', type=int, default=1, help='Discarded samples after calibration')
+    parser.add_argument('--min-sample-ms', type=float, default=50.0,
+                        help='Calibrate calls per sample so a sample lasts at least this long')
+    parser.add_argument('--confirm', type=int, default=1,
+                        help='Re-measure regressed workloads this many times before failing')
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help='Allowed relative slowdown of the median (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE_PATH, help='Baseline results file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write these results to the baseline file instead of failing on regressions')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP ECONOMIC SCENARIO SIMULATOR - Performance Regression Suite")
+    print("=" * 60)
+
+    env = environment()
+    baseline = load_baseline(args.baseline)
+    print(f"\n📂 Baseline: {args.baseline}" + ('' if baseline else ' (not found)'))
+    print(f"   Regression threshold: {args.threshold:.0%} on the median")
+    if baseline:
+        differences = environment_differences(env, baseline.get('environment', {}))
+        if differences:
+            print("⚠️ Baseline was recorded in a different environment; timings may not be comparable:")
+            for difference in differences:
+                print(f"   {difference}")
+    print()
+
+    selected = lambda name: not args.only or name.startswith(tuple(args.only))
+    results, samples = run_suite(selected, args.repeats, args.fit_repeats, args.warmup, args.min_sample_ms)
+    if not results:
+        raise SystemExit("❌ No workload matches --only")
+    comparison = compare(results, baseline, args.threshold, env['cpu_count'])
+    for _ in range(args.confirm if baseline and not args.update_baseline else 0):
+        regressed = {name for name, entry in comparison.items() if entry['status'] == 'regression'}
+        if not regressed:
+            break
+        print(f"\n🔍 Re-measuring {len(regressed)} regressed workload(s)")
+        _, more_samples = run_suite(regressed.__contains__, args.repeats, args.fit_repeats,
+                                    args.warmup, args.min_sample_ms)
+        for name in more_samples:
+            samples[name], results[name] = pool_runs(results[name], samples[name], more_samples[name])
+        comparison = compare(results, baseline, args.threshold, env['cpu_count'])
+    print_report(results, comparison)
+
+    settings = {
+        'repeats': args.repeats,
+        'fit_repeats': args.fit_repeats,
+        'warmup': args.warmup,
+        'min_sample_ms': args.min_sample_ms
+    }
+    regressions = [name for name, entry in comparison.items() if entry['status'] == 'regression']
+    skipped = [name for name, entry in comparison.items() if entry['status'] == 'skipped']
+
+    if args.json:
+        report = {
+            'environment': env,
+            'settings': {**settings, 'threshold': args.threshold},
+            'baseline': args.baseline if baseline else None,
+            'results': results,
+            'comparison': comparison,
+            'regressions': regressions,
+            'skipped': skipped
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to: {args.json}")
+
+    if skipped and not args.update_baseline:
+        print(f"\n⏭️ Not compared (n_jobs above the CPU count of the baseline or this machine): "
+              f"{', '.join(skipped)}")
+    if args.update_baseline:
+        # Workloads not re-run (--only) keep their recorded results
+        recorded = (baseline or {}).get('results', {}) if args.only else {}
+        with open(args.baseline, 'w') as f:
+            json.dump({'environment': env, 'settings': settings, 'results': {**recorded, **results}},
+                      f, indent=2)
+            f.write('\n')
+        print(f"\n💾 Baseline written to: {args.baseline}")
+    elif regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        raise SystemExit(1)
+    else:
+        print("\n✅ No regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Sampled request capture for the GDP Scenario Simulator
+Append-only NDJSON traffic logs for replay_traffic.py
+
+One line per sampled request: timestamp, method, route rule, path, query
+string, normalized JSON body (keys sorted, compact separators), X-Client-Id,
+status and server-side latency. Lines are serialized and written on a
+background thread behind a bounded queue (full queue: the entry is dropped
+and counted). Each worker process writes its own files, rotated when they
+exceed CAPTURE_MAX_BYTES; the newest CAPTURE_MAX_FILES (across workers)
+are kept.
+"""
+
+import glob
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+from config import CAPTURE_DIR, CAPTURE_MAX_BYTES, CAPTURE_MAX_FILES, CAPTURE_QUEUE_SIZE
+
+
+FILE_PATTERN = 'capture-*.ndjson'
+
+
+class RequestCapture:
+    """Samples requests and appends them to size-rotated NDJSON files"""
+
+    def __init__(self, sample_rate, directory=CAPTURE_DIR, max_bytes=CAPTURE_MAX_BYTES,
+                 max_files=CAPTURE_MAX_FILES, queue_size=CAPTURE_QUEUE_SIZE):
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+        self.captured = 0
+        self.dropped = 0
+        self._file = None
+        self._path = None
+        self._sequence = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name='request-capture', daemon=True)
+        self._worker.start()
+
+    def sampled(self):
+        return random.random() < self.sample_rate
+
+    def record(self, method, rule, path, query, body, client_id, status, latency_ms):
+        """Queue one request; never blocks"""
+        entry = {
+            'ts': round(time.time() - latency_ms / 1000, 6),  # arrival time
+            'method': method,
+            'route': rule,
+            'path': path,
+            'query': query,
+            'body': body,
+            'client': client_id,
+            'status': status,
+            'ms': round(latency_ms, 3)
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            try:
+                if entry is None:
+                    break
+                self._write(entry)
+            except Exception as e:
+                print(f"⚠️ Request capture failed: {e}")
+            finally:
+                self._queue.task_done()
+        if self._file is not None:
+            self._file.close()
+
+    def _write(self, entry):
+        # Normalized: keys sorted, compact separators (body included)
+        line = json.dumps(entry, sort_keys=True, separators=(',', ':')) + '\n'
+        if self._file is None or self._file.tell() + len(line) > self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._file.flush()
+        self.captured += 1
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        self._sequence += 1
+        name = f"capture-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence:04d}.ndjson"
+        self._path = os.path.join(self.directory, name)
+        self._file = open(self._path, 'a', encoding='utf-8')
+
+        # Names start with the creation time; other workers may prune concurrently
+        files = sorted(glob.glob(os.path.join(self.directory, FILE_PATTERN)))
+        for old in files[:-self.max_files]:
+            if old != self._path:
+                try:
+                    os.remove(old)
+                except FileNotFoundError:
+                    pass
+
+    def wait_idle(self, timeout=10.0):
+        """Block until every queued entry has been written"""
+        deadline = time.perf_counter() + timeout
+        while self._queue.unfinished_tasks and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def stats(self):
+        return {
+            'sample_rate': self.sample_rate,
+            'directory': self.directory,
+            'current_file': self._path,
+            'captured': self.captured,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize()
+        }
+
+
+def read_captures(paths):
+    """Captured entries from files and/or directories, ordered by timestamp"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, FILE_PATTERN))))
+        else:
+            files.append(path)
+
+    entries = []
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    entries.sort(key=lambda entry: entry['ts'])
+    return entries
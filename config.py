@@ -3,13 +3,95 @@ Configuration file for GDP Growth Prediction Model
 Ensures consistency across training and deployment
 """
 
+import os
+
 # Data paths
 DATASET_PATH = "final_data_with_year.csv"
 
+# Incremental ingestion (see ingest_data.py)
+# Raw indicator levels, and the binary per-country store derived from DATASET_PATH
+RAW_DATA_PATH = "raw_indicators.csv"
+DATA_STORE_DIR = "data_store"
+# Growth rates in the dataset are clipped to +/- this value (percent)
+GROWTH_RATE_LIMIT = 100.0
+
 # Model paths
 MODEL_PATH = "gdp_model.pkl"
 ENCODER_PATH = "country_encoder.pkl"
 
+# Scenario simulator artifacts
+SCENARIO_MODEL_PATH = "gdp_scenario_model.pkl"
+SCENARIO_ENCODER_PATH = "country_encoder_scenario.pkl"
+FEATURE_INFO_PATH = "feature_info_scenario.pkl"
+
+# Slim serving runtime (see slim_runtime.py)
+# With SLIM_RUNTIME=1 the API serves the NumPy/JSON export in SLIM_DIR and never
+# imports pandas, scikit-learn or joblib
+SLIM_RUNTIME = os.environ.get('SLIM_RUNTIME', '0') == '1'
+SLIM_DIR = "slim"
+SLIM_MODEL_PATH = os.path.join(SLIM_DIR, "model.npz")
+SLIM_ENCODER_PATH = os.path.join(SLIM_DIR, "encoder.json")
+SLIM_FEATURE_INFO_PATH = os.path.join(SLIM_DIR, "feature_info.json")
+SLIM_MANIFEST_PATH = os.path.join(SLIM_DIR, "manifest.json")
+SLIM_HISTORY_DIR = os.path.join(SLIM_DIR, "history")
+SLIM_ANALOG_REFERENCE_PATH = os.path.join(SLIM_DIR, "analog_reference.npy")
+
+# Conformal prediction intervals (see conformal.py)
+# Calibration rows are held out from the training split and never fitted on
+CONFORMAL_PATH = "conformal_scenario.npz"
+CONFORMAL_CALIBRATION_FRACTION = 0.2
+CONFORMAL_LEVELS = [0.8, 0.9, 0.95]
+CONFORMAL_MAGNITUDE_BINS = 4
+CONFORMAL_MIN_SAMPLES = 20
+
+# Maximum scenarios per /simulate/batch request
+BATCH_MAX_SCENARIOS = 10000
+
+# Saved scenario sets and cached results (see scenario_store.py)
+SCENARIO_DB_PATH = os.environ.get('SCENARIO_DB_PATH', 'scenarios.db')
+SCENARIO_SET_MAX = 100000
+
+# Historical analog search (see analogs.py)
+# A scenario is flagged as extrapolation when its nearest analog is further away
+# than this percentile of historical nearest-neighbour distances
+ANALOG_EXTRAPOLATION_PERCENTILE = 99
+ANALOG_DEFAULT_K = 5
+ANALOG_MAX_K = 50
+
+# Background jobs (see jobs.py): state in JOBS_DIR/jobs.db, results in JOBS_DIR/<id>/
+JOBS_DIR = os.environ.get('JOBS_DIR', 'jobs')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', os.cpu_count() or 1))
+JOB_CHUNK_ROWS = 50000
+JOB_MAX_ROWS = 5000000
+JOB_STREAM_INTERVAL = 0.5
+JOB_POLL_INTERVAL = 1.0  # seconds between dispatcher checks for jobs queued by other workers
+
+# Cached feature matrix (reused by incremental retraining)
+FEATURE_CACHE_PATH = "features_scenario.npz"
+
+# Incremental retraining defaults (train_scenario_model.py --incremental)
+RETRAIN_ADD_TREES = 20
+RETRAIN_RECENT_YEARS = 5
+RETRAIN_MAX_TREES = 200  # the oldest/worst trees beyond this are dropped
+
+# Scenario inputs as exposed by the API (model feature order, after Country)
+SCENARIO_INPUT_FIELDS = [
+    'Population_Growth_Rate',
+    'Exports_Growth_Rate',
+    'Imports_Growth_Rate',
+    'Investment_Growth_Rate',
+    'Consumption_Growth_Rate',
+    'Govt_Spend_Growth_Rate'
+]
+
+# Precomputed response curves (partial dependence / ICE) for slider UIs
+# Curves are a float32 array of shape (countries, inputs, 2 + ICE samples, grid)
+RESPONSE_CURVES_PATH = "response_curves_scenario.npy"
+RESPONSE_META_PATH = "response_meta_scenario.npz"
+RESPONSE_GRID_POINTS = 81
+RESPONSE_GRID_PERCENTILES = (1, 99)
+RESPONSE_ICE_SAMPLES = 8
+
 # Feature columns (for reference)
 FEATURE_COLUMNS = [
     'Country_Encoded',
@@ -26,12 +108,73 @@ TARGET_COLUMN = 'GDP_Growth_Rate'
 # Temporal split year (train on data before this year, test on this year onwards)
 TEMPORAL_SPLIT_YEAR = 2019
 
-# Model hyperparameters
+# Model hyperparameters (random forest backend, as used by train_scenario_model.py)
 MODEL_PARAMS = {
     'n_estimators': 100,
-    'max_depth': 10,
+    'max_depth': 15,
     'min_samples_split': 5,
     'min_samples_leaf': 2,
     'random_state': 42,
     'n_jobs': -1
 }
+
+# Model backend for training and serving (see model_backends.py)
+# One of: random_forest, hist_gradient_boosting, linear
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'random_forest')
+
+BACKEND_PARAMS = {
+    'random_forest': MODEL_PARAMS,
+    'hist_gradient_boosting': {
+        'max_iter': 300,
+        'learning_rate': 0.1,
+        'max_leaf_nodes': 31,
+        'min_samples_leaf': 20,
+        'l2_regularization': 1.0,
+        'random_state': 42
+    },
+    'linear': {
+        'alpha': 1.0
+    }
+}
+
+# Candidate model: A/B routing and shadow evaluation (see shadow.py)
+# Disabled unless CANDIDATE_BACKEND is set; the candidate is loaded from CANDIDATE_MODEL_PATH,
+# else that backend's default artifact (slim export with SLIM_RUNTIME=1), and shares the
+# primary's encoder. Its interval table is CANDIDATE_CONFORMAL_PATH, else the backend's default
+# table when the default model artifact is used; without one, candidate responses carry no intervals
+CANDIDATE_BACKEND = os.environ.get('CANDIDATE_BACKEND')
+CANDIDATE_MODEL_PATH = os.environ.get('CANDIDATE_MODEL_PATH')
+CANDIDATE_CONFORMAL_PATH = os.environ.get('CANDIDATE_CONFORMAL_PATH')
+CANDIDATE_TRAFFIC_FRACTION = float(os.environ.get('CANDIDATE_TRAFFIC_FRACTION', 0.0))
+SHADOW_MODE = os.environ.get('SHADOW_MODE', '1') == '1'
+SHADOW_QUEUE_SIZE = 1000
+SHADOW_WINDOW = 10000
+SHADOW_BATCH_INTERVAL = 0.05  # seconds between shadow micro-batches
+SHADOW_MAX_BATCH_ROWS = 50000
+SHADOW_DISAGREEMENT_THRESHOLD = 0.5  # percentage points of GDP growth
+
+# Sampled request capture for replay_traffic.py (see capture.py); off unless the rate is > 0
+CAPTURE_SAMPLE_RATE = float(os.environ.get('CAPTURE_SAMPLE_RATE', 0.0))
+CAPTURE_DIR = os.environ.get('CAPTURE_DIR', 'captures')
+CAPTURE_MAX_BYTES = int(os.environ.get('CAPTURE_MAX_BYTES', 64 * 1024 * 1024))
+CAPTURE_MAX_FILES = 20
+CAPTURE_QUEUE_SIZE = 10000
+CAPTURE_EXCLUDED_PREFIXES = ('/admin', '/jobs')
+
+# Offline performance regression suite (see benchmark_suite.py)
+# A workload regresses when its median time exceeds the baseline median by more than the threshold
+BENCHMARK_BASELINE_PATH = os.environ.get('BENCHMARK_BASELINE_PATH', 'benchmark_baseline.json')
+BENCHMARK_REGRESSION_THRESHOLD = float(os.environ.get('BENCHMARK_REGRESSION_THRESHOLD', 0.25))
+BENCHMARK_FIT_N_JOBS = [1, 2, 4]
+BENCHMARK_PREDICT_ROWS = [1, 100, 1000, 10000]
+BENCHMARK_SEED = 42
+
+# Admin / live profiling
+# Admin endpoints are disabled unless ADMIN_TOKEN is set; clients send it as X-Admin-Token
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+PROFILE_MAX_SECONDS = 60
+PROFILE_DEFAULT_INTERVAL_MS = 5
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# Requests slower than this are logged with their stage timings
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 250))
@@ -0,0 +1,124 @@
+"""
+Split-conformal prediction intervals for the GDP Scenario Simulator
+
+At training time, absolute residuals on a held-out calibration split are
+turned into finite-sample conformal quantiles, stratified per country and
+per input-magnitude bin. Sparse strata fall back to the country, then the
+magnitude bin, then the global quantile, and every cell of the
+(country, bin, level) table is filled at training time. Serving an interval
+is then a single array lookup - no extra model evaluations.
+"""
+
+import numpy as np
+
+from config import CONFORMAL_LEVELS, CONFORMAL_MAGNITUDE_BINS, CONFORMAL_MIN_SAMPLES
+
+
+# Stratum a table cell was resolved from
+STRATA = ['country_bin', 'country', 'bin', 'global']
+
+
+def input_magnitude(inputs):
+    """Mean absolute growth rate of the six scenario inputs (one value per row)"""
+    return np.abs(np.asarray(inputs, dtype=np.float64)).mean(axis=1)
+
+
+def conformal_quantiles(abs_residuals, levels):
+    """Finite-sample conformal quantile ceil((n + 1) * level) / n for each level"""
+    n = len(abs_residuals)
+    ordered = np.sort(abs_residuals)
+    ranks = np.ceil((n + 1) * np.asarray(levels)).astype(int)
+    return ordered[np.minimum(ranks, n) - 1]
+
+
+def fit_conformal_table(abs_residuals, country_codes, inputs, n_countries,
+                        levels=CONFORMAL_LEVELS, n_bins=CONFORMAL_MAGNITUDE_BINS,
+                        min_samples=CONFORMAL_MIN_SAMPLES):
+    """
+    Build the (country, magnitude bin, level) table of interval half-widths
+
+    Returns: dict of arrays, ready for np.savez
+    """
+    abs_residuals = np.asarray(abs_residuals, dtype=np.float64)
+    country_codes = np.asarray(country_codes, dtype=np.int64)
+    magnitude = input_magnitude(inputs)
+
+    # Interior quantile edges; bin = searchsorted(edges, magnitude)
+    bin_edges = np.quantile(magnitude, np.linspace(0, 1, n_bins + 1)[1:-1])
+    bins = np.searchsorted(bin_edges, magnitude, side='right')
+
+    global_q = conformal_quantiles(abs_residuals, levels)
+    bin_q = {}
+    for b in range(n_bins):
+        mask = bins == b
+        bin_q[b] = conformal_quantiles(abs_residuals[mask], levels) if mask.sum() >= min_samples else None
+
+    quantiles = np.empty((n_countries, n_bins, len(levels)), dtype=np.float32)
+    stratum = np.empty((n_countries, n_bins), dtype=np.int8)
+    for code in range(n_countries):
+        in_country = country_codes == code
+        country_q = (conformal_quantiles(abs_residuals[in_country], levels)
+                     if in_country.sum() >= min_samples else None)
+        for b in range(n_bins):
+            mask = in_country & (bins == b)
+            candidates = [
+                conformal_quantiles(abs_residuals[mask], levels) if mask.sum() >= min_samples else None,
+                country_q,
+                bin_q[b],
+                global_q
+            ]
+            source = next(i for i, q in enumerate(candidates) if q is not None)
+            quantiles[code, b] = candidates[source]
+            stratum[code, b] = source
+
+    return {
+        'quantiles': quantiles,
+        'stratum': stratum,
+        'global_quantiles': global_q.astype(np.float32),
+        'bin_edges': bin_edges,
+        'levels': np.asarray(levels, dtype=np.float64)
+    }
+
+
+class ConformalTable:
+    """Precomputed interval half-widths, looked up per (country, magnitude bin)"""
+
+    def __init__(self, table):
+        self.quantiles = table['quantiles']
+        self.global_quantiles = table['global_quantiles']
+        self.bin_edges = table['bin_edges']
+        self.levels = table['levels'].tolist()
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as table:
+            return cls({key: table[key] for key in table.files})
+
+    def half_widths(self, country_codes, inputs):
+        """Interval half-widths, shape (rows, levels)"""
+        country_codes = np.asarray(country_codes, dtype=np.int64)
+        bins = np.searchsorted(self.bin_edges, input_magnitude(inputs), side='right')
+        # Countries added after the table was built use the global quantiles
+        known = country_codes < len(self.quantiles)
+        widths = np.empty((len(country_codes), len(self.levels)), dtype=np.float64)
+        widths[known] = self.quantiles[country_codes[known], bins[known]]
+        widths[~known] = self.global_quantiles
+        return widths
+
+    def intervals(self, country_codes, inputs, predictions):
+        """
+        Prediction intervals for a batch
+
+        Returns: list (per row) of [{'level', 'lower', 'upper'}, ...]
+        """
+        widths = self.half_widths(country_codes, inputs)
+        predictions = np.asarray(predictions, dtype=np.float64)[:, None]
+        lower = np.round(predictions - widths, 2)
+        upper = np.round(predictions + widths, 2)
+        return [
+            [
+                {'level': level, 'lower': float(lo), 'upper': float(hi)}
+                for level, lo, hi in zip(self.levels, row_lower, row_upper)
+            ]
+            for row_lower, row_upper in zip(lower, upper)
+        ]
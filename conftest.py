@@ -0,0 +1,8 @@
+"""
+pytest configuration
+
+Unit tests live in tests/. test_scenario_simulator.py is a script run
+against a live server (python test_scenario_simulator.py), not collected.
+"""
+
+collect_ignore = ['test_scenario_simulator.py']
@@ -0,0 +1,266 @@
+"""
+Country-name resolution for the GDP Scenario Simulator
+Maps user input to the dataset's country names (and model codes) in O(1)
+
+Lookup keys are normalized names: mis-decoded UTF-8 repaired ('CuraÃ§ao'),
+accents folded, case, punctuation and a leading 'the' ignored, 'saint' read
+as 'st'. Besides the dataset names, ISO 3166-1 alpha-2 / alpha-3 codes and
+common aliases ('USA', 'South Korea', 'Turkey', World Bank spellings)
+resolve exactly. Anything else is unknown; a trigram index over names and
+aliases shortlists 'did you mean' candidates, ranked by difflib similarity
+(robust to transposed letters, which break many trigrams).
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+
+import numpy as np
+
+
+# ISO 3166-1 alpha-2 / alpha-3 codes by dataset name (former states have none;
+# the dataset splits Tanzania into Mainland and Zanzibar, TZ / TZA mean Mainland)
+COUNTRY_CODES = {
+    'Albania': ('AL', 'ALB'), 'Algeria': ('DZ', 'DZA'), 'Andorra': ('AD', 'AND'),
+    'Angola': ('AO', 'AGO'), 'Argentina': ('AR', 'ARG'), 'Armenia': ('AM', 'ARM'),
+    'Aruba': ('AW', 'ABW'), 'Australia': ('AU', 'AUS'), 'Austria': ('AT', 'AUT'),
+    'Azerbaijan': ('AZ', 'AZE'), 'Bahamas': ('BS', 'BHS'), 'Bahrain': ('BH', 'BHR'),
+    'Bangladesh': ('BD', 'BGD'), 'Barbados': ('BB', 'BRB'), 'Belarus': ('BY', 'BLR'),
+    'Belgium': ('BE', 'BEL'), 'Belize': ('BZ', 'BLZ'), 'Benin': ('BJ', 'BEN'),
+    'Bermuda': ('BM', 'BMU'), 'Bhutan': ('BT', 'BTN'),
+    'Bolivia (Plurinational State of)': ('BO', 'BOL'),
+    'Bosnia and Herzegovina': ('BA', 'BIH'), 'Botswana': ('BW', 'BWA'), 'Brazil': ('BR', 'BRA'),
+    'British Virgin Islands': ('VG', 'VGB'), 'Brunei Darussalam': ('BN', 'BRN'),
+    'Bulgaria': ('BG', 'BGR'), 'Burkina Faso': ('BF', 'BFA'), 'Burundi': ('BI', 'BDI'),
+    'Cabo Verde': ('CV', 'CPV'), 'Cambodia': ('KH', 'KHM'), 'Cameroon': ('CM', 'CMR'),
+    'Canada': ('CA', 'CAN'), 'Cayman Islands': ('KY', 'CYM'),
+    'Central African Republic': ('CF', 'CAF'), 'Chad': ('TD', 'TCD'), 'Chile': ('CL', 'CHL'),
+    'China': ('CN', 'CHN'), 'China, Hong Kong SAR': ('HK', 'HKG'),
+    'China, Macao SAR': ('MO', 'MAC'), 'Colombia': ('CO', 'COL'), 'Comoros': ('KM', 'COM'),
+    'Congo': ('CG', 'COG'), 'Costa Rica': ('CR', 'CRI'), 'Croatia': ('HR', 'HRV'),
+    'Cuba': ('CU', 'CUB'), 'Curaçao': ('CW', 'CUW'), 'Cyprus': ('CY', 'CYP'),
+    'Czechia': ('CZ', 'CZE'), "Côte d'Ivoire": ('CI', 'CIV'),
+    'D.R. of the Congo': ('CD', 'COD'), 'Denmark': ('DK', 'DNK'), 'Djibouti': ('DJ', 'DJI'),
+    'Dominica': ('DM', 'DMA'), 'Dominican Republic': ('DO', 'DOM'), 'Ecuador': ('EC', 'ECU'),
+    'Egypt': ('EG', 'EGY'), 'El Salvador': ('SV', 'SLV'), 'Equatorial Guinea': ('GQ', 'GNQ'),
+    'Estonia': ('EE', 'EST'), 'Eswatini': ('SZ', 'SWZ'), 'Ethiopia': ('ET', 'ETH'),
+    'Fiji': ('FJ', 'FJI'), 'Finland': ('FI', 'FIN'), 'France': ('FR', 'FRA'),
+    'French Polynesia': ('PF', 'PYF'), 'Gabon': ('GA', 'GAB'), 'Georgia': ('GE', 'GEO'),
+    'Germany': ('DE', 'DEU'), 'Ghana': ('GH', 'GHA'), 'Greece': ('GR', 'GRC'),
+    'Greenland': ('GL', 'GRL'), 'Grenada': ('GD', 'GRD'), 'Guatemala': ('GT', 'GTM'),
+    'Guinea': ('GN', 'GIN'), 'Guinea-Bissau': ('GW', 'GNB'), 'Honduras': ('HN', 'HND'),
+    'Hungary': ('HU', 'HUN'), 'Iceland': ('IS', 'ISL'), 'India': ('IN', 'IND'),
+    'Indonesia': ('ID', 'IDN'), 'Iran (Islamic Republic of)': ('IR', 'IRN'),
+    'Iraq': ('IQ', 'IRQ'), 'Ireland': ('IE', 'IRL'), 'Israel': ('IL', 'ISR'),
+    'Italy': ('IT', 'ITA'), 'Jamaica': ('JM', 'JAM'), 'Japan': ('JP', 'JPN'),
+    'Jordan': ('JO', 'JOR'), 'Kazakhstan': ('KZ', 'KAZ'), 'Kenya': ('KE', 'KEN'),
+    'Kiribati': ('KI', 'KIR'), 'Kosovo': ('XK', 'XKX'), 'Kuwait': ('KW', 'KWT'),
+    'Kyrgyzstan': ('KG', 'KGZ'), "Lao People's DR": ('LA', 'LAO'), 'Latvia': ('LV', 'LVA'),
+    'Lebanon': ('LB', 'LBN'), 'Lesotho': ('LS', 'LSO'), 'Liberia': ('LR', 'LBR'),
+    'Libya': ('LY', 'LBY'), 'Liechtenstein': ('LI', 'LIE'), 'Lithuania': ('LT', 'LTU'),
+    'Luxembourg': ('LU', 'LUX'), 'Madagascar': ('MG', 'MDG'), 'Malawi': ('MW', 'MWI'),
+    'Malaysia': ('MY', 'MYS'), 'Maldives': ('MV', 'MDV'), 'Mali': ('ML', 'MLI'),
+    'Malta': ('MT', 'MLT'), 'Marshall Islands': ('MH', 'MHL'), 'Mauritania': ('MR', 'MRT'),
+    'Mauritius': ('MU', 'MUS'), 'Mexico': ('MX', 'MEX'), 'Micronesia (FS of)': ('FM', 'FSM'),
+    'Monaco': ('MC', 'MCO'), 'Mongolia': ('MN', 'MNG'), 'Montenegro': ('ME', 'MNE'),
+    'Montserrat': ('MS', 'MSR'), 'Morocco': ('MA', 'MAR'), 'Mozambique': ('MZ', 'MOZ'),
+    'Myanmar': ('MM', 'MMR'), 'Namibia': ('NA', 'NAM'), 'Nauru': ('NR', 'NRU'),
+    'Nepal': ('NP', 'NPL'), 'Netherlands': ('NL', 'NLD'), 'New Caledonia': ('NC', 'NCL'),
+    'New Zealand': ('NZ', 'NZL'), 'Nicaragua': ('NI', 'NIC'), 'Niger': ('NE', 'NER'),
+    'Nigeria': ('NG', 'NGA'), 'North Macedonia': ('MK', 'MKD'), 'Norway': ('NO', 'NOR'),
+    'Oman': ('OM', 'OMN'), 'Pakistan': ('PK', 'PAK'), 'Palau': ('PW', 'PLW'),
+    'Panama': ('PA', 'PAN'), 'Papua New Guinea': ('PG', 'PNG'), 'Paraguay': ('PY', 'PRY'),
+    'Peru': ('PE', 'PER'), 'Philippines': ('PH', 'PHL'), 'Poland': ('PL', 'POL'),
+    'Portugal': ('PT', 'PRT'), 'Puerto Rico': ('PR', 'PRI'), 'Qatar': ('QA', 'QAT'),
+    'Republic of Korea': ('KR', 'KOR'), 'Republic of Moldova': ('MD', 'MDA'),
+    'Romania': ('RO', 'ROU'), 'Russian Federation': ('RU', 'RUS'), 'Rwanda': ('RW', 'RWA'),
+    'Samoa': ('WS', 'WSM'), 'San Marino': ('SM', 'SMR'), 'Sao Tome and Principe': ('ST', 'STP'),
+    'Saudi Arabia': ('SA', 'SAU'), 'Senegal': ('SN', 'SEN'), 'Serbia': ('RS', 'SRB'),
+    'Seychelles': ('SC', 'SYC'), 'Sierra Leone': ('SL', 'SLE'), 'Singapore': ('SG', 'SGP'),
+    'Slovakia': ('SK', 'SVK'), 'Slovenia': ('SI', 'SVN'), 'Solomon Islands': ('SB', 'SLB'),
+    'Somalia': ('SO', 'SOM'), 'South Africa': ('ZA', 'ZAF'), 'Spain': ('ES', 'ESP'),
+    'Sri Lanka': ('LK', 'LKA'), 'St. Vincent and the Grenadines': ('VC', 'VCT'),
+    'State of Palestine': ('PS', 'PSE'), 'Sudan': ('SD', 'SDN'), 'Suriname': ('SR', 'SUR'),
+    'Sweden': ('SE', 'SWE'), 'Switzerland': ('CH', 'CHE'), 'Syrian Arab Republic': ('SY', 'SYR'),
+    'Tajikistan': ('TJ', 'TJK'), 'Thailand': ('TH', 'THA'), 'Timor-Leste': ('TL', 'TLS'),
+    'Togo': ('TG', 'TGO'), 'Tonga': ('TO', 'TON'), 'Trinidad and Tobago': ('TT', 'TTO'),
+    'Tunisia': ('TN', 'TUN'), 'Turkmenistan': ('TM', 'TKM'), 'Türkiye': ('TR', 'TUR'),
+    'U.R. of Tanzania: Mainland': ('TZ', 'TZA'), 'Uganda': ('UG', 'UGA'),
+    'Ukraine': ('UA', 'UKR'), 'United Arab Emirates': ('AE', 'ARE'),
+    'United Kingdom': ('GB', 'GBR'), 'United States': ('US', 'USA'), 'Uruguay': ('UY', 'URY'),
+    'Uzbekistan': ('UZ', 'UZB'), 'Vanuatu': ('VU', 'VUT'),
+    'Venezuela (Bolivarian Republic of)': ('VE', 'VEN'), 'Viet Nam': ('VN', 'VNM'),
+    'Yemen': ('YE', 'YEM'), 'Zambia': ('ZM', 'ZMB'), 'Zimbabwe': ('ZW', 'ZWE')
+}
+
+# Common and World Bank / IMF spellings by dataset name
+COUNTRY_ALIASES = {
+    'Bahamas': ['Bahamas, The'],
+    'Bolivia (Plurinational State of)': ['Bolivia'],
+    'Bosnia and Herzegovina': ['Bosnia', 'Bosnia-Herzegovina'],
+    'British Virgin Islands': ['Virgin Islands (U.K.)', 'Virgin Islands, British'],
+    'Brunei Darussalam': ['Brunei'],
+    'Cabo Verde': ['Cape Verde'],
+    'Central African Republic': ['CAR'],
+    'China': ["People's Republic of China", 'PRC', 'Mainland China'],
+    'China, Hong Kong SAR': ['Hong Kong', 'Hong Kong SAR', 'Hong Kong SAR, China', 'Hong Kong, China'],
+    'China, Macao SAR': ['Macao', 'Macau', 'Macao SAR, China', 'Macao, China'],
+    'Congo': ['Republic of the Congo', 'Congo, Rep.', 'Congo-Brazzaville', 'Congo Republic'],
+    'Czechia': ['Czech Republic'],
+    'Czechoslovakia (Former)': ['Czechoslovakia'],
+    "Côte d'Ivoire": ['Ivory Coast'],
+    'D.R. of the Congo': ['Democratic Republic of the Congo', 'DR Congo', 'DRC', 'Congo, Dem. Rep.',
+                          'Congo-Kinshasa', 'Zaire'],
+    'Egypt': ['Egypt, Arab Rep.', 'Arab Republic of Egypt'],
+    'Eswatini': ['Swaziland'],
+    'Former Netherlands Antilles': ['Netherlands Antilles'],
+    'Iran (Islamic Republic of)': ['Iran', 'Iran, Islamic Rep.', 'Islamic Republic of Iran'],
+    'Kyrgyzstan': ['Kyrgyz Republic'],
+    "Lao People's DR": ['Laos', 'Lao PDR', "Lao People's Democratic Republic"],
+    'Micronesia (FS of)': ['Micronesia', 'Micronesia, Fed. Sts.', 'Federated States of Micronesia'],
+    'Myanmar': ['Burma'],
+    'Netherlands': ['Holland', 'The Netherlands'],
+    'North Macedonia': ['Macedonia', 'Republic of North Macedonia', 'FYR Macedonia'],
+    'Republic of Korea': ['South Korea', 'Korea', 'Korea, Rep.', 'Korea, South', 'Korea (Republic of)'],
+    'Republic of Moldova': ['Moldova'],
+    'Russian Federation': ['Russia'],
+    'Sao Tome and Principe': ['São Tomé and Príncipe', 'Sao Tome'],
+    'Slovakia': ['Slovak Republic'],
+    'St. Vincent and the Grenadines': ['Saint Vincent and the Grenadines', 'St Vincent'],
+    'State of Palestine': ['Palestine', 'West Bank and Gaza', 'Palestinian Territories'],
+    'Sudan (Former)': ['Former Sudan'],
+    'Syrian Arab Republic': ['Syria'],
+    'Timor-Leste': ['East Timor'],
+    'Trinidad and Tobago': ['Trinidad'],
+    'Türkiye': ['Turkey', 'Turkiye', 'Republic of Türkiye'],
+    'U.R. of Tanzania: Mainland': ['Tanzania', 'Tanzania Mainland', 'United Republic of Tanzania',
+                                   'Mainland Tanzania'],
+    'United Arab Emirates': ['UAE', 'Emirates'],
+    'United Kingdom': ['UK', 'U.K.', 'Great Britain', 'Britain',
+                       'United Kingdom of Great Britain and Northern Ireland'],
+    'United States': ['United States of America', 'U.S.', 'U.S.A.', 'America'],
+    'Venezuela (Bolivarian Republic of)': ['Venezuela', 'Venezuela, RB'],
+    'Viet Nam': ['Vietnam'],
+    'Yemen': ['Yemen, Rep.', 'Republic of Yemen'],
+    'Yemen Arab Republic (Former)': ['North Yemen', 'Yemen Arab Republic'],
+    'Yemen Democratic (Former)': ['South Yemen', "People's Democratic Republic of Yemen"],
+    'Yugoslavia (Former)': ['Yugoslavia']
+}
+
+# Names / aliases shortlisted by trigram similarity, and the difflib ratio a suggestion needs
+SUGGEST_SHORTLIST = 20
+SUGGEST_MIN_SIMILARITY = 0.6
+
+
+def normalize_name(name):
+    """Lookup key: repaired, accent-folded, lower-case words without punctuation"""
+    text = str(name)
+    try:
+        # UTF-8 text that was decoded as Latin-1 ('TÃ¼rkiye')
+        text = text.encode('latin-1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    text = re.sub(r"[.']", '', text.replace('&', ' and '))
+    words = ['st' if word == 'saint' else word for word in re.findall(r'[a-z0-9]+', text)]
+    if words[:1] == ['the']:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CountryResolver:
+    """Exact (normalized name, ISO code, alias) lookup with trigram suggestions"""
+
+    def __init__(self, model_countries, other_countries=()):
+        """
+        model_countries: encoder classes, in code order
+        other_countries: further resolvable names without a model code (history only)
+        """
+        self.codes = {country: code for code, country in enumerate(model_countries)}
+        countries = list(dict.fromkeys([*model_countries, *other_countries]))
+
+        # Dataset names first, so no alias or code can shadow one
+        self.lookup = {}
+        for country in countries:
+            self.lookup.setdefault(normalize_name(country), country)
+        canonical = dict(self.lookup)
+
+        names = {}
+        for table_name, codes in COUNTRY_CODES.items():
+            country = canonical.get(normalize_name(table_name))
+            if country is not None:
+                for code in codes:
+                    self.lookup.setdefault(normalize_name(code), country)
+        for table_name, aliases in COUNTRY_ALIASES.items():
+            country = canonical.get(normalize_name(table_name))
+            if country is not None:
+                for alias in aliases:
+                    key = normalize_name(alias)
+                    self.lookup.setdefault(key, country)
+                    names[key] = country
+        names.update(canonical)
+
+        # Trigram index over names and aliases (ISO codes are too short to match fuzzily)
+        self._keys = list(names)
+        self._key_country = [names[key] for key in self._keys]
+        self._key_trigrams = [len(trigrams(key)) for key in self._keys]
+        self._postings = {}
+        for key_id, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, []).append(key_id)
+
+    def __len__(self):
+        return len(self.lookup)
+
+    def resolve(self, name):
+        """Dataset name for user input, or None"""
+        if name in self.codes:
+            return name
+        return self.lookup.get(normalize_name(name))
+
+    def resolve_many(self, names):
+        """resolve() over a list; repeated inputs are normalized once"""
+        cache = {}
+        resolved = []
+        for name in names:
+            if name not in cache:
+                cache[name] = self.resolve(name)
+            resolved.append(cache[name])
+        return resolved
+
+    def encode(self, names):
+        """
+        Dataset names and model codes for a list of inputs
+
+        Returns: (names, codes); unknown inputs (or countries without a model
+        code) get None and -1
+        """
+        resolved = self.resolve_many(names)
+        codes = np.fromiter((self.codes.get(name, -1) for name in resolved), dtype=np.int64, count=len(resolved))
+        return resolved, codes
+
+    def suggest(self, name, limit=5):
+        """Most similar dataset names: trigram shortlist, ranked by difflib ratio"""
+        key = normalize_name(name)
+        query = trigrams(key)
+        shared = Counter()
+        for gram in query:
+            shared.update(self._postings.get(gram, ()))
+        shortlist = sorted(
+            shared,
+            key=lambda key_id: -shared[key_id] / (len(query) + self._key_trigrams[key_id] - shared[key_id])
+        )[:SUGGEST_SHORTLIST]
+
+        best = {}
+        for key_id in shortlist:
+            similarity = SequenceMatcher(None, key, self._keys[key_id]).ratio()
+            country = self._key_country[key_id]
+            if similarity >= SUGGEST_MIN_SIMILARITY and similarity > best.get(country, 0):
+                best[country] = similarity
+        return sorted(best, key=lambda country: (-best[country], country))[:limit]
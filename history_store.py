@@ -0,0 +1,194 @@
+"""
+In-memory historical data store
+Pre-sorted, year-indexed columnar storage for fast history queries
+
+Rows are sorted by (Country, Year) once at load time. Each country maps to
+a contiguous slice, and year ranges inside a slice are found with a binary
+search, so a query never scans the full dataset.
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+# All columns of final_data_with_year.csv (besides Country)
+DATA_COLUMNS = [
+    'Year',
+    'Population_Growth_Rate',
+    'Exports of goods and services_Growth_Rate',
+    'Imports of goods and services_Growth_Rate',
+    'Gross capital formation_Growth_Rate',
+    'Final consumption expenditure_Growth_Rate',
+    'Government_Expenditure_Growth_Rate',
+    'GDP_Growth_Rate'
+]
+
+# Short names accepted in projections (legacy /api/history field names)
+FIELD_ALIASES = {
+    'GDP_Growth': 'GDP_Growth_Rate',
+    'Population_Growth': 'Population_Growth_Rate',
+    'Exports_Growth': 'Exports of goods and services_Growth_Rate',
+    'Imports_Growth': 'Imports of goods and services_Growth_Rate',
+    'Investment_Growth': 'Gross capital formation_Growth_Rate',
+    'Consumption_Growth': 'Final consumption expenditure_Growth_Rate',
+    'Govt_Spend_Growth': 'Government_Expenditure_Growth_Rate'
+}
+
+# Fields returned by the original single-country /api/history response
+LEGACY_FIELDS = ['GDP_Growth', 'Exports_Growth', 'Imports_Growth']
+
+
+class HistoryStore:
+    """Columnar country-year store with per-country slices"""
+
+    def __init__(self, countries, country_index, columns, baselines=None, version=None):
+        self.countries = countries
+        self._country_index = country_index
+        self._columns = columns
+        self._baselines = baselines or {}
+        self.version = version
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the store from a DataFrame with the dataset columns"""
+        df = df.sort_values(['Country', 'Year'], kind='mergesort')
+        country_values = df['Country'].to_numpy()
+
+        # Country boundaries in the sorted rows
+        starts = np.flatnonzero(np.r_[True, country_values[1:] != country_values[:-1]])
+        stops = np.r_[starts[1:], len(country_values)]
+        countries = country_values[starts].tolist()
+        country_index = {
+            country: (int(start), int(stop))
+            for country, start, stop in zip(countries, starts, stops)
+        }
+
+        columns = {'Year': df['Year'].to_numpy(dtype=np.int64)}
+        for column in DATA_COLUMNS[1:]:
+            columns[column] = df[column].to_numpy(dtype=np.float64)
+
+        return cls(countries, country_index, columns)
+
+    @classmethod
+    def from_directory(cls, path):
+        """
+        Build the store from the binary per-country dataset written by ingest_data.py
+
+        Each country is one (rows, len(DATA_COLUMNS)) float64 .npy file listed
+        in index.json; baselines.json holds the precomputed per-country means.
+        """
+        with open(os.path.join(path, 'index.json')) as f:
+            index = json.load(f)
+        baselines = {}
+        baselines_path = os.path.join(path, 'baselines.json')
+        if os.path.exists(baselines_path):
+            with open(baselines_path) as f:
+                baselines = json.load(f)
+
+        countries = sorted(index['countries'])
+        blocks = [np.load(os.path.join(path, index['countries'][c]['file'])) for c in countries]
+        stops = np.cumsum([len(block) for block in blocks])
+        starts = stops - [len(block) for block in blocks]
+        country_index = {
+            country: (int(start), int(stop))
+            for country, start, stop in zip(countries, starts, stops)
+        }
+
+        data = np.concatenate(blocks) if blocks else np.empty((0, len(DATA_COLUMNS)))
+        columns = {'Year': data[:, 0].astype(np.int64)}
+        for j, column in enumerate(DATA_COLUMNS[1:], start=1):
+            columns[column] = np.ascontiguousarray(data[:, j])
+
+        return cls(countries, country_index, columns, baselines, index.get('version'))
+
+    def __len__(self):
+        return len(self._columns['Year'])
+
+    def __contains__(self, country):
+        return country in self._country_index
+
+    @property
+    def year_range(self):
+        years = self._columns['Year']
+        return (int(years.min()), int(years.max())) if len(years) else (None, None)
+
+    @staticmethod
+    def resolve_field(field):
+        """Map a requested field name to its dataset column (None if unknown)"""
+        column = FIELD_ALIASES.get(field, field)
+        return column if column in DATA_COLUMNS else None
+
+    def country_rows(self, country, year_from=None, year_to=None):
+        """Return the (start, stop) row range for a country and year range"""
+        start, stop = self._country_index[country]
+        years = self._columns['Year'][start:stop]
+        lo = 0 if year_from is None else np.searchsorted(years, year_from, side='left')
+        hi = len(years) if year_to is None else np.searchsorted(years, year_to, side='right')
+        return start + int(lo), start + int(hi)
+
+    def column(self, column, start=None, stop=None):
+        """Return a read-only view of a dataset column"""
+        return self._columns[column][start:stop]
+
+    def baseline(self, country):
+        """Historical mean of every growth column for a country"""
+        if country in self._baselines:
+            return self._baselines[country]['means']
+        start, stop = self._country_index[country]
+        return {
+            column: float(np.nanmean(self._columns[column][start:stop]))
+            for column in DATA_COLUMNS[1:]
+        }
+
+    def query(self, countries, fields, year_from=None, year_to=None):
+        """
+        Query several countries at once
+
+        Returns: {country: {field: array}} with 'Year' always included
+        """
+        result = {}
+        for country in countries:
+            start, stop = self.country_rows(country, year_from, year_to)
+            series = {'Year': self._columns['Year'][start:stop]}
+            for field in fields:
+                series[field] = self._columns[self.resolve_field(field)][start:stop]
+            result[country] = series
+        return result
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Picks n_out indices that preserve the visual shape of the (x, y) series.
+    Always keeps the first and last points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        next_start, next_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
@@ -0,0 +1,320 @@
+"""
+GDP Economic Scenario Simulator - Incremental Data Ingestion
+Adds new country-years without reprocessing the whole dataset
+
+Raw files hold indicator LEVELS (not growth rates) per country-year:
+    Country, Year, Population, Exports of goods and services,
+    Imports of goods and services, Gross capital formation,
+    Final consumption expenditure, Government_Expenditure, GDP
+
+Growth rates for year Y need the level of year Y-1, either ingested earlier
+or included in the same file. Only changed country-years (and the year
+after each of them) are re-derived; only affected countries are rewritten
+in the binary store, and every run is recorded in data_store/manifest.json.
+
+Usage:
+    python ingest_data.py --rebuild              # build data_store/ from the CSV
+    python ingest_data.py new_rows.csv [...]     # ingest raw indicator files
+    python ingest_data.py new_rows.csv --dry-run # validate and report only
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from history_store import DATA_COLUMNS
+from config import DATASET_PATH, RAW_DATA_PATH, DATA_STORE_DIR, GROWTH_RATE_LIMIT
+
+
+KEY_COLUMNS = ['Country', 'Year']
+
+# Raw indicators in dataset column order; growth column = f"{name}_Growth_Rate"
+RAW_INDICATORS = [
+    'Population',
+    'Exports of goods and services',
+    'Imports of goods and services',
+    'Gross capital formation',
+    'Final consumption expenditure',
+    'Government_Expenditure',
+    'GDP'
+]
+GROWTH_COLUMNS = [f'{name}_Growth_Rate' for name in RAW_INDICATORS]
+
+YEAR_RANGE = (1900, 2100)
+
+
+def validate_raw(df):
+    """
+    Vectorized schema and range checks for raw indicator rows
+
+    Returns: list of error messages (empty if valid)
+    """
+    missing = [c for c in KEY_COLUMNS + RAW_INDICATORS if c not in df.columns]
+    if missing:
+        return [f'Missing columns: {", ".join(missing)}']
+
+    year = pd.to_numeric(df['Year'], errors='coerce')
+    levels = df[RAW_INDICATORS].apply(pd.to_numeric, errors='coerce')
+
+    checks = [
+        (df['Country'].isna() | df['Country'].astype(str).str.strip().eq(''), 'Empty country'),
+        (year.isna() | (year % 1 != 0) | ~year.between(*YEAR_RANGE), 'Invalid year'),
+        (~np.isfinite(levels).all(axis=1), 'Non-numeric indicator level'),
+        ((levels <= 0).any(axis=1), 'Indicator level must be positive'),
+        (df.duplicated(KEY_COLUMNS, keep=False), 'Duplicate country-year')
+    ]
+
+    errors = []
+    for mask, message in checks:
+        if mask.any():
+            # +2: header line and 1-based line numbers
+            lines = (np.flatnonzero(mask.to_numpy()) + 2).tolist()
+            errors.append(f'{message}: lines {lines[:10]}{" ..." if len(lines) > 10 else ""}')
+    return errors
+
+
+def normalize_raw(df):
+    """Strip country names and coerce types of validated raw rows"""
+    df = df[KEY_COLUMNS + RAW_INDICATORS].copy()
+    df['Country'] = df['Country'].astype(str).str.strip()
+    df['Year'] = pd.to_numeric(df['Year']).astype(int)
+    df[RAW_INDICATORS] = df[RAW_INDICATORS].astype(float)
+    return df
+
+
+def changed_rows(new_raw, raw):
+    """Rows of new_raw that are not in raw, or differ from it"""
+    merged = new_raw.merge(raw, on=KEY_COLUMNS, how='left', suffixes=('', '_old'))
+    old = merged[[f'{name}_old' for name in RAW_INDICATORS]].to_numpy()
+    new = merged[RAW_INDICATORS].to_numpy()
+    is_changed = ~np.isclose(new, old, rtol=1e-12, atol=0).all(axis=1)
+    return new_raw[is_changed]
+
+
+def derive_growth(raw, keys):
+    """
+    Compute growth rates for the given country-years from raw levels
+
+    Returns: (derived rows with DATA_COLUMNS, keys that lack a previous-year level)
+    """
+    sub = raw[raw['Country'].isin(keys['Country'].unique())].sort_values(KEY_COLUMNS)
+    grouped = sub.groupby('Country')
+    previous = grouped[RAW_INDICATORS].shift(1).to_numpy()
+    consecutive = (sub['Year'] - grouped['Year'].shift(1)).eq(1).to_numpy()
+
+    growth = (sub[RAW_INDICATORS].to_numpy() / previous - 1) * 100
+    derived = pd.DataFrame(growth, columns=GROWTH_COLUMNS, index=sub.index)
+    derived.insert(0, 'Year', sub['Year'])
+    derived.insert(0, 'Country', sub['Country'])
+
+    # Left merge keeps row order, so the flag lines up with `derived`
+    wanted = sub[KEY_COLUMNS].merge(keys.assign(_wanted=True), on=KEY_COLUMNS, how='left')
+    wanted = wanted['_wanted'].notna().to_numpy()
+
+    underived = derived[wanted & ~consecutive][KEY_COLUMNS]
+    derived = derived[wanted & consecutive].reset_index(drop=True)
+    return derived, underived.reset_index(drop=True)
+
+
+def country_file(country):
+    """Stable, filesystem-safe file name for a country"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', country).strip('_')
+    digest = hashlib.sha1(country.encode('utf-8')).hexdigest()[:8]
+    return f'{slug}-{digest}.npy'
+
+
+def _write_json(path, data):
+    """Write JSON atomically so readers never see a partial file"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_store(df, countries, store_dir=DATA_STORE_DIR):
+    """
+    Rewrite the binary store entries and baselines of the given countries only
+
+    Returns: ({country: content hash} for the rewritten countries, store version)
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    index_path = os.path.join(store_dir, 'index.json')
+    baselines_path = os.path.join(store_dir, 'baselines.json')
+    index = _read_json(index_path, {'version': 0, 'countries': {}})
+    baselines = _read_json(baselines_path, {})
+
+    hashes = {}
+    subset = df[df['Country'].isin(countries)].sort_values(KEY_COLUMNS)
+    for country, rows in subset.groupby('Country'):
+        data = rows[DATA_COLUMNS].to_numpy(dtype=np.float64)
+        file_name = country_file(country)
+        np.save(os.path.join(store_dir, file_name), data)
+
+        content_hash = hashlib.sha256(data.tobytes()).hexdigest()[:16]
+        index['countries'][country] = {
+            'file': file_name,
+            'rows': len(data),
+            'years': [int(data[0, 0]), int(data[-1, 0])],
+            'hash': content_hash
+        }
+        baselines[country] = {
+            'count': len(data),
+            'means': {column: float(np.nanmean(data[:, j])) for j, column in enumerate(DATA_COLUMNS) if j > 0}
+        }
+        hashes[country] = content_hash
+
+    index['version'] += 1
+    _write_json(baselines_path, baselines)
+    _write_json(index_path, index)
+    return hashes, index['version']
+
+
+def record_manifest(entry, store_dir=DATA_STORE_DIR):
+    """Append one ingestion run to the manifest"""
+    manifest_path = os.path.join(store_dir, 'manifest.json')
+    manifest = _read_json(manifest_path, {'entries': []})
+    manifest['entries'].append(entry)
+    _write_json(manifest_path, manifest)
+
+
+def rebuild_store():
+    """Build the binary store for every country from DATASET_PATH"""
+    print(f"📂 Loading data from: {DATASET_PATH}")
+    df = pd.read_csv(DATASET_PATH, float_precision='round_trip')
+    countries = df['Country'].unique().tolist()
+
+    print(f"🔧 Writing binary store for {len(countries)} countries to: {DATA_STORE_DIR}/")
+    hashes, version = update_store(df, countries)
+    record_manifest({
+        'version': version,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'action': 'rebuild',
+        'rows': len(df),
+        'countries': {country: {'hash': h} for country, h in hashes.items()}
+    })
+    print(f"✅ Store version {version} written ({len(df)} rows)")
+
+
+def ingest(paths, dry_run=False):
+    """Ingest raw indicator files, re-deriving only affected country-years"""
+    new_raw = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    print(f"📂 Loaded {len(new_raw)} raw rows from {len(paths)} file(s)")
+
+    errors = validate_raw(new_raw)
+    if errors:
+        print("❌ Validation failed:")
+        for error in errors:
+            print(f"   {error}")
+        return False
+    new_raw = normalize_raw(new_raw)
+
+    if os.path.exists(RAW_DATA_PATH):
+        raw = normalize_raw(pd.read_csv(RAW_DATA_PATH, float_precision='round_trip'))
+    else:
+        raw = pd.DataFrame(columns=KEY_COLUMNS + RAW_INDICATORS)
+    raw = raw.astype({'Year': int, **{name: float for name in RAW_INDICATORS}})
+
+    changed = changed_rows(new_raw, raw)
+    if changed.empty:
+        print("✅ No changes - all rows already ingested")
+        return True
+    print(f"🔍 {len(changed)} new or changed raw rows")
+
+    # Merge raw levels, then re-derive changed years and the year after each
+    changed_keys = changed[KEY_COLUMNS]
+    raw = raw.merge(changed_keys, on=KEY_COLUMNS, how='left', indicator=True)
+    raw = raw[raw['_merge'] == 'left_only'].drop(columns='_merge')
+    raw = pd.concat([raw, changed], ignore_index=True).sort_values(KEY_COLUMNS, ignore_index=True)
+
+    next_keys = changed_keys.assign(Year=changed_keys['Year'] + 1).merge(raw[KEY_COLUMNS], on=KEY_COLUMNS)
+    affected = pd.concat([changed_keys, next_keys]).drop_duplicates(ignore_index=True)
+    derived, underived = derive_growth(raw, affected)
+
+    growth = derived[GROWTH_COLUMNS]
+    clipped = int(((growth < -GROWTH_RATE_LIMIT) | (growth > GROWTH_RATE_LIMIT)).to_numpy().sum())
+    derived[GROWTH_COLUMNS] = growth.clip(-GROWTH_RATE_LIMIT, GROWTH_RATE_LIMIT)
+
+    df = pd.read_csv(DATASET_PATH, float_precision='round_trip')
+    existing = derived.merge(df[KEY_COLUMNS], on=KEY_COLUMNS, how='left', indicator=True)['_merge'] == 'both'
+    added = derived[~existing.to_numpy()]
+    updated = derived[existing.to_numpy()]
+
+    summary = {}
+    for label, rows in (('added', added), ('updated', updated)):
+        for country, years in rows.groupby('Country')['Year']:
+            summary.setdefault(country, {})[label] = sorted(years.tolist())
+
+    print(f"   Derived {len(derived)} country-years ({len(added)} added, {len(updated)} updated)"
+          f" across {len(summary)} countries")
+    if len(underived):
+        print(f"   ⚠️ {len(underived)} country-years kept as raw only (no previous-year level)")
+    if clipped:
+        print(f"   ⚠️ {clipped} growth values clipped to ±{GROWTH_RATE_LIMIT:g}%")
+
+    if dry_run:
+        print("🧪 Dry run - nothing written")
+        return True
+
+    if len(derived):
+        df = df.merge(derived[KEY_COLUMNS], on=KEY_COLUMNS, how='left', indicator=True)
+        df = df[df['_merge'] == 'left_only'].drop(columns='_merge')
+        df = pd.concat([df, derived[['Country'] + DATA_COLUMNS]], ignore_index=True)
+        df = df.sort_values(KEY_COLUMNS, ignore_index=True)
+        df.to_csv(DATASET_PATH, index=False)
+        print(f"💾 Updated dataset: {DATASET_PATH} ({len(df)} rows)")
+
+    raw.to_csv(RAW_DATA_PATH, index=False)
+    print(f"💾 Updated raw levels: {RAW_DATA_PATH} ({len(raw)} rows)")
+
+    if not summary:
+        return True
+
+    hashes, version = update_store(df, list(summary))
+    for country, content_hash in hashes.items():
+        summary[country]['hash'] = content_hash
+    record_manifest({
+        'version': version,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'action': 'ingest',
+        'sources': [os.path.basename(path) for path in paths],
+        'countries': summary,
+        'raw_only': underived.to_dict(orient='records'),
+        'clipped_values': clipped
+    })
+    print(f"💾 Store version {version}: rewrote {len(hashes)} countries in {DATA_STORE_DIR}/")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental data ingestion for the scenario simulator')
+    parser.add_argument('files', nargs='*', help='Raw indicator CSV files to ingest')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the binary store from the dataset CSV')
+    parser.add_argument('--dry-run', action='store_true', help='Validate and report without writing')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rebuild_store()
+    if args.files:
+        if not os.path.exists(os.path.join(DATA_STORE_DIR, 'index.json')) and not args.dry_run:
+            rebuild_store()
+        if not ingest(args.files, dry_run=args.dry_run):
+            raise SystemExit(1)
+    elif not args.rebuild:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
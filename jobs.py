@@ -0,0 +1,601 @@
+"""
+GDP Economic Scenario Simulator - Background Jobs
+Long-running sweeps, backtests and Monte Carlo runs outside the request path
+
+Submitting a job returns its id immediately. The queue, job state and
+cancellation requests live in SQLite (JOBS_DIR/jobs.db), shared by every
+API worker on the host. Each worker has a dispatcher thread, but only the
+holder of JOBS_DIR/runner.lock (flock) runs jobs, one at a time, so the
+host runs a single process pool sized to its cores. Jobs are split into
+chunks: progress is reported per chunk, a cancellation takes effect at the
+next chunk boundary, and each chunk's output is written to JOBS_DIR/<id>/
+as it completes, then combined into the result files there.
+
+A 'running' job found while holding the runner lock belongs to a worker
+that exited (the lock is released with its process): it is marked failed,
+and resubmitting it resumes from the chunks already on disk.
+
+Job ids are a hash of (type, normalized params, model version): submitting
+an identical request returns the queued, running or finished job instead of
+starting a new one (checked and inserted in one write transaction).
+"""
+
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+from config import (
+    MODEL_BACKEND,
+    BACKEND_PARAMS,
+    SLIM_RUNTIME,
+    FEATURE_CACHE_PATH,
+    SCENARIO_INPUT_FIELDS,
+    JOBS_DIR,
+    JOB_WORKERS,
+    JOB_CHUNK_ROWS,
+    JOB_MAX_ROWS,
+    JOB_POLL_INTERVAL
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    model_version TEXT,
+    status TEXT NOT NULL,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER,
+    error TEXT,
+    submitted_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    owner TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+# Added after the first release; created on existing databases
+MIGRATIONS = {
+    'owner': 'ALTER TABLE jobs ADD COLUMN owner TEXT',
+    'cancel_requested': 'ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0'
+}
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINAL_STATUSES = ('done', 'failed', 'cancelled')
+
+SUMMARY_FILE = 'summary.json'
+ARRAYS_FILE = 'arrays.npz'
+CHUNK_FILE = 'chunk-{:06d}.npz'
+LOCK_FILE = 'runner.lock'
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+# ----------------------------------------------------------------------------
+# Worker side (runs in the process pool)
+# ----------------------------------------------------------------------------
+
+_worker_cache = {}
+
+
+def _served_model():
+    """Served backend, loaded once per worker process (single-threaded inside the pool)"""
+    # Imported here so the slim runtime never loads scikit-learn
+    if 'model' not in _worker_cache:
+        if SLIM_RUNTIME:
+            import slim_runtime
+            backend = slim_runtime.load_model(MODEL_BACKEND)
+        else:
+            from model_backends import load_backend
+            backend = load_backend(MODEL_BACKEND)
+            if hasattr(backend.model, 'n_jobs'):
+                backend.model.n_jobs = 1
+        _worker_cache['model'] = backend
+    return _worker_cache['model']
+
+
+def _feature_cache():
+    if 'features' not in _worker_cache:
+        with np.load(FEATURE_CACHE_PATH) as cache:
+            _worker_cache['features'] = {key: cache[key] for key in ('X', 'y', 'year')}
+    return _worker_cache['features']
+
+
+def _close_inherited_lock(fd):
+    """Pool initializer: drop the forked copy of the runner lock, so it dies with the runner"""
+    try:
+        os.close(fd)
+    except OSError:
+        pass
+
+
+def run_chunk(job_type, params, spec):
+    """Pool entry point: execute one chunk of a job"""
+    return JOB_TYPES[job_type].run_chunk(params, spec)
+
+
+# ----------------------------------------------------------------------------
+# Job types: validate -> plan (chunk specs) -> run_chunk (worker) -> combine
+# ----------------------------------------------------------------------------
+
+def _row_chunks(n_rows):
+    return [(start, min(start + JOB_CHUNK_ROWS, n_rows)) for start in range(0, n_rows, JOB_CHUNK_ROWS)]
+
+
+def _inputs(values, name):
+    """Six scenario inputs from a {field: value} dict, in model order"""
+    if not isinstance(values, dict):
+        raise ValueError(f'"{name}" must be an object keyed by input field')
+    missing = [field for field in SCENARIO_INPUT_FIELDS if field not in values]
+    if missing:
+        raise ValueError(f'"{name}" is missing: {", ".join(missing)}')
+    return {field: float(values[field]) for field in SCENARIO_INPUT_FIELDS}
+
+
+class SweepJob:
+    """Dense grid over 1-3 inputs for one country, other inputs held at 'base'"""
+
+    name = 'sweep'
+
+    @staticmethod
+    def validate(params):
+        axes = params.get('axes')
+        if not isinstance(axes, list) or not 1 <= len(axes) <= 3:
+            raise ValueError('"axes" must be a list of 1 to 3 {field, min, max, steps} objects')
+        normalized_axes = []
+        for axis in axes:
+            field = axis.get('field')
+            if field not in SCENARIO_INPUT_FIELDS:
+                raise ValueError(f'Unknown axis field: {field}')
+            lo, hi, steps = float(axis['min']), float(axis['max']), int(axis['steps'])
+            if not -100 <= lo < hi <= 100 or steps < 2:
+                raise ValueError(f'Axis {field}: need -100 <= min < max <= 100 and steps >= 2')
+            normalized_axes.append({'field': field, 'min': lo, 'max': hi, 'steps': steps})
+        if len({axis['field'] for axis in normalized_axes}) != len(normalized_axes):
+            raise ValueError('Axis fields must be distinct')
+        if int(np.prod([axis['steps'] for axis in normalized_axes])) > JOB_MAX_ROWS:
+            raise ValueError(f'Grid has more than {JOB_MAX_ROWS} points')
+        return {
+            'Country': params['Country'],
+            'country_code': int(params['country_code']),
+            'base': _inputs(params.get('base'), 'base'),
+            'axes': normalized_axes
+        }
+
+    @staticmethod
+    def plan(params):
+        return _row_chunks(int(np.prod([axis['steps'] for axis in params['axes']])))
+
+    @staticmethod
+    def run_chunk(params, spec):
+        start, stop = spec
+        shape = [axis['steps'] for axis in params['axes']]
+        X = np.empty((stop - start, 1 + len(SCENARIO_INPUT_FIELDS)), dtype=np.float64)
+        X[:, 0] = params['country_code']
+        X[:, 1:] = [params['base'][field] for field in SCENARIO_INPUT_FIELDS]
+        coords = np.unravel_index(np.arange(start, stop), shape)
+        for axis, coord in zip(params['axes'], coords):
+            values = np.linspace(axis['min'], axis['max'], axis['steps'])
+            X[:, 1 + SCENARIO_INPUT_FIELDS.index(axis['field'])] = values[coord]
+        return {'predictions': _served_model().predict_batch(X).astype(np.float32)}
+
+    @staticmethod
+    def combine(params, outputs):
+        shape = [axis['steps'] for axis in params['axes']]
+        grid = np.concatenate([out['predictions'] for out in outputs]).reshape(shape)
+        axis_values = {
+            axis['field']: np.linspace(axis['min'], axis['max'], axis['steps'])
+            for axis in params['axes']
+        }
+
+        def point(flat_index):
+            coords = np.unravel_index(flat_index, shape)
+            inputs = {field: round(float(axis_values[field][c]), 4) for field, c in zip(axis_values, coords)}
+            return {'inputs': inputs, 'predicted_gdp_growth': round(float(grid[coords]), 2)}
+
+        summary = {
+            'country': params['Country'],
+            'shape': shape,
+            'points': int(grid.size),
+            'mean': round(float(grid.mean()), 2),
+            'min': point(int(grid.argmin())),
+            'max': point(int(grid.argmax()))
+        }
+        arrays = {'grid': grid, **{f'axis_{field}': values for field, values in axis_values.items()}}
+        return summary, arrays
+
+
+class MonteCarloJob:
+    """Distribution of predicted GDP growth under independent normal input shocks"""
+
+    name = 'monte_carlo'
+
+    QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+    HISTOGRAM_BINS = 40
+
+    @staticmethod
+    def validate(params):
+        samples = int(params.get('samples', 100000))
+        if not 1 <= samples <= JOB_MAX_ROWS:
+            raise ValueError(f'"samples" must be between 1 and {JOB_MAX_ROWS}')
+        std = _inputs(params.get('std'), 'std')
+        if any(value < 0 for value in std.values()):
+            raise ValueError('"std" values must be non-negative')
+        return {
+            'Country': params['Country'],
+            'country_code': int(params['country_code']),
+            'mean': _inputs(params.get('mean'), 'mean'),
+            'std': std,
+            'samples': samples,
+            'seed': int(params.get('seed', 42))
+        }
+
+    @staticmethod
+    def plan(params):
+        return [(i, start, stop) for i, (start, stop) in enumerate(_row_chunks(params['samples']))]
+
+    @staticmethod
+    def run_chunk(params, spec):
+        # One independent stream per chunk: results do not depend on the worker count
+        chunk_index, start, stop = spec
+        rng = np.random.default_rng(np.random.SeedSequence(params['seed'], spawn_key=(chunk_index,)))
+        mean = np.array([params['mean'][field] for field in SCENARIO_INPUT_FIELDS])
+        std = np.array([params['std'][field] for field in SCENARIO_INPUT_FIELDS])
+        X = np.empty((stop - start, 1 + len(SCENARIO_INPUT_FIELDS)), dtype=np.float64)
+        X[:, 0] = params['country_code']
+        X[:, 1:] = np.clip(mean + std * rng.standard_normal((stop - start, len(mean))), -100, 100)
+        return {'predictions': _served_model().predict_batch(X).astype(np.float32)}
+
+    @classmethod
+    def combine(cls, params, outputs):
+        predictions = np.concatenate([out['predictions'] for out in outputs])
+        counts, edges = np.histogram(predictions, bins=cls.HISTOGRAM_BINS)
+        summary = {
+            'country': params['Country'],
+            'samples': int(len(predictions)),
+            'mean': round(float(predictions.mean()), 3),
+            'std': round(float(predictions.std()), 3),
+            'quantiles': {
+                str(q): round(float(v), 3)
+                for q, v in zip(cls.QUANTILES, np.quantile(predictions, cls.QUANTILES))
+            },
+            'histogram': {'counts': counts.tolist(), 'edges': np.round(edges, 3).tolist()}
+        }
+        return summary, {'predictions': predictions}
+
+
+class BacktestJob:
+    """Rolling-origin backtest: for each year, fit on all earlier years and predict that year"""
+
+    name = 'backtest'
+
+    @staticmethod
+    def validate(params):
+        if SLIM_RUNTIME:
+            raise ValueError('Backtests refit models and need the full runtime (SLIM_RUNTIME=0)')
+        backend = params.get('backend', MODEL_BACKEND)
+        if backend not in BACKEND_PARAMS:
+            raise ValueError(f"Unknown model backend '{backend}' (available: {', '.join(BACKEND_PARAMS)})")
+        if not os.path.exists(FEATURE_CACHE_PATH):
+            raise ValueError(f'Feature cache {FEATURE_CACHE_PATH} not found - run train_scenario_model.py first')
+        with np.load(FEATURE_CACHE_PATH) as cache:
+            years = np.unique(cache['year'])
+        start_year = int(params.get('start_year', years[-10] if len(years) > 10 else years[1]))
+        end_year = int(params.get('end_year', years[-1]))
+        if start_year <= years[0] or start_year > end_year:
+            raise ValueError(f'Need {years[0]} < start_year <= end_year')
+        return {'backend': backend, 'start_year': start_year, 'end_year': end_year}
+
+    @staticmethod
+    def plan(params):
+        with np.load(FEATURE_CACHE_PATH) as cache:
+            years = np.unique(cache['year'])
+        return [int(y) for y in years if params['start_year'] <= y <= params['end_year']]
+
+    @staticmethod
+    def run_chunk(params, year):
+        from model_backends import get_backend
+        cache = _feature_cache()
+        backend_cls = get_backend(params['backend'])
+        overrides = {'n_jobs': 1} if 'n_jobs' in backend_cls().params else {}
+        train, test = cache['year'] < year, cache['year'] == year
+        backend = backend_cls(**overrides).fit(cache['X'][train], cache['y'][train])
+        return {
+            'year': np.full(int(test.sum()), year, dtype=np.int64),
+            'country_code': cache['X'][test, 0].astype(np.int64),
+            'y_true': cache['y'][test],
+            'y_pred': backend.predict_batch(cache['X'][test])
+        }
+
+    @staticmethod
+    def combine(params, outputs):
+        arrays = {key: np.concatenate([out[key] for out in outputs]) for key in outputs[0]}
+        errors = arrays['y_pred'] - arrays['y_true']
+
+        def metrics(mask):
+            y_true = arrays['y_true'][mask]
+            residual = ((y_true - arrays['y_pred'][mask]) ** 2).sum()
+            total = ((y_true - y_true.mean()) ** 2).sum()
+            return {
+                'rows': int(mask.sum()),
+                'mae': round(float(np.abs(errors[mask]).mean()), 4),
+                'r2': round(float(1 - residual / total), 4) if total > 0 else None
+            }
+
+        summary = {
+            'backend': params['backend'],
+            'overall': metrics(np.ones(len(errors), dtype=bool)),
+            'by_year': {str(year): metrics(arrays['year'] == year) for year in np.unique(arrays['year'])}
+        }
+        return summary, arrays
+
+
+JOB_TYPES = {job.name: job for job in (SweepJob, MonteCarloJob, BacktestJob)}
+
+
+# ----------------------------------------------------------------------------
+# Manager (runs in the API process)
+# ----------------------------------------------------------------------------
+
+class JobManager:
+    """SQLite-backed job queue shared by the API workers; one runner per host at a time"""
+
+    def __init__(self, jobs_dir=JOBS_DIR, workers=JOB_WORKERS, model_version=None):
+        self.jobs_dir = jobs_dir
+        self.workers = workers
+        self.model_version = model_version
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self.db_path = os.path.join(jobs_dir, 'jobs.db')
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self._wakeup = threading.Event()
+        self._pool = None
+        self._lock_fd = None
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+        # Also picks up jobs queued through workers that have since exited
+        self._dispatcher = threading.Thread(target=self._dispatch, name='job-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction taken up front: check-then-write is atomic across processes"""
+        with closing(self._connect()) as conn:
+            conn.isolation_level = None
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    def _update(self, job_id, **fields):
+        assignments = ', '.join(f'{key} = ?' for key in fields)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def result_path(self, job_id, name=SUMMARY_FILE):
+        return os.path.join(self.job_dir(job_id), name)
+
+    def _has_result(self, job_id):
+        return all(os.path.exists(self.result_path(job_id, name)) for name in (SUMMARY_FILE, ARRAYS_FILE))
+
+    def get(self, job_id):
+        """Job status dict, or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        job['progress'] = round(job['chunks_done'] / job['chunks_total'], 4) if job['chunks_total'] else 0.0
+        return job
+
+    def list(self, limit=50):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT id, type, status, chunks_done, chunks_total, submitted_at, finished_at, owner '
+                'FROM jobs ORDER BY submitted_at DESC LIMIT ?',
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def submit(self, job_type, params):
+        """
+        Queue a job (raises ValueError on invalid params)
+
+        Returns: (job dict, deduplicated) - deduplicated is True when an
+        identical job is already queued, running or finished
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type '{job_type}' (available: {', '.join(JOB_TYPES)})")
+        try:
+            params = JOB_TYPES[job_type].validate(params)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f'Invalid or missing parameter: {e}') from None
+
+        key = json.dumps([job_type, params, self.model_version], sort_keys=True)
+        job_id = hashlib.sha256(key.encode('utf-8')).hexdigest()[:20]
+
+        with self._transaction() as conn:
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            deduplicated = row is not None and (
+                row['status'] in ACTIVE_STATUSES or (row['status'] == 'done' and self._has_result(job_id))
+            )
+            if not deduplicated:
+                conn.execute(
+                    'INSERT OR REPLACE INTO jobs (id, type, params, model_version, status, submitted_at, owner) '
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    (job_id, job_type, json.dumps(params), self.model_version, _now(), self.owner)
+                )
+        if not deduplicated:
+            self._wakeup.set()
+        return self.get(job_id), deduplicated
+
+    def cancel(self, job_id):
+        """Request cancellation (seen by whichever worker runs the job); returns the job dict, or None"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (_now(), job_id)
+            )
+            conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return self.get(job_id)
+
+    @contextmanager
+    def _runner_lock(self):
+        """Host-wide lock held while running jobs (released by the OS if this process dies)"""
+        with open(os.path.join(self.jobs_dir, LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._lock_fd = lock_file.fileno()
+            try:
+                yield
+            finally:
+                self._lock_fd = None
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _has_work(self):
+        """Queued jobs to run, or running ones whose worker may have exited"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT 1 FROM jobs WHERE status IN ('queued', 'running') LIMIT 1"
+            ).fetchone() is not None
+
+    def _claim(self):
+        """Oldest queued job, marked running by this worker (runner lock held)"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY submitted_at, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, started_at = ?, chunks_done = 0, "
+                'cancel_requested = 0, error = NULL WHERE id = ?',
+                (self.owner, _now(), row['id'])
+            )
+        return self.get(row['id'])
+
+    def _fail_orphans(self):
+        """Jobs left 'running' by a worker that exited while holding the runner lock"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted: its worker exited', finished_at = ? "
+                "WHERE status = 'running'",
+                (_now(),)
+            )
+
+    def _dispatch(self):
+        while True:
+            self._wakeup.wait(JOB_POLL_INTERVAL)
+            self._wakeup.clear()
+            try:
+                if not self._has_work():
+                    continue
+                with self._runner_lock():
+                    self._fail_orphans()
+                    while (job := self._claim()) is not None:
+                        try:
+                            self._run(job)
+                        except Exception as e:
+                            print(f"❌ Job {job['id']} failed: {e}")
+                            self._update(job['id'], status='failed', error=str(e), finished_at=_now())
+                            if self._pool is not None:
+                                self._pool.shutdown(wait=False, cancel_futures=True)
+                                self._pool = None
+                    # Idle: free the pool so only the active runner holds one
+                    if self._pool is not None:
+                        self._pool.shutdown()
+                        self._pool = None
+            except Exception as e:
+                print(f"⚠️ Job dispatcher error: {e}")
+
+    def _cancel_requested(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return row is None or bool(row['cancel_requested'])
+
+    def _write_chunk(self, job_id, index, output):
+        path = self.result_path(job_id, CHUNK_FILE.format(index))
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, **output)
+        os.replace(path + '.tmp', path)
+
+    def _read_chunk(self, job_id, index):
+        with np.load(self.result_path(job_id, CHUNK_FILE.format(index))) as chunk:
+            return {key: chunk[key] for key in chunk.files}
+
+    def _run(self, job):
+        job_id, job_cls, params = job['id'], JOB_TYPES[job['type']], job['params']
+        chunks = job_cls.plan(params)
+        os.makedirs(self.job_dir(job_id), exist_ok=True)
+
+        # Chunks spilled by an interrupted earlier run of this job are reused
+        todo = [i for i in range(len(chunks))
+                if not os.path.exists(self.result_path(job_id, CHUNK_FILE.format(i)))]
+        done = len(chunks) - len(todo)
+        self._update(job_id, chunks_total=len(chunks), chunks_done=done)
+        if todo and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_close_inherited_lock,
+                                             initargs=(self._lock_fd,))
+
+        # Bounded window of in-flight chunks keeps memory flat and cancellation prompt
+        pending = {}
+        next_todo = 0
+        while done < len(chunks):
+            if self._cancel_requested(job_id):
+                for future in pending:
+                    future.cancel()
+                self._update(job_id, status='cancelled', finished_at=_now())
+                return
+            while next_todo < len(todo) and len(pending) < 2 * self.workers:
+                index = todo[next_todo]
+                pending[self._pool.submit(run_chunk, job['type'], params, chunks[index])] = index
+                next_todo += 1
+            finished, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in finished:
+                self._write_chunk(job_id, pending.pop(future), future.result())
+                done += 1
+            if finished:
+                self._update(job_id, chunks_done=done)
+
+        outputs = [self._read_chunk(job_id, i) for i in range(len(chunks))]
+        summary, arrays = job_cls.combine(params, outputs)
+        np.savez(self.result_path(job_id, ARRAYS_FILE), **arrays)
+        with open(self.result_path(job_id, SUMMARY_FILE), 'w') as f:
+            json.dump(summary, f)
+        for path in glob.glob(self.result_path(job_id, 'chunk-*.npz')):
+            os.remove(path)
+        self._update(job_id, status='done', finished_at=_now())
+        print(f"✅ Job {job_id} ({job['type']}) done: {len(chunks)} chunks")
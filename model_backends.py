@@ -0,0 +1,129 @@
+"""
+Pluggable model backends for the GDP Scenario Simulator
+Shared by train_scenario_model.py, app_scenario.py and benchmark_backends.py
+
+Every backend takes the same feature matrix (Country_Encoded followed by the
+six growth rates) and exposes fit / predict_batch / save / load / metadata.
+The artifact on disk is the plain scikit-learn estimator, so existing
+gdp_scenario_model.pkl files load unchanged as the random_forest backend.
+"""
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+
+from artifacts import model_path
+from config import BACKEND_PARAMS
+
+
+class ModelBackend:
+    """Base class: wraps one scikit-learn regressor"""
+
+    name = None
+
+    def __init__(self, model=None, **params):
+        self.params = {**BACKEND_PARAMS[self.name], **params}
+        self.model = model
+
+    def build(self):
+        """Create an unfitted estimator from self.params"""
+        raise NotImplementedError
+
+    def _features(self, X):
+        return np.asarray(X, dtype=np.float64)
+
+    def fit(self, X, y):
+        self.model = self.build()
+        self.model.fit(self._features(X), np.asarray(y, dtype=np.float64))
+        return self
+
+    def predict_batch(self, X):
+        """Predict GDP growth for a 2-D feature matrix"""
+        return self.model.predict(self._features(X))
+
+    def feature_importances(self):
+        """Per-feature importances, or None if the estimator has none"""
+        return getattr(self.model, 'feature_importances_', None)
+
+    def save(self, path=None):
+        path = path or model_path(self.name)
+        joblib.dump(self.model, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        model = joblib.load(path or model_path(cls.name))
+        params = {k: v for k, v in model.get_params().items() if k in BACKEND_PARAMS[cls.name]}
+        return cls(model=model, **params)
+
+    def metadata(self):
+        return {
+            'backend': self.name,
+            'estimator': type(self.model).__name__ if self.model is not None else None,
+            'params': {k: v for k, v in self.params.items() if k != 'n_jobs'}
+        }
+
+
+class RandomForestBackend(ModelBackend):
+    """The original random forest (supports warm-start retraining)"""
+
+    name = 'random_forest'
+
+    def build(self):
+        return RandomForestRegressor(**self.params)
+
+    def metadata(self):
+        meta = super().metadata()
+        if self.model is not None:
+            meta['n_trees'] = len(self.model.estimators_)
+        return meta
+
+
+class HistGradientBoostingBackend(ModelBackend):
+    """Histogram gradient boosting; the country code is a categorical feature"""
+
+    name = 'hist_gradient_boosting'
+
+    def build(self):
+        return HistGradientBoostingRegressor(categorical_features=[0], **self.params)
+
+
+class LinearIdentityBackend(ModelBackend):
+    """
+    Regularized linear baseline over the six growth rates
+
+    Mirrors the GDP accounting identity (GDP growth as a weighted sum of
+    component growth rates); the country code is not used.
+    """
+
+    name = 'linear'
+
+    def build(self):
+        return Ridge(**self.params)
+
+    def _features(self, X):
+        return np.asarray(X, dtype=np.float64)[:, 1:]
+
+    def feature_importances(self):
+        # Country (unused) gets zero weight, growth rates their |coefficient| share
+        weights = np.abs(np.r_[0.0, self.model.coef_])
+        return weights / weights.sum()
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (RandomForestBackend, HistGradientBoostingBackend, LinearIdentityBackend)
+}
+
+
+def get_backend(name):
+    """Backend class by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown model backend '{name}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+
+def load_backend(name, path=None):
+    """Load a trained backend from disk"""
+    return get_backend(name).load(path)
@@ -0,0 +1,106 @@
+"""
+Live profiling helpers for the scenario simulator API
+
+- Sampling profiler: periodically snapshots the stacks of the worker's
+  request threads and aggregates them as collapsed stacks, the input
+  format of flamegraph.pl, speedscope and inferno. Runs on a background
+  thread, so the worker keeps serving (and being sampled) meanwhile
+- Stage timer: records per-stage wall time of a single request for the
+  slow-request log
+"""
+
+import json
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+
+def _collapse_frame(frame):
+    """Render a frame chain root-first as 'file:function:line;...'"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename.rsplit('/', 1)[-1]
+        parts.append(f"{filename}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+
+# Long-lived worker threads that would otherwise show up idle in every sample
+BACKGROUND_THREADS = ('stack-sampler', 'job-dispatcher', 'shadow-evaluator', 'request-capture')
+
+
+def sample_stacks(duration, interval, exclude=BACKGROUND_THREADS):
+    """
+    Sample the stacks of all other threads for `duration` seconds
+
+    Threads named in `exclude` are skipped (looked up every round, since
+    they are started lazily).
+
+    Returns: (Counter of collapsed stack -> sample count, number of sampling rounds)
+    """
+    own_id = threading.get_ident()
+    stacks = Counter()
+    rounds = 0
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        skipped = {thread.ident for thread in threading.enumerate() if thread.name in exclude}
+        skipped.add(own_id)
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id not in skipped:
+                stacks[_collapse_frame(frame)] += 1
+        rounds += 1
+        time.sleep(interval)
+
+    return stacks, rounds
+
+
+def format_collapsed(stacks):
+    """Format sampled stacks as 'frame;frame;frame count' lines"""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def start_sampling(duration, interval, path):
+    """
+    Sample stacks on a background thread and write them to `path` (collapsed)
+
+    `path + '.running'` exists while sampling; the stacks, then `path + '.json'`
+    (sample count), are renamed into place when done, so any process on the
+    host sees either the marker or the complete result. Returns the thread.
+    """
+    with open(path + '.running', 'w') as f:
+        json.dump({'pid': os.getpid(), 'until': time.time() + duration}, f)
+
+    def run():
+        try:
+            stacks, rounds = sample_stacks(duration, interval)
+            for suffix, content in (('', format_collapsed(stacks)), ('.json', json.dumps({'samples': rounds}))):
+                with open(path + suffix + '.tmp', 'w') as f:
+                    f.write(content)
+                os.replace(path + suffix + '.tmp', path + suffix)
+        finally:
+            os.remove(path + '.running')
+
+    thread = threading.Thread(target=run, name='stack-sampler', daemon=True)
+    thread.start()
+    return thread
+
+
+class StageTimer:
+    """Collects named stage durations (milliseconds) for one request"""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 3)
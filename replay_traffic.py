@@ -0,0 +1,228 @@
+"""
+GDP Economic Scenario Simulator - Traffic Replay
+Re-issue captured production traffic against running instances and compare them
+
+Requests captured with CAPTURE_SAMPLE_RATE > 0 (see capture.py) are replayed
+in timestamp order on the original schedule, compressed by --speed
+(0 = as fast as possible), with up to --concurrency requests in flight.
+The order, schedule, bodies and X-Client-Id headers (A/B assignment) are
+the same on every run. Each --target is replayed in turn; with two or more
+targets, latency, throughput and response bodies are compared against the
+first one.
+
+Usage:
+    python replay_traffic.py captures/ --target http://localhost:5000
+    python replay_traffic.py captures/ --target http://localhost:5000 --target http://localhost:5001 \\
+        --speed 4 --concurrency 8 --json replay.json
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from capture import read_captures
+
+
+_local = threading.local()
+
+
+def _session():
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def send(target, entry, timeout):
+    """Issue one captured request; returns (status or None, latency ms, body hash)"""
+    url = target.rstrip('/') + entry['path'] + (f"?{entry['query']}" if entry['query'] else '')
+    headers = {'X-Client-Id': entry['client']} if entry.get('client') else {}
+    start = time.perf_counter()
+    try:
+        response = _session().request(entry['method'], url, json=entry['body'], headers=headers,
+                                      timeout=timeout)
+        content = response.content
+        status = response.status_code
+    except requests.RequestException:
+        return None, (time.perf_counter() - start) * 1000, None
+    return status, (time.perf_counter() - start) * 1000, hashlib.sha256(content).hexdigest()[:16]
+
+
+def replay(entries, target, speed, concurrency, timeout):
+    """Replay entries against one target on the captured schedule"""
+    offsets = np.array([entry['ts'] for entry in entries]) - entries[0]['ts']
+    due = offsets / speed if speed > 0 else np.zeros(len(entries))
+    results = [None] * len(entries)
+
+    def run(i, due_at):
+        sent_at = time.perf_counter()
+        status, latency_ms, body_hash = send(target, entries[i], timeout)
+        results[i] = {
+            'status': status,
+            'latency_ms': latency_ms,
+            'lag_ms': (sent_at - due_at) * 1000 if speed > 0 else None,
+            'body': body_hash
+        }
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        for i in range(len(entries)):
+            due_at = start + due[i]
+            delay = due_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, i, due_at)
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def latency_summary(latencies):
+    if len(latencies) == 0:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(np.max(latencies))}
+
+
+def summarize(entries, results, elapsed):
+    """Overall and per-route statistics of one replay"""
+    ok = np.array([r['status'] is not None for r in results])
+    lags = [r['lag_ms'] for r in results if r['lag_ms'] is not None]
+    latencies = np.array([r['latency_ms'] for r in results])
+    by_route = defaultdict(list)
+    for entry, result, sent in zip(entries, results, ok):
+        if sent:
+            by_route[entry['route'] or entry['path']].append(result['latency_ms'])
+
+    return {
+        'requests': len(results),
+        'failed': int((~ok).sum()),
+        'status_changed': sum(1 for entry, r in zip(entries, results)
+                              if r['status'] is not None and r['status'] != entry['status']),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(results) / elapsed if elapsed > 0 else None,
+        'latency_ms': latency_summary(latencies[ok]),
+        'lag_ms_p99': float(np.percentile(lags, 99)) if lags else None,
+        'routes': {route: {'requests': len(values), **latency_summary(np.array(values))}
+                   for route, values in sorted(by_route.items())}
+    }
+
+
+def body_agreement(entries, baseline, other):
+    """Share of requests answered with identical bodies, overall and per route"""
+    same = defaultdict(list)
+    for entry, a, b in zip(entries, baseline, other):
+        if a['body'] is not None and b['body'] is not None:
+            same[entry['route'] or entry['path']].append(a['body'] == b['body'])
+    overall = [value for values in same.values() for value in values]
+    return {
+        'identical': float(np.mean(overall)) if overall else None,
+        'routes': {route: float(np.mean(values)) for route, values in sorted(same.items())}
+    }
+
+
+def model_version(target, timeout):
+    try:
+        return requests.get(target.rstrip('/') + '/', timeout=timeout).json().get('model_version')
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def _delta(new, old):
+    if new is None or old is None or old == 0:
+        return ''
+    return f'{(new - old) / old * 100:+.1f}%'
+
+
+def print_report(targets, summaries, agreements):
+    """Fixed-width report; deltas are relative to the first target"""
+    base = summaries[0]
+    print(f"\n{'':>22}" + ''.join(f'{f"target {i}":>22}' for i in range(len(targets))))
+    rows = [
+        ('requests', lambda s: s['requests'], '{:.0f}'),
+        ('failed', lambda s: s['failed'], '{:.0f}'),
+        ('status changed', lambda s: s['status_changed'], '{:.0f}'),
+        ('throughput (req/s)', lambda s: s['throughput_rps'], '{:.1f}'),
+        ('latency p50 (ms)', lambda s: s['latency_ms']['p50'], '{:.2f}'),
+        ('latency p95 (ms)', lambda s: s['latency_ms']['p95'], '{:.2f}'),
+        ('latency p99 (ms)', lambda s: s['latency_ms']['p99'], '{:.2f}'),
+        ('latency max (ms)', lambda s: s['latency_ms']['max'], '{:.2f}'),
+        ('schedule lag p99 (ms)', lambda s: s['lag_ms_p99'], '{:.2f}')
+    ]
+    for label, get, fmt in rows:
+        cells = []
+        for i, summary in enumerate(summaries):
+            value = get(summary)
+            cell = fmt.format(value) if value is not None else '-'
+            if i > 0 and label.startswith(('throughput', 'latency')):
+                cell += f' ({_delta(value, get(base))})'
+            cells.append(cell)
+        print(f'{label:>22}' + ''.join(f'{cell:>22}' for cell in cells))
+
+    print(f"\n{'route':<28}" + ''.join(f'{f"p50/p95 t{i} (ms)":>24}' for i in range(len(targets))))
+    for route in base['routes']:
+        cells = []
+        for summary in summaries:
+            stats = summary['routes'].get(route)
+            cells.append(f"{stats['p50']:.2f}/{stats['p95']:.2f}" if stats else '-')
+        print(f'{route:<28}' + ''.join(f'{cell:>24}' for cell in cells))
+
+    for i, agreement in enumerate(agreements, start=1):
+        if agreement['identical'] is None:
+            continue
+        print(f"\n🔍 target {i} vs target 0: {agreement['identical']:.1%} identical responses")
+        for route, share in agreement['routes'].items():
+            if share < 1:
+                print(f"   {route}: {share:.1%} identical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured traffic against running instances')
+    parser.add_argument('captures', nargs='+', help='Capture files or directories')
+    parser.add_argument('--target', action='append', required=True,
+                        help='Base URL to replay against (repeat to compare builds)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Schedule speed-up (1 = original rate, 0 = as fast as possible)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Maximum requests in flight')
+    parser.add_argument('--limit', type=int, help='Replay only the first N captured requests')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout (seconds)')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP ECONOMIC SCENARIO SIMULATOR - Traffic Replay")
+    print("=" * 60)
+
+    entries = read_captures(args.captures)[:args.limit]
+    if not entries:
+        raise SystemExit("❌ No captured requests found")
+    span = entries[-1]['ts'] - entries[0]['ts']
+    print(f"\n📂 {len(entries)} captured requests over {span:.1f}s"
+          f" (speed {'max' if args.speed <= 0 else f'{args.speed:g}x'}, concurrency {args.concurrency})")
+
+    summaries, all_results = [], []
+    for i, target in enumerate(args.target):
+        version = model_version(target, args.timeout)
+        print(f"\n🚀 target {i}: {target} (model version {version})")
+        results, elapsed = replay(entries, target, args.speed, args.concurrency, args.timeout)
+        summary = summarize(entries, results, elapsed)
+        summary.update({'target': target, 'model_version': version})
+        summaries.append(summary)
+        all_results.append(results)
+
+    agreements = [body_agreement(entries, all_results[0], results) for results in all_results[1:]]
+    print_report(args.target, summaries, agreements)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'targets': summaries, 'agreement': agreements}, f, indent=2)
+        print(f"\n💾 Results written to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
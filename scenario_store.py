@@ -0,0 +1,370 @@
+"""
+GDP Economic Scenario Simulator - Persistent Scenario Store
+Saved scenarios and named scenario sets in an embedded SQLite file
+
+Each scenario is keyed by a content hash of its normalized inputs, so a
+scenario saved in many sets (or many times) is stored once. Results are
+cached per (scenario hash, model version): re-running a saved set is one
+indexed join, and only scenarios without a result for the current model
+are recomputed, in a single batched predict.
+
+Usage:
+    python scenario_store.py list
+    python scenario_store.py seed                          # the example policy scenarios
+    python scenario_store.py import scenarios.csv --name my-set
+    python scenario_store.py export my-set my-set.json
+    python scenario_store.py delete my-set
+    python scenario_store.py prune                         # drop results of older model versions
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from artifacts import serving_artifacts
+from country_resolver import CountryResolver
+from validation import validate_scenarios
+from config import DATASET_PATH, MODEL_BACKEND, SCENARIO_DB_PATH, SCENARIO_ENCODER_PATH, SCENARIO_INPUT_FIELDS
+
+
+# Inputs are rounded to this many decimals before hashing
+HASH_DECIMALS = 6
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    hash TEXT PRIMARY KEY,
+    Country TEXT NOT NULL,
+    {', '.join(f'{field} REAL NOT NULL' for field in SCENARIO_INPUT_FIELDS)},
+    created_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS scenario_sets (
+    name TEXT PRIMARY KEY,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS set_members (
+    set_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    label TEXT,
+    PRIMARY KEY (set_name, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS set_members_hash ON set_members (hash);
+
+CREATE TABLE IF NOT EXISTS results (
+    hash TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    predicted REAL NOT NULL,
+    intervals TEXT,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (hash, model_version)
+) WITHOUT ROWID;
+"""
+
+# Named policy scenarios from test_scenario_simulator.py
+POLICY_SCENARIOS = [
+    ('baseline', ['United States', 2.0, 2.0, 2.0, 2.0, 2.0, 2.0]),
+    ('export-led growth', ['China', 0.5, 15.0, 8.0, 10.0, 7.0, 5.0]),
+    ('consumption-driven growth', ['United States', 1.0, 3.0, 4.0, 5.0, 12.0, 3.0]),
+    ('investment stimulus', ['India', 1.2, 6.0, 5.0, 15.0, 4.0, 3.0]),
+    ('austerity', ['Greece', 0.0, 2.0, 1.0, -2.0, -1.0, -5.0]),
+    ('trade war', ['United States', 1.0, -5.0, 3.0, 2.0, 2.0, 2.0])
+]
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def normalize_scenario(scenario):
+    """Country name stripped, inputs as floats rounded to HASH_DECIMALS (no -0.0)"""
+    normalized = {'Country': str(scenario['Country']).strip()}
+    for field in SCENARIO_INPUT_FIELDS:
+        normalized[field] = round(float(scenario[field]), HASH_DECIMALS) + 0.0
+    return normalized
+
+
+def load_country_resolver():
+    """Country resolver over the trained encoder's and the dataset's countries, as the API builds it"""
+    model_countries = []
+    if os.path.exists(SCENARIO_ENCODER_PATH):
+        import joblib
+        model_countries = joblib.load(SCENARIO_ENCODER_PATH).classes_.tolist()
+    with open(DATASET_PATH, newline='', encoding='utf-8') as f:
+        dataset_countries = sorted({row['Country'] for row in csv.DictReader(f)})
+    return CountryResolver(model_countries, dataset_countries)
+
+
+def scenario_hash(normalized):
+    """Content hash of a normalized scenario"""
+    key = json.dumps([normalized['Country']] + [normalized[field] for field in SCENARIO_INPUT_FIELDS])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def artifacts_version(paths):
+    """
+    Model version: content hash of the artifacts that determine a result
+
+    Missing files are skipped, so the version changes when any of them is
+    added, removed or retrained.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class ScenarioStore:
+    """SQLite-backed scenario sets with per-model-version result caching"""
+
+    def __init__(self, path=SCENARIO_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per operation: safe across request threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def save_set(self, name, scenarios, description=None):
+        """
+        Create or replace a named set from scenario dicts (optional 'label' key)
+
+        Returns: summary dict with the scenario hashes in set order
+        """
+        rows = []
+        members = []
+        for position, scenario in enumerate(scenarios):
+            try:
+                normalized = normalize_scenario(scenario)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f'Scenario {position}: invalid or missing value ({e})') from None
+            digest = scenario_hash(normalized)
+            rows.append([digest, normalized['Country']] + [normalized[f] for f in SCENARIO_INPUT_FIELDS])
+            members.append((name, position, digest, scenario.get('label')))
+
+        now = _now()
+        columns = ['hash', 'Country'] + SCENARIO_INPUT_FIELDS + ['created_at']
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO scenarios ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [row + [now] for row in rows]
+            )
+            new_scenarios = conn.total_changes - before
+            conn.execute(
+                'INSERT INTO scenario_sets (name, description, created_at, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET description = excluded.description, updated_at = excluded.updated_at',
+                (name, description, now, now)
+            )
+            conn.execute('DELETE FROM set_members WHERE set_name = ?', (name,))
+            conn.executemany('INSERT INTO set_members VALUES (?, ?, ?, ?)', members)
+
+        return {
+            'name': name,
+            'count': len(members),
+            'new_scenarios': new_scenarios,
+            'hashes': [member[2] for member in members]
+        }
+
+    def list_sets(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT s.name, s.description, s.updated_at, COUNT(m.position) AS count '
+                'FROM scenario_sets s LEFT JOIN set_members m ON m.set_name = s.name '
+                'GROUP BY s.name ORDER BY s.name'
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_set(self, name):
+        """Set with its scenarios in order (the export format), or None"""
+        with closing(self._connect()) as conn:
+            info = conn.execute('SELECT * FROM scenario_sets WHERE name = ?', (name,)).fetchone()
+            if info is None:
+                return None
+            rows = conn.execute(
+                f"SELECT m.hash, m.label, s.Country, {', '.join(f's.{f}' for f in SCENARIO_INPUT_FIELDS)} "
+                'FROM set_members m JOIN scenarios s ON s.hash = m.hash '
+                'WHERE m.set_name = ? ORDER BY m.position',
+                (name,)
+            ).fetchall()
+        return {
+            'name': info['name'],
+            'description': info['description'],
+            'created_at': info['created_at'],
+            'updated_at': info['updated_at'],
+            'scenarios': [{key: row[key] for key in row.keys() if row[key] is not None} for row in rows]
+        }
+
+    def delete_set(self, name):
+        """Delete a set; scenarios and results no other set uses are dropped too"""
+        with closing(self._connect()) as conn, conn:
+            deleted = conn.execute('DELETE FROM scenario_sets WHERE name = ?', (name,)).rowcount
+            conn.execute('DELETE FROM set_members WHERE set_name = ?', (name,))
+            conn.execute('DELETE FROM scenarios WHERE hash NOT IN (SELECT hash FROM set_members)')
+            conn.execute('DELETE FROM results WHERE hash NOT IN (SELECT hash FROM scenarios)')
+        return deleted > 0
+
+    def set_results(self, name, model_version):
+        """
+        Scenarios of a set joined with their cached results for model_version
+
+        Returns: list of row dicts in set order ('predicted' is None when
+        missing or computed by another model version), or None if no such set
+        """
+        with closing(self._connect()) as conn:
+            if conn.execute('SELECT 1 FROM scenario_sets WHERE name = ?', (name,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                f"SELECT m.hash, m.label, s.Country, {', '.join(f's.{f}' for f in SCENARIO_INPUT_FIELDS)}, "
+                'r.predicted, r.intervals '
+                'FROM set_members m JOIN scenarios s ON s.hash = m.hash '
+                'LEFT JOIN results r ON r.hash = m.hash AND r.model_version = ? '
+                'WHERE m.set_name = ? ORDER BY m.position',
+                (model_version, name)
+            ).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            if result['intervals'] is not None:
+                result['intervals'] = json.loads(result['intervals'])
+            results.append(result)
+        return results
+
+    def store_results(self, model_version, hashes, predictions, intervals=None):
+        """Cache predictions (and optional intervals) for model_version"""
+        now = _now()
+        if intervals is None:
+            intervals = [None] * len(hashes)
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                [
+                    (digest, model_version, float(prediction),
+                     json.dumps(interval) if interval is not None else None, now)
+                    for digest, prediction, interval in zip(hashes, predictions, intervals)
+                ]
+            )
+
+    def prune_results(self, keep_version):
+        """Drop cached results of every other model version"""
+        with closing(self._connect()) as conn, conn:
+            return conn.execute('DELETE FROM results WHERE model_version != ?', (keep_version,)).rowcount
+
+
+def read_scenario_file(path):
+    """
+    Scenarios from a CSV (Country, the six input columns, optional label) or
+    JSON file (a list of scenarios, or an exported set)
+
+    Returns: (scenarios, description)
+    """
+    if path.endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data.get('scenarios', []), data.get('description')
+        return data, None
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f)), None
+
+
+def write_scenario_file(scenario_set, path):
+    """Export a set as JSON (round-trips through import) or CSV"""
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(scenario_set, f, indent=2)
+        return
+    columns = ['label', 'Country'] + SCENARIO_INPUT_FIELDS
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(scenario_set['scenarios'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage saved scenario sets')
+    parser.add_argument('--db', default=SCENARIO_DB_PATH, help='SQLite file (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='List saved sets')
+    seed = commands.add_parser('seed', help='Save the example policy scenarios')
+    seed.add_argument('--name', default='policy-examples')
+    import_cmd = commands.add_parser('import', help='Import scenarios from CSV or JSON')
+    import_cmd.add_argument('file')
+    import_cmd.add_argument('--name', help='Set name (default: file name without extension)')
+    export_cmd = commands.add_parser('export', help='Export a set to CSV or JSON')
+    export_cmd.add_argument('name')
+    export_cmd.add_argument('file')
+    delete_cmd = commands.add_parser('delete', help='Delete a set')
+    delete_cmd.add_argument('name')
+    prune_cmd = commands.add_parser('prune', help='Drop cached results of other model versions')
+    prune_cmd.add_argument('--keep', help='Model version to keep (default: the served model\'s artifacts)')
+    args = parser.parse_args()
+
+    store = ScenarioStore(args.db)
+
+    if args.command == 'list':
+        for scenario_set in store.list_sets():
+            print(f"{scenario_set['name']}: {scenario_set['count']} scenarios "
+                  f"(updated {scenario_set['updated_at']})")
+    elif args.command == 'seed':
+        scenarios = [
+            dict(zip(['Country'] + SCENARIO_INPUT_FIELDS, values), label=label)
+            for label, values in POLICY_SCENARIOS
+        ]
+        summary = store.save_set(args.name, scenarios, description='Example policy scenarios')
+        print(f"✅ Saved '{args.name}': {summary['count']} scenarios ({summary['new_scenarios']} new)")
+    elif args.command == 'import':
+        name = args.name or os.path.splitext(os.path.basename(args.file))[0]
+        scenarios, description = read_scenario_file(args.file)
+        # Same validation and country names as POST /api/scenarios, so hashes match API-saved sets
+        validated, errors = validate_scenarios(scenarios)
+        if errors:
+            for error in errors[:20]:
+                print(f"   Scenario {error['index']}: {error['message']}")
+            raise SystemExit(f"❌ Import failed: {len(errors)} invalid scenario(s)")
+        resolver = load_country_resolver()
+        names, _ = resolver.encode([scenario['Country'] for scenario in validated])
+        for scenario, resolved in zip(validated, names):
+            if resolved is not None:
+                scenario['Country'] = resolved
+            else:
+                suggestions = resolver.suggest(scenario['Country'])
+                print(f"⚠️ Unknown country '{scenario['Country']}' (reported when the set is run)"
+                      + (f"; did you mean: {', '.join(suggestions)}?" if suggestions else ''))
+        summary = store.save_set(name, validated, description=description)
+        print(f"✅ Imported '{name}': {summary['count']} scenarios ({summary['new_scenarios']} new)")
+    elif args.command == 'export':
+        scenario_set = store.get_set(args.name)
+        if scenario_set is None:
+            raise SystemExit(f"❌ No scenario set named '{args.name}'")
+        write_scenario_file(scenario_set, args.file)
+        print(f"💾 Exported {len(scenario_set['scenarios'])} scenarios to: {args.file}")
+    elif args.command == 'delete':
+        if not store.delete_set(args.name):
+            raise SystemExit(f"❌ No scenario set named '{args.name}'")
+        print(f"✅ Deleted '{args.name}'")
+    elif args.command == 'prune':
+        keep = args.keep or artifacts_version(serving_artifacts(MODEL_BACKEND))
+        print(f"🧹 Pruned {store.prune_results(keep)} cached results (kept model version {keep})")
+
+
+if __name__ == '__main__':
+    main()
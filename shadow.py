@@ -0,0 +1,217 @@
+"""
+Candidate model evaluation for the GDP Scenario Simulator
+A/B routing and shadow comparison of a candidate model against the primary
+
+A configurable fraction of /simulate and /simulate/batch requests is served
+by the candidate (sticky per X-Client-Id when the header is sent). Requests
+served by the primary are mirrored to the candidate through a bounded
+queue and predicted on a background thread, so the primary response never
+waits for the candidate; when the queue is full the mirror is dropped and
+counted. The thread wakes every SHADOW_BATCH_INTERVAL seconds and predicts
+everything queued in one call, which keeps the candidate's share of CPU
+(and of the GIL) small. Disagreement and latency statistics cover the most
+recent SHADOW_WINDOW rows / calls; per-request candidate latency comes from
+A/B-routed requests, shadow latency is per micro-batch.
+"""
+
+import queue
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from config import (
+    SHADOW_QUEUE_SIZE,
+    SHADOW_WINDOW,
+    SHADOW_BATCH_INTERVAL,
+    SHADOW_MAX_BATCH_ROWS,
+    SHADOW_DISAGREEMENT_THRESHOLD
+)
+
+
+VARIANTS = ('primary', 'candidate')
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of the most recent values"""
+
+    def __init__(self, size):
+        self.values = np.empty(size)
+        self.count = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)[-len(self.values):]
+        positions = (self.count + np.arange(len(values))) % len(self.values)
+        self.values[positions] = values
+        self.count += len(values)
+
+    def recent(self):
+        return self.values[:min(self.count, len(self.values))]
+
+
+def _percentiles(values, quantiles=(50, 95, 99)):
+    if len(values) == 0:
+        return None
+    return {f'p{q}': round(float(v), 4) for q, v in zip(quantiles, np.percentile(values, quantiles))}
+
+
+class ShadowEvaluator:
+    """Routes requests between primary and candidate and compares them in the background"""
+
+    def __init__(self, candidate, traffic_fraction=0.0, shadow=True,
+                 queue_size=SHADOW_QUEUE_SIZE, window=SHADOW_WINDOW):
+        self.candidate = candidate
+        self.traffic_fraction = traffic_fraction
+        self.shadow = shadow
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+        self._lock = threading.Lock()
+        self._served = {variant: {'requests': 0, 'rows': 0, 'latency_ms': RollingWindow(window)}
+                        for variant in VARIANTS}
+        self._mirrored = 0
+        self._batches = 0
+        self._dropped = 0
+        self._errors = 0
+        self._rows = 0
+        self._disagreements = 0
+        self._sum_diff = 0.0
+        self._sum_sq_diff = 0.0
+        self._max_abs_diff = 0.0
+        self._abs_diff = RollingWindow(window)
+        self._shadow_latency = RollingWindow(window)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = None
+        if shadow:
+            self._worker = threading.Thread(target=self._run, name='shadow-evaluator', daemon=True)
+            self._worker.start()
+
+    def route(self, key=None):
+        """'primary' or 'candidate'; the same key always gets the same variant"""
+        if self.traffic_fraction <= 0:
+            return 'primary'
+        if key:
+            draw = zlib.crc32(key.encode()) / 2 ** 32
+        else:
+            draw = random.random()
+        return 'candidate' if draw < self.traffic_fraction else 'primary'
+
+    def record_served(self, variant, latency_ms, rows):
+        with self._lock:
+            served = self._served[variant]
+            served['requests'] += 1
+            served['rows'] += rows
+            served['latency_ms'].extend([latency_ms])
+
+    def mirror(self, X, primary_predictions):
+        """Queue a primary-served request for the candidate; never blocks"""
+        if not self.shadow:
+            return False
+        try:
+            self._queue.put_nowait((X, primary_predictions))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            time.sleep(SHADOW_BATCH_INTERVAL)
+            rows = len(items[0][0]) if items[0] is not None else 0
+            while rows < SHADOW_MAX_BATCH_ROWS and items[-1] is not None:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                rows += len(items[-1][0]) if items[-1] is not None else 0
+            try:
+                requests = [item for item in items if item is not None]
+                if requests:
+                    self._compare(requests)
+                if items[-1] is None:
+                    break
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _compare(self, requests):
+        """Predict queued requests in one candidate call and aggregate the differences"""
+        X = np.concatenate([np.asarray(X, dtype=np.float64) for X, _ in requests])
+        primary_predictions = np.concatenate([predictions for _, predictions in requests])
+        try:
+            start = time.perf_counter()
+            predictions = self.candidate.predict_batch(X)
+            latency_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            print(f"⚠️ Shadow prediction failed: {e}")
+            with self._lock:
+                self._errors += len(requests)
+            return
+
+        diff = np.asarray(predictions, dtype=np.float64) - primary_predictions
+        abs_diff = np.abs(diff)
+        with self._lock:
+            self._mirrored += len(requests)
+            self._batches += 1
+            self._rows += len(diff)
+            self._disagreements += int((abs_diff > SHADOW_DISAGREEMENT_THRESHOLD).sum())
+            self._sum_diff += float(diff.sum())
+            self._sum_sq_diff += float((diff ** 2).sum())
+            self._max_abs_diff = max(self._max_abs_diff, float(abs_diff.max()))
+            self._abs_diff.extend(abs_diff)
+            self._shadow_latency.extend([latency_ms])
+
+    def wait_idle(self, timeout=10.0):
+        """Block until every queued mirror has been processed (benchmarks, shutdown)"""
+        deadline = time.perf_counter() + timeout
+        while self._queue.unfinished_tasks and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def stats(self):
+        with self._lock:
+            rows = self._rows
+            shadow = {
+                'enabled': self.shadow,
+                'queued': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'mirrored_requests': self._mirrored,
+                'batches': self._batches,
+                'dropped_requests': self._dropped,
+                'errors': self._errors,
+                'rows_compared': rows,
+                'disagreement': {
+                    'threshold_pp': SHADOW_DISAGREEMENT_THRESHOLD,
+                    'rows_above_threshold': self._disagreements,
+                    'share_above_threshold': round(self._disagreements / rows, 4) if rows else None,
+                    'mean_diff': round(self._sum_diff / rows, 4) if rows else None,
+                    'rmse': round(float(np.sqrt(self._sum_sq_diff / rows)), 4) if rows else None,
+                    'max_abs_diff': round(self._max_abs_diff, 4),
+                    'recent_abs_diff': _percentiles(self._abs_diff.recent())
+                },
+                'batch_latency_ms': _percentiles(self._shadow_latency.recent()),
+                'rows_per_batch': round(rows / self._batches, 1) if self._batches else None
+            }
+            routing = {
+                variant: {
+                    'requests': served['requests'],
+                    'rows': served['rows'],
+                    'latency_ms': _percentiles(served['latency_ms'].recent())
+                }
+                for variant, served in self._served.items()
+            }
+        return {
+            'started_at': self.started_at,
+            'traffic_fraction': self.traffic_fraction,
+            'routing': routing,
+            'shadow': shadow
+        }
@@ -0,0 +1,169 @@
+"""
+Slim inference runtime for the GDP Scenario Simulator
+Serves the trained model from plain NumPy / JSON artifacts
+
+train_scenario_model.py exports the model, the encoder classes, the feature
+info and a per-country history snapshot to SLIM_DIR. With SLIM_RUNTIME=1,
+app_scenario.py loads them through this module and never imports pandas,
+scikit-learn or joblib.
+
+Supported backends: random_forest (all trees evaluated together, one
+vectorized step per tree level) and linear. Predictions match the
+scikit-learn estimators: features are compared in float32, as the
+scikit-learn trees do.
+"""
+
+import json
+
+import numpy as np
+
+from artifacts import artifact_path
+from config import (
+    SLIM_MODEL_PATH,
+    SLIM_ENCODER_PATH,
+    SLIM_FEATURE_INFO_PATH,
+    SLIM_MANIFEST_PATH
+)
+
+
+class NumpyForest:
+    """Random forest regressor as flat node arrays (trees concatenated)"""
+
+    name = 'random_forest'
+
+    def __init__(self, arrays, meta):
+        self.roots = arrays['roots']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.value = arrays['value']
+        self.max_depth = int(arrays['max_depth'])
+        self.meta = meta
+
+    @staticmethod
+    def export(backend):
+        """Node arrays of a fitted scikit-learn forest"""
+        trees = [estimator.tree_ for estimator in backend.model.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+        def shift(ids, offset):
+            # Global node ids; leaves keep -1
+            return np.where(ids >= 0, ids + offset, -1)
+
+        return {
+            'roots': offsets.astype(np.int64),
+            'left': np.concatenate([shift(t.children_left, o) for t, o in zip(trees, offsets)]),
+            'right': np.concatenate([shift(t.children_right, o) for t, o in zip(trees, offsets)]),
+            'feature': np.concatenate([t.feature for t in trees]).astype(np.int64),
+            'threshold': np.concatenate([t.threshold for t in trees]),
+            'value': np.concatenate([t.value[:, 0, 0] for t in trees]),
+            'max_depth': np.array(max(t.max_depth for t in trees))
+        }
+
+    def predict_batch(self, X):
+        """Predict GDP growth for a 2-D feature matrix"""
+        X = np.asarray(X, dtype=np.float64).astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            feature = self.feature[nodes]
+            is_split = feature >= 0
+            if not is_split.any():
+                break
+            go_left = X[rows, np.where(is_split, feature, 0)] <= self.threshold[nodes]
+            nodes = np.where(is_split, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+
+        # Sum trees in order, as scikit-learn does
+        values = self.value[nodes]
+        total = np.zeros(len(X))
+        for t in range(values.shape[1]):
+            total += values[:, t]
+        return total / values.shape[1]
+
+    def metadata(self):
+        return self.meta
+
+
+class NumpyLinear:
+    """Ridge regression over the six growth rates (country code unused)"""
+
+    name = 'linear'
+
+    def __init__(self, arrays, meta):
+        self.coef = arrays['coef']
+        self.intercept = float(arrays['intercept'])
+        self.meta = meta
+
+    @staticmethod
+    def export(backend):
+        return {'coef': backend.model.coef_, 'intercept': np.array(backend.model.intercept_)}
+
+    def predict_batch(self, X):
+        return np.asarray(X, dtype=np.float64)[:, 1:] @ self.coef + self.intercept
+
+    def metadata(self):
+        return self.meta
+
+
+SLIM_MODELS = {model.name: model for model in (NumpyForest, NumpyLinear)}
+
+
+def export_model(backend, path=None):
+    """Write a fitted backend as a NumPy archive (metadata stored as JSON)"""
+    if backend.name not in SLIM_MODELS:
+        raise ValueError(f"Slim runtime does not support the '{backend.name}' backend "
+                         f"(supported: {', '.join(SLIM_MODELS)})")
+    path = path or artifact_path(SLIM_MODEL_PATH, backend.name)
+    arrays = SLIM_MODELS[backend.name].export(backend)
+    np.savez(path, metadata=np.array(json.dumps(backend.metadata())), **arrays)
+    return path
+
+
+def load_model(name, path=None):
+    """Load an exported model"""
+    if name not in SLIM_MODELS:
+        raise ValueError(f"Slim runtime does not support the '{name}' backend")
+    with np.load(path or artifact_path(SLIM_MODEL_PATH, name)) as archive:
+        arrays = {key: archive[key] for key in archive.files if key != 'metadata'}
+        meta = json.loads(str(archive['metadata']))
+    return SLIM_MODELS[name](arrays, meta)
+
+
+class SlimEncoder:
+    """
+    LabelEncoder replacement: label -> code lookup table
+
+    classes_ need not be sorted (incremental retraining appends new countries).
+    """
+
+    def __init__(self, classes):
+        self.classes_ = np.array(classes, dtype=object)
+        self._codes = {label: code for code, label in enumerate(classes)}
+
+    def transform(self, values):
+        unknown = [value for value in values if value not in self._codes]
+        if unknown:
+            raise ValueError(f'y contains previously unseen labels: {unknown}')
+        return np.array([self._codes[value] for value in values], dtype=np.int64)
+
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_encoder(path=SLIM_ENCODER_PATH):
+    return SlimEncoder(_read_json(path)['classes'])
+
+
+def load_feature_info(path=SLIM_FEATURE_INFO_PATH):
+    return _read_json(path)
+
+
+def load_manifest(path=SLIM_MANIFEST_PATH):
+    """
+    Export manifest: per backend, the model version (artifacts_version of the
+    full-runtime artifacts) it was exported from
+    """
+    return _read_json(path)
@@ -3,10 +3,30 @@ Test script for GDP Economic Scenario Simulator
 Tests various policy scenarios
 """
 
+import os
+import time
+
+import numpy as np
 import requests
 import json
 
 BASE_URL = "http://localhost:5000"
+INPUT_FIELDS = [
+    "Population_Growth_Rate",
+    "Exports_Growth_Rate",
+    "Imports_Growth_Rate",
+    "Investment_Growth_Rate",
+    "Consumption_Growth_Rate",
+    "Govt_Spend_Growth_Rate"
+]
+HISTORY_INPUT_FIELDS = [
+    "Population_Growth",
+    "Exports_Growth",
+    "Imports_Growth",
+    "Investment_Growth",
+    "Consumption_Growth",
+    "Govt_Spend_Growth"
+]
 
 print("=" * 60)
 print("GDP ECONOMIC SCENARIO SIMULATOR - TEST SUITE")
@@ -178,6 +198,254 @@ if r.status_code == 400:
 else:
     print(f"❌ FAILED - Should return 400")
 
+# Test 11: Response Curves
+print("\n1️⃣1️⃣ Response Curves")
+print("-" * 60)
+r = requests.get(f"{BASE_URL}/api/response-curve",
+                 params={"country": "usa", "input": "Exports_Growth_Rate"})
+assert r.status_code == 200, r.text
+curves = r.json()
+curve = curves['curves']['Exports_Growth_Rate']
+assert curves['country'] == "United States", curves['country']
+assert curves['kind'] == "baseline"
+assert len(curve['x']) == len(curve['y']) > 1
+assert curve['x'] == sorted(curve['x'])
+assert curve['grid_range'] == [curve['x'][0], curve['x'][-1]]
+# Interpolating at grid points returns the grid values; outside the grid the ends are held
+mid = len(curve['x']) // 2
+r = requests.get(f"{BASE_URL}/api/response-curve", params={
+    "country": "United States", "input": "Exports_Growth_Rate",
+    "values": f"{curve['x'][mid]},{curve['x'][-1] + 100}"
+})
+interpolated = r.json()['curves']['Exports_Growth_Rate']
+assert abs(interpolated['y'][0] - curve['y'][mid]) < 1e-3, (interpolated['y'][0], curve['y'][mid])
+assert abs(interpolated['y'][1] - curve['y'][-1]) < 1e-3
+assert interpolated['clamped'] is True
+r = requests.get(f"{BASE_URL}/api/response-curve",
+                 params={"country": "United States", "input": "Exports_Growth_Rate", "kind": "ice"})
+ice = r.json()
+assert len(ice['curves']['Exports_Growth_Rate']['y']) == len(ice['ice_years']) > 0
+assert all(len(y) == len(curve['x']) for y in ice['curves']['Exports_Growth_Rate']['y'])
+for bad in ("nan", "1,inf", "-Infinity"):
+    r = requests.get(f"{BASE_URL}/api/response-curve",
+                     params={"country": "United States", "input": "Exports_Growth_Rate", "values": bad})
+    assert r.status_code == 400, (bad, r.status_code)
+print(f"Country 'usa' resolved to: {curves['country']}")
+print(f"Grid: {len(curve['x'])} points over {curve['grid_range']}, {len(ice['ice_years'])} ICE years")
+print(f"✅ PASSED")
+
+# Test 12: History Formats
+print("\n1️⃣2️⃣ History Formats (records / columnar)")
+print("-" * 60)
+params = {"country": ["India", "China"], "fields": "GDP_Growth,Exports_Growth", "year_from": 2000}
+r = requests.get(f"{BASE_URL}/api/history", params=params)
+assert r.status_code == 200, r.text
+records = r.json()
+r = requests.get(f"{BASE_URL}/api/history", params={**params, "format": "columnar"})
+assert r.status_code == 200, r.text
+columnar = r.json()
+assert columnar['fields'] == ["Year", "GDP_Growth", "Exports_Growth"]
+assert set(columnar['countries']) == {"India", "China"}
+assert len(records) == sum(len(series['Year']) for series in columnar['countries'].values())
+assert all(record['Year'] >= 2000 for record in records)
+for record in records:
+    series = columnar['countries'][record['Country']]
+    i = series['Year'].index(record['Year'])
+    assert record['GDP_Growth'] == series['GDP_Growth'][i]
+    assert record['Exports_Growth'] == series['Exports_Growth'][i]
+r = requests.get(f"{BASE_URL}/api/history", params={"country": "India", "format": "xml"})
+assert r.status_code == 400
+r = requests.get(f"{BASE_URL}/api/history", params={"country": "India", "format": "columnar", "points": 8})
+assert r.status_code == 200 and len(r.json()['countries']['India']['Year']) == 8, r.text
+r = requests.get(f"{BASE_URL}/api/history", params={"country": "India", "points": 2})
+assert r.status_code == 400
+print(f"Records: {len(records)} rows; columnar: "
+      + ", ".join(f"{c} {len(s['Year'])} years" for c, s in columnar['countries'].items()))
+print(f"✅ PASSED")
+
+# Test 13: Scenario Sets
+print("\n1️⃣3️⃣ Saved Scenario Sets")
+print("-" * 60)
+set_name = f"test-set-{int(time.time() * 1000)}"
+# Inputs unique to this run, so the first run cannot hit cached results
+offset = (time.time() % 1000) / 1000
+set_scenarios = [
+    {"label": "alias", "Country": "USA", **{field: 2.0 + offset for field in INPUT_FIELDS}},
+    {"label": "india", **{**investment_stimulus, "Exports_Growth_Rate": 6.0 + offset}}
+]
+r = requests.post(f"{BASE_URL}/api/scenarios", json={"name": set_name, "scenarios": set_scenarios})
+assert r.status_code == 201, r.text
+exported = requests.get(f"{BASE_URL}/api/scenarios/{set_name}").json()
+assert [s['Country'] for s in exported['scenarios']] == ["United States", "India"]
+assert [s['label'] for s in exported['scenarios']] == ["alias", "india"]
+first = requests.post(f"{BASE_URL}/api/scenarios/{set_name}/run").json()
+second = requests.post(f"{BASE_URL}/api/scenarios/{set_name}/run").json()
+assert (first['computed'], first['cached']) == (2, 0), first
+assert (second['computed'], second['cached']) == (0, 2), second
+assert ([x['predicted_gdp_growth'] for x in first['results']]
+        == [x['predicted_gdp_growth'] for x in second['results']])
+for scenario, result in zip(exported['scenarios'], second['results']):
+    r = requests.post(f"{BASE_URL}/simulate", json=scenario, headers={"X-Client-Id": "primary-check"})
+    if r.headers.get('X-Model-Variant', 'primary') == 'primary':
+        assert r.json()['predicted_gdp_growth'] == result['predicted_gdp_growth']
+r = requests.delete(f"{BASE_URL}/api/scenarios/{set_name}")
+assert r.status_code == 200
+assert requests.get(f"{BASE_URL}/api/scenarios/{set_name}").status_code == 404
+print(f"Set '{set_name}': first run computed {first['computed']}, second run cached {second['cached']}")
+print(f"Predictions: {[x['predicted_gdp_growth'] for x in second['results']]}")
+print(f"✅ PASSED")
+
+# Test 14: Background Jobs
+print("\n1️⃣4️⃣ Background Jobs (sweep)")
+print("-" * 60)
+sweep = {"type": "sweep", "params": {
+    "Country": "India",
+    "axes": [{"field": "Exports_Growth_Rate", "min": -10, "max": 10, "steps": 5}]
+}}
+r = requests.post(f"{BASE_URL}/jobs", json=sweep)
+assert r.status_code == 202, r.text
+job = r.json()['job']
+assert job['params']['Country'] == "India"
+assert set(job['params']['base']) == set(INPUT_FIELDS)
+resubmitted = requests.post(f"{BASE_URL}/jobs", json=sweep).json()
+assert resubmitted['deduplicated'] is True and resubmitted['job']['id'] == job['id']
+deadline = time.time() + 120
+while job['status'] not in ('done', 'failed', 'cancelled') and time.time() < deadline:
+    time.sleep(0.5)
+    job = requests.get(f"{BASE_URL}/jobs/{job['id']}").json()
+assert job['status'] == 'done', job
+result = requests.get(f"{BASE_URL}/jobs/{job['id']}/result").json()['result']
+assert result['country'] == "India" and result['shape'] == [5] and result['points'] == 5
+for point in (result['min'], result['max']):
+    scenario = {"Country": "India", **job['params']['base'], **point['inputs']}
+    r = requests.post(f"{BASE_URL}/simulate", json=scenario, headers={"X-Client-Id": "primary-check"})
+    if r.headers.get('X-Model-Variant', 'primary') == 'primary':
+        # Sweep grids are stored as float32
+        assert abs(r.json()['predicted_gdp_growth'] - point['predicted_gdp_growth']) <= 0.011
+print(f"Job {job['id']}: {result['points']} points, mean {result['mean']}%")
+print(f"Min: {result['min']['predicted_gdp_growth']}% at exports {result['min']['inputs']['Exports_Growth_Rate']}%")
+print(f"Max: {result['max']['predicted_gdp_growth']}% at exports {result['max']['inputs']['Exports_Growth_Rate']}%")
+print(f"✅ PASSED")
+
+# Test 15: Historical Analogs
+print("\n1️⃣5️⃣ Historical Analogs")
+print("-" * 60)
+history = requests.get(f"{BASE_URL}/api/history", params={
+    "country": "India", "fields": ",".join(["GDP_Growth"] + HISTORY_INPUT_FIELDS), "format": "columnar"
+}).json()['countries']['India']
+year_index = next(i for i in range(len(history['Year']))
+                  if all(history[field][i] is not None for field in ["GDP_Growth"] + HISTORY_INPUT_FIELDS))
+query = {field: history[alias][year_index] for field, alias in zip(INPUT_FIELDS, HISTORY_INPUT_FIELDS)}
+r = requests.get(f"{BASE_URL}/api/analogs", params={**query, "k": 3, "country": "India"})
+assert r.status_code == 200, r.text
+analogs = r.json()
+nearest = analogs['analogs'][0]
+# A country-year's own growth rates find that country-year at distance zero
+assert (nearest['country'], nearest['year']) == ("India", history['Year'][year_index]), nearest
+assert nearest['distance'] < 1e-3
+assert abs(nearest['actual_gdp_growth'] - history['GDP_Growth'][year_index]) < 0.01
+assert len(analogs['analogs']) == 3 and all(a['country'] == "India" for a in analogs['analogs'])
+assert [a['distance'] for a in analogs['analogs']] == sorted(a['distance'] for a in analogs['analogs'])
+assert analogs['extrapolation'] is False
+# Country names containing commas are a single country
+r = requests.get(f"{BASE_URL}/api/analogs", params={**query, "k": 2, "country": "China, Hong Kong SAR"})
+if r.status_code == 200:
+    assert r.json()['countries'] == ["China, Hong Kong SAR"]
+    assert all(a['country'] == "China, Hong Kong SAR" for a in r.json()['analogs'])
+r = requests.post(f"{BASE_URL}/api/analogs", json={"scenarios": [query] * 2, "k": 1})
+assert r.json()['count'] == 2 and r.json()['results'][0]['analogs'][0]['distance'] < 1e-3
+r = requests.post(f"{BASE_URL}/api/analogs", json={"scenarios": [query], "k": 1, "countries": []})
+assert r.status_code == 200 and r.json()['results'][0]['analogs'][0]['distance'] < 1e-3, r.text
+r = requests.post(f"{BASE_URL}/api/analogs", json=[1])
+assert r.status_code == 400
+r = requests.post(f"{BASE_URL}/api/analogs", json={"scenarios": [{**query, "Exports_Growth_Rate": 1e308}]})
+assert r.status_code == 400 and 'outside reasonable range' in r.json()['errors'][0]['message']
+print(f"India {nearest['year']}: nearest analog {nearest['country']} {nearest['year']} "
+      f"(distance {nearest['distance']}, actual GDP growth {nearest['actual_gdp_growth']}%)")
+print(f"✅ PASSED")
+
+# Test 16: Slim Runtime Parity
+print("\n1️⃣6️⃣ Slim Runtime Parity")
+print("-" * 60)
+info = requests.get(f"{BASE_URL}/").json()
+backend = info['model']['backend']
+try:
+    import slim_runtime
+    from artifacts import artifact_path
+    from config import SLIM_MODEL_PATH
+    slim_available = os.path.exists(artifact_path(SLIM_MODEL_PATH, backend))
+except ImportError:
+    slim_available = False
+if not slim_available:
+    print(f"⚠️ SKIPPED - no slim export for {backend} (python train_scenario_model.py --export-slim)")
+else:
+    manifest = slim_runtime.load_manifest()['models'][backend]
+    assert manifest['model_version'] == info['model_version'], \
+        f"Slim export is stale: {manifest['model_version']} != {info['model_version']}"
+    slim_model = slim_runtime.load_model(backend)
+    slim_encoder = slim_runtime.load_encoder()
+    rng = np.random.default_rng(0)
+    countries = ["United States", "China", "India", "Greece"]
+    scenarios = [{"Country": countries[i % len(countries)],
+                  **{field: round(float(rng.uniform(-10, 10)), 3) for field in INPUT_FIELDS}}
+                 for i in range(200)]
+    X = np.array([[slim_encoder.transform([s['Country']])[0]] + [s[field] for field in INPUT_FIELDS]
+                  for s in scenarios], dtype=np.float64)
+    expected = [round(float(p), 2) for p in slim_model.predict_batch(X)]
+    r = requests.post(f"{BASE_URL}/simulate/batch", json={"scenarios": scenarios},
+                      headers={"X-Client-Id": "primary-check"})
+    if r.headers.get('X-Model-Variant', 'primary') != 'primary':
+        print("⚠️ SKIPPED - this client is routed to the candidate")
+    else:
+        served = [result['predicted_gdp_growth'] for result in r.json()['results']]
+        assert served == expected, f"{sum(a != b for a, b in zip(served, expected))} predictions differ"
+        print(f"{len(served)} server predictions match the slim export of {backend} ({manifest['model_version']})")
+        print(f"✅ PASSED")
+
+# Test 17: Candidate Model A/B Routing
+print("\n1️⃣7️⃣ Candidate Model A/B Routing")
+print("-" * 60)
+r = requests.get(f"{BASE_URL}/api/candidate")
+if r.status_code == 404:
+    print("⚠️ SKIPPED - start the server with CANDIDATE_BACKEND set to test routing")
+else:
+    before = r.json()
+    variants = {}
+    for client in range(20):
+        headers = {"X-Client-Id": f"client-{client}"}
+        responses = [requests.post(f"{BASE_URL}/simulate", json=baseline, headers=headers) for _ in range(2)]
+        served = [response.headers['X-Model-Variant'] for response in responses]
+        # A client always gets the same variant, and so the same prediction
+        assert served[0] == served[1], served
+        assert responses[0].json()['predicted_gdp_growth'] == responses[1].json()['predicted_gdp_growth']
+        intervals = responses[0].json().get('prediction_intervals')
+        if served[0] == 'candidate' and intervals is None:
+            assert responses[0].json()['intervals_note']
+        variants[served[0]] = variants.get(served[0], 0) + 1
+    after = requests.get(f"{BASE_URL}/api/candidate").json()
+    assert after['primary']['backend'] and after['candidate']['backend']
+    print(f"Candidate: {after['candidate']['backend']} ({after['candidate']['model_version']})")
+    print(f"Variants over 20 clients: {variants}")
+    print(f"✅ PASSED")
+
+# Test 18: Country Names and Suggestions
+print("\n1️⃣8️⃣ Country Names and Suggestions")
+print("-" * 60)
+r = requests.get(f"{BASE_URL}/api/baseline", params={"country": "Indai"})
+assert r.status_code == 404
+assert "India" in r.json()['suggestions'], r.json()
+r = requests.post(f"{BASE_URL}/simulate", json={**trade_war, "Country": "Untied States"})
+assert r.status_code == 400
+assert "United States" in r.json()['suggestions'], r.json()
+canonical = requests.post(f"{BASE_URL}/simulate", json=trade_war, headers={"X-Client-Id": "resolver"})
+aliased = requests.post(f"{BASE_URL}/simulate", json={**trade_war, "Country": "usa"},
+                        headers={"X-Client-Id": "resolver"})
+assert aliased.json()['predicted_gdp_growth'] == canonical.json()['predicted_gdp_growth']
+assert aliased.json()['scenario']['country'] == "United States"
+print(f"'Indai' suggests: {requests.get(f'{BASE_URL}/api/baseline', params={'country': 'Indai'}).json()['suggestions']}")
+print(f"'usa' and 'United States' both predict {canonical.json()['predicted_gdp_growth']}%")
+print(f"✅ PASSED")
+
 print("\n" + "=" * 60)
 print("ALL TESTS COMPLETED SUCCESSFULLY!")
 print("=" * 60)
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the unit tests (no server or trained artifacts needed)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# Dataset columns of final_data_with_year.csv
+INPUT_COLUMNS = [
+    'Population_Growth_Rate',
+    'Exports of goods and services_Growth_Rate',
+    'Imports of goods and services_Growth_Rate',
+    'Gross capital formation_Growth_Rate',
+    'Final consumption expenditure_Growth_Rate',
+    'Government_Expenditure_Growth_Rate'
+]
+COLUMNS = ['Country', 'Year'] + INPUT_COLUMNS + ['GDP_Growth_Rate']
+
+COUNTRIES = ['Brazil', 'China', 'India', 'United States']
+
+# GDP growth of the synthetic data: weighted inputs plus a per-country offset and noise
+WEIGHTS = np.array([0.5, 0.2, -0.15, 0.25, 0.4, 0.1])
+
+
+def _make_dataset(countries=COUNTRIES, years=range(1990, 2020), seed=0):
+    """Synthetic country-years with the dataset columns"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for offset, country in enumerate(countries):
+        for year in years:
+            inputs = rng.normal(3.0, 4.0, len(INPUT_COLUMNS))
+            rows.append([country, year, *inputs, inputs @ WEIGHTS + offset + rng.normal(0, 0.5)])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+@pytest.fixture
+def make_dataset():
+    return _make_dataset
+
+
+@pytest.fixture
+def dataset():
+    return _make_dataset()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory: artifact and data paths in config.py are relative"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from analogs import INPUT_COLUMNS, AnalogIndex
+from history_store import HistoryStore
+
+
+@pytest.fixture
+def store(make_dataset):
+    df = make_dataset(countries=['Brazil', 'China', 'India', 'Kenya', 'United States'])
+    df.loc[5, 'GDP_Growth_Rate'] = np.nan  # rows with missing values are skipped
+    return HistoryStore.from_frame(df)
+
+
+def brute_force(index, inputs, k, rows=None):
+    rows = np.arange(len(index)) if rows is None else rows
+    distances = np.sqrt(((index.points[rows] - index.standardize(inputs)[:, None]) ** 2).sum(axis=2))
+    order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+    return np.take_along_axis(distances, order, axis=1), rows[order]
+
+
+def test_skips_incomplete_rows(store):
+    index = AnalogIndex.from_store(store)
+    assert len(index) == len(store) - 1
+    start, stop = index.country_slices['Brazil']
+    assert stop - start == 29
+    assert (index.countries[start:stop] == 'Brazil').all()
+
+
+@pytest.mark.parametrize('use_tree', [True, False])
+def test_nearest_matches_brute_force(store, use_tree):
+    index = AnalogIndex.from_store(store, use_tree=use_tree)
+    inputs = np.random.default_rng(3).normal(3, 4, (25, 6))
+    distances, rows = index.query(inputs, k=4)
+    expected_distances, expected_rows = brute_force(index, inputs, 4)
+    np.testing.assert_allclose(distances, expected_distances)
+    np.testing.assert_array_equal(rows, expected_rows)
+
+
+def test_country_filter(store):
+    index = AnalogIndex.from_store(store)
+    inputs = np.random.default_rng(4).normal(3, 4, (5, 6))
+    distances, rows = index.query(inputs, k=3, countries=['India', 'Kenya'])
+    assert set(index.countries[rows.ravel()]) <= {'India', 'Kenya'}
+    allowed = np.concatenate([np.arange(*index.country_slices[c]) for c in ('India', 'Kenya')])
+    np.testing.assert_allclose(distances, brute_force(index, inputs, 3, allowed)[0])
+
+
+def test_historical_year_finds_itself(store):
+    index = AnalogIndex.from_store(store)
+    distances, rows = index.query(index.inputs[[10]], k=1)
+    assert rows[0, 0] == 10 and distances[0, 0] == pytest.approx(0, abs=1e-12)
+    record = index.record(10, distances[0, 0])
+    assert record['year'] == int(index.years[10])
+    assert list(record['inputs']) == list(INPUT_COLUMNS)
+
+
+def test_slim_index_matches(store):
+    full = AnalogIndex.from_store(store)
+    slim = AnalogIndex.from_store(store, use_tree=False, reference_distances=full.reference_distances)
+    inputs = np.random.default_rng(5).normal(3, 4, (10, 6))
+    np.testing.assert_allclose(slim.query(inputs, 5)[0], full.query(inputs, 5)[0])
+    assert slim.extrapolation_distance == full.extrapolation_distance
+
+
+def test_distance_percentile(store):
+    index = AnalogIndex.from_store(store)
+    assert index.distance_percentile(np.array([0.0]))[0] == 0.0
+    assert index.distance_percentile(np.array([1e9]))[0] == 1.0
+    far = index.query(np.full((1, 6), 60.0), k=1)[0][0, 0]
+    assert far > index.extrapolation_distance
@@ -0,0 +1,71 @@
+import pytest
+
+from benchmark_suite import compare, environment_differences, measure, pool_runs, summarize
+
+
+def stats(median, n_jobs=None):
+    result = {'median_ms': median}
+    if n_jobs is not None:
+        result['n_jobs'] = n_jobs
+    return result
+
+
+BASELINE = {
+    'environment': {'cpu_count': 4},
+    'results': {'a': stats(10.0), 'b': stats(10.0), 'c': stats(10.0), 'fit': stats(100.0, 8)}
+}
+
+
+def test_compare_statuses():
+    results = {'a': stats(12.0), 'b': stats(13.0), 'c': stats(7.0), 'd': stats(1.0)}
+    comparison = compare(results, BASELINE, threshold=0.25)
+    assert comparison['a'] == {'baseline_median_ms': 10.0, 'change': 0.2, 'status': 'ok'}
+    assert comparison['b']['status'] == 'regression'
+    assert comparison['c']['status'] == 'improvement'
+    assert comparison['d']['status'] == 'new'
+    assert compare(results, None, threshold=0.25)['a']['status'] == 'new'
+
+
+def test_oversubscribed_fits_skipped():
+    results = {'fit': stats(500.0, n_jobs=8), 'fit2': stats(10.0, n_jobs=2)}
+    # More n_jobs than the baseline machine's CPUs
+    assert compare(results, BASELINE, threshold=0.25)['fit']['status'] == 'skipped'
+    # ... or than this machine's
+    baseline = {'environment': {'cpu_count': 16}, 'results': {**BASELINE['results'], 'fit2': stats(10.0, 2)}}
+    comparison = compare(results, baseline, threshold=0.25, cpu_count=1)
+    assert comparison['fit']['status'] == 'skipped' and comparison['fit2']['status'] == 'skipped'
+    assert compare(results, baseline, threshold=0.25, cpu_count=8)['fit']['status'] == 'regression'
+
+
+def test_summarize():
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 100.0], number=8, rows=1000)
+    assert summary['median_ms'] == 3.0
+    assert summary['min_ms'] == 1.0
+    assert summary['iqr_ms'] == 2.0
+    assert summary['samples'] == 5 and summary['calls_per_sample'] == 8
+    assert summary['rows_per_s'] == pytest.approx(1000 / 3.0 * 1000, rel=1e-6)
+    assert summarize([2.0], number=1)['stdev_ms'] == 0.0
+
+
+def test_pool_runs_uses_median_of_all_samples():
+    first = [10.0, 11.0, 30.0]
+    stats = {**summarize(first, number=4, rows=100), 'n_jobs': 2}
+    samples, pooled = pool_runs(stats, first, [12.0, 13.0, 14.0])
+    assert samples == [10.0, 11.0, 30.0, 12.0, 13.0, 14.0]
+    # Neither run's own median (11.0, 13.0)
+    assert pooled['median_ms'] == 12.5 and pooled['samples'] == 6
+    assert pooled['n_jobs'] == 2 and pooled['rows'] == 100 and pooled['calls_per_sample'] == 4
+
+
+def test_measure_calibrates_calls_per_sample():
+    calls = []
+    samples, number = measure(lambda: calls.append(1), repeats=4, warmup=1, min_sample_ms=1.0)
+    assert len(samples) == 4
+    assert number > 1 and (number & (number - 1)) == 0
+    assert all(sample >= 0 for sample in samples)
+
+
+def test_environment_differences():
+    current = {'python': '3.11.7', 'cpu_count': 8, 'numpy': '1.26.0'}
+    recorded = {'python': '3.11.7', 'cpu_count': 4, 'numpy': '1.26.0'}
+    assert environment_differences(current, recorded) == ['cpu_count 4 → 8']
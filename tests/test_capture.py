@@ -0,0 +1,67 @@
+import glob
+import json
+import os
+
+from capture import RequestCapture, read_captures
+
+
+def record(capture, i, body=None):
+    capture.record('POST', '/simulate', '/simulate', '', body or {'b': i, 'a': [1, 2]},
+                   f'client-{i % 3}', 200, 1.5)
+
+
+def test_entries_written_normalized(tmp_path):
+    capture = RequestCapture(1.0, directory=str(tmp_path))
+    try:
+        for i in range(5):
+            record(capture, i)
+        capture.wait_idle()
+    finally:
+        capture.close()
+
+    files = glob.glob(str(tmp_path / 'capture-*.ndjson'))
+    assert len(files) == 1
+    with open(files[0]) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 5
+    # Keys sorted, compact separators, body included
+    assert lines[0].startswith('{"body":{"a":[1,2],"b":0},"client":"client-0",')
+    assert json.loads(lines[3])['body']['b'] == 3
+    assert capture.stats()['captured'] == 5
+
+
+def test_rotation_keeps_newest_files(tmp_path):
+    capture = RequestCapture(1.0, directory=str(tmp_path), max_bytes=600, max_files=3)
+    try:
+        for i in range(40):
+            record(capture, i)
+        capture.wait_idle()
+    finally:
+        capture.close()
+
+    files = sorted(glob.glob(str(tmp_path / 'capture-*.ndjson')))
+    assert len(files) == 3
+    assert all(os.path.getsize(path) <= 600 for path in files)
+    # The newest entries survive, in order
+    entries = read_captures([str(tmp_path)])
+    bodies = [entry['body']['b'] for entry in entries]
+    assert bodies == sorted(bodies) and bodies[-1] == 39
+
+
+def test_read_captures_orders_by_timestamp(tmp_path):
+    for name, timestamps in (('capture-a.ndjson', [3.0, 1.0]), ('capture-b.ndjson', [2.0])):
+        with open(tmp_path / name, 'w') as f:
+            for ts in timestamps:
+                f.write(json.dumps({'ts': ts}) + '\n\n')
+    assert [entry['ts'] for entry in read_captures([str(tmp_path)])] == [1.0, 2.0, 3.0]
+    assert [entry['ts'] for entry in read_captures([str(tmp_path / 'capture-b.ndjson')])] == [2.0]
+
+
+def test_sampling_rate(tmp_path):
+    capture = RequestCapture(0.0, directory=str(tmp_path))
+    try:
+        assert not any(capture.sampled() for _ in range(100))
+        capture.sample_rate = 1.0
+        assert all(capture.sampled() for _ in range(100))
+    finally:
+        capture.close()
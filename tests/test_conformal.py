@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from conformal import STRATA, ConformalTable, conformal_quantiles, fit_conformal_table
+
+
+LEVELS = [0.8, 0.9]
+
+
+def test_finite_sample_quantile():
+    residuals = np.arange(1, 20, dtype=np.float64)  # n = 19
+    # ceil(20 * 0.8) = 16th, ceil(20 * 0.9) = 18th smallest
+    np.testing.assert_array_equal(conformal_quantiles(residuals, LEVELS), [16, 18])
+    # Rank above n is capped at the largest residual
+    np.testing.assert_array_equal(conformal_quantiles(residuals[:5], [0.95]), [5])
+
+
+def calibration_set(seed=0):
+    """Country 0: many rows, noise growing with input magnitude; country 1: few rows; country 2: none"""
+    rng = np.random.default_rng(seed)
+    codes = np.r_[np.zeros(2000, dtype=int), np.ones(30, dtype=int)]
+    inputs = rng.normal(0, 5, (len(codes), 6))
+    scale = 0.5 + np.abs(inputs).mean(axis=1)
+    residuals = np.abs(rng.normal(0, scale))
+    return residuals, codes, inputs
+
+
+def test_fallback_strata():
+    residuals, codes, inputs = calibration_set()
+    table = fit_conformal_table(residuals, codes, inputs, n_countries=3, levels=LEVELS,
+                                n_bins=4, min_samples=100)
+    stratum = [[STRATA[s] for s in row] for row in table['stratum']]
+    assert stratum[0] == ['country_bin'] * 4
+    # 30 rows: too few per country, so the magnitude bin's quantile is used
+    assert stratum[1] == ['bin'] * 4
+    assert stratum[2] == ['bin'] * 4
+    np.testing.assert_array_equal(table['quantiles'][1], table['quantiles'][2])
+
+    table = fit_conformal_table(residuals, codes, inputs, n_countries=3, levels=LEVELS,
+                                n_bins=4, min_samples=1000)
+    assert [STRATA[s] for s in table['stratum'][0]] == ['country'] * 4
+    assert [STRATA[s] for s in table['stratum'][1]] == ['global'] * 4
+    np.testing.assert_allclose(table['quantiles'][1, 0], table['global_quantiles'])
+
+
+def test_wider_intervals_for_larger_inputs():
+    residuals, codes, inputs = calibration_set()
+    table = fit_conformal_table(residuals, codes, inputs, n_countries=3, levels=LEVELS,
+                                n_bins=4, min_samples=100)
+    widths = table['quantiles'][0, :, 0]
+    assert (np.diff(widths) > 0).all()
+
+
+def test_coverage_on_fresh_data(tmp_path):
+    residuals, codes, inputs = calibration_set(seed=0)
+    path = tmp_path / 'table.npz'
+    np.savez(path, **fit_conformal_table(residuals, codes, inputs, n_countries=3, levels=LEVELS,
+                                         n_bins=4, min_samples=100))
+    table = ConformalTable.load(path)
+
+    residuals, codes, inputs = calibration_set(seed=1)
+    covered = residuals[:, None] <= table.half_widths(codes, inputs)
+    assert covered[:2000].mean(axis=0) == pytest.approx(LEVELS, abs=0.03)
+
+
+def test_intervals_and_unknown_countries():
+    residuals, codes, inputs = calibration_set()
+    table = ConformalTable(fit_conformal_table(residuals, codes, inputs, n_countries=3, levels=LEVELS,
+                                               n_bins=4, min_samples=100))
+    rows = inputs[:2]
+    widths = table.half_widths([0, 7], rows)
+    # Code 7 was added after calibration: global quantiles
+    np.testing.assert_allclose(widths[1], table.global_quantiles)
+
+    intervals = table.intervals([0, 7], rows, [1.0, 2.0])
+    assert [interval['level'] for interval in intervals[0]] == LEVELS
+    for row, prediction, width in zip(intervals, [1.0, 2.0], widths):
+        for interval, w in zip(row, width):
+            assert interval['lower'] == pytest.approx(prediction - w, abs=0.005)
+            assert interval['upper'] == pytest.approx(prediction + w, abs=0.005)
@@ -0,0 +1,77 @@
+import pytest
+
+from country_resolver import CountryResolver, normalize_name
+
+
+MODEL_COUNTRIES = ['Brazil', 'China, Hong Kong SAR', "Côte d'Ivoire", 'Curaçao', 'India',
+                   'Republic of Korea', 'Saint Lucia', 'Türkiye', 'United States']
+HISTORY_ONLY = ['Former USSR']
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return CountryResolver(MODEL_COUNTRIES, HISTORY_ONLY)
+
+
+@pytest.mark.parametrize('name, key', [
+    ('  The Bahamas ', 'bahamas'),
+    ("Côte d’Ivoire", 'cote divoire'),
+    ("CÃ´te d'Ivoire", 'cote divoire'),
+    ('St. Lucia', 'st lucia'),
+    ('Saint Lucia', 'st lucia'),
+    ('Trinidad & Tobago', 'trinidad and tobago'),
+])
+def test_normalize_name(name, key):
+    assert normalize_name(name) == key
+
+
+@pytest.mark.parametrize('name, country', [
+    ('india', 'India'),
+    ('INDIA', 'India'),
+    ('USA', 'United States'),
+    ('us', 'United States'),
+    ('United States of America', 'United States'),
+    ('South Korea', 'Republic of Korea'),
+    ('KOR', 'Republic of Korea'),
+    ('Turkey', 'Türkiye'),
+    ('Turkiye', 'Türkiye'),
+    ('Cote dIvoire', "Côte d'Ivoire"),
+    ('CuraÃ§ao', 'Curaçao'),
+    ('Hong Kong', 'China, Hong Kong SAR'),
+    ('China, Hong Kong SAR', 'China, Hong Kong SAR'),
+    ('St Lucia', 'Saint Lucia'),
+])
+def test_resolve_exact(resolver, name, country):
+    assert resolver.resolve(name) == country
+
+
+def test_unknown_and_unmodelled_countries(resolver):
+    assert resolver.resolve('Atlantis') is None
+    # Aliases of countries missing from the dataset resolve to nothing
+    assert resolver.resolve('France') is None and resolver.resolve('FRA') is None
+    names, codes = resolver.encode(['usa', 'Former USSR', 'Atlantis', 'India', 'usa'])
+    assert names == ['United States', 'Former USSR', None, 'India', 'United States']
+    assert codes.tolist() == [8, -1, -1, 4, 8]
+
+
+def test_dataset_names_take_precedence():
+    # 'Congo' is a dataset name and must not be shadowed by aliases of D.R. of the Congo
+    resolver = CountryResolver(['Congo', 'D.R. of the Congo'])
+    assert resolver.resolve('Congo') == 'Congo'
+    assert resolver.resolve('DR Congo') == 'D.R. of the Congo'
+
+
+@pytest.mark.parametrize('typo, country', [
+    ('Indai', 'India'),
+    ('Untied States', 'United States'),
+    ('Brasil', 'Brazil'),
+    ('Sotuh Korea', 'Republic of Korea'),
+])
+def test_suggestions(resolver, typo, country):
+    assert resolver.resolve(typo) is None
+    assert resolver.suggest(typo)[0] == country
+
+
+def test_no_suggestions_for_unrelated_input(resolver):
+    assert resolver.suggest('Qwertyuiop') == []
+    assert len(resolver.suggest('a', limit=2)) <= 2
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from history_store import DATA_COLUMNS, HistoryStore, lttb_indices
+
+
+@pytest.fixture
+def store(dataset):
+    # Shuffled rows: the store sorts by (Country, Year) itself
+    return HistoryStore.from_frame(dataset.sample(frac=1, random_state=1))
+
+
+def test_country_slices_sorted(store, dataset):
+    assert store.countries == sorted(dataset['Country'].unique())
+    assert len(store) == len(dataset)
+    assert 'India' in store and 'Atlantis' not in store
+    assert store.year_range == (1990, 2019)
+    for country in store.countries:
+        start, stop = store.country_rows(country)
+        years = store.column('Year', start, stop)
+        assert stop - start == 30
+        assert (np.diff(years) == 1).all()
+
+
+def test_year_range_query(store, dataset):
+    start, stop = store.country_rows('Brazil', 2000, 2004)
+    assert store.column('Year', start, stop).tolist() == [2000, 2001, 2002, 2003, 2004]
+    start, stop = store.country_rows('Brazil', 2030)
+    assert start == stop
+
+
+def test_query_fields_and_aliases(store, dataset):
+    result = store.query(['India', 'China'], ['GDP_Growth', 'Exports of goods and services_Growth_Rate'],
+                         year_from=2015)
+    assert list(result) == ['India', 'China']
+    india = dataset[(dataset['Country'] == 'India') & (dataset['Year'] >= 2015)]
+    assert result['India']['Year'].tolist() == india['Year'].tolist()
+    np.testing.assert_array_equal(result['India']['GDP_Growth'], india['GDP_Growth_Rate'])
+    np.testing.assert_array_equal(result['India']['Exports of goods and services_Growth_Rate'],
+                                  india['Exports of goods and services_Growth_Rate'])
+
+
+def test_resolve_field():
+    assert HistoryStore.resolve_field('Investment_Growth') == 'Gross capital formation_Growth_Rate'
+    assert HistoryStore.resolve_field('GDP_Growth_Rate') == 'GDP_Growth_Rate'
+    assert HistoryStore.resolve_field('Inflation') is None
+
+
+def test_baseline_is_country_mean(store, dataset):
+    means = dataset[dataset['Country'] == 'China'][DATA_COLUMNS[1:]].mean()
+    baseline = store.baseline('China')
+    for column in DATA_COLUMNS[1:]:
+        assert baseline[column] == pytest.approx(means[column])
+
+
+def test_lttb_keeps_endpoints_and_count():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    indices = lttb_indices(x, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(500)
+    y = np.zeros(500)
+    y[123] = 10.0
+    y[377] = -10.0
+    indices = lttb_indices(x, y, 20)
+    assert 123 in indices and 377 in indices
+
+
+def test_lttb_short_series_unchanged():
+    x = np.arange(10)
+    assert lttb_indices(x, x * 2.0, 10).tolist() == list(range(10))
+    assert lttb_indices(x, x * 2.0, 50).tolist() == list(range(10))
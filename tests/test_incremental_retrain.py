@@ -0,0 +1,105 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+import train_scenario_model
+from config import DATASET_PATH, FEATURE_CACHE_PATH, SCENARIO_ENCODER_PATH
+from model_backends import RandomForestBackend
+from train_scenario_model import extend_encoder, incremental_retrain
+
+
+def test_extend_encoder_keeps_existing_codes():
+    encoder = LabelEncoder().fit(['Chile', 'Brazil', 'India'])
+    codes = encoder.transform(['Brazil', 'Chile', 'India']).tolist()
+    assert extend_encoder(encoder, ['Zambia', 'India', 'Angola', 'Zambia']) == ['Angola', 'Zambia']
+    assert encoder.transform(['Brazil', 'Chile', 'India']).tolist() == codes
+    assert encoder.transform(['Angola', 'Zambia']).tolist() == [3, 4]
+    assert extend_encoder(encoder, ['Brazil']) == []
+
+
+@pytest.fixture
+def trained(workdir, make_dataset):
+    """Full training run on 1990-2014, then 2015-2019 and a new country appear in the dataset"""
+    df = make_dataset()
+    df[df['Year'] < 2015].to_csv(DATASET_PATH, index=False)
+    train_scenario_model.main('random_forest')
+    extra = make_dataset(countries=['Chile'], seed=1)
+    pd.concat([df, extra]).to_csv(DATASET_PATH, index=False)
+    return df
+
+
+def load_cache():
+    with np.load(FEATURE_CACHE_PATH) as cache:
+        return {key: cache[key] for key in cache.files}
+
+
+def test_new_rows_appended_to_cache(trained):
+    before = load_cache()
+    codes = joblib.load(SCENARIO_ENCODER_PATH).transform(['Brazil', 'United States']).tolist()
+
+    incremental_retrain(add_trees=5, compare_full=False)
+
+    encoder = joblib.load(SCENARIO_ENCODER_PATH)
+    assert encoder.transform(['Brazil', 'United States']).tolist() == codes
+    assert encoder.classes_[-1] == 'Chile'
+
+    cache = load_cache()
+    old = len(before['y'])
+    assert len(cache['y']) == old + 4 * 5 + 30
+    for key in before:
+        np.testing.assert_array_equal(cache[key][:old], before[key])
+    assert not cache['is_calib'][old:].any()
+
+    df = pd.read_csv(DATASET_PATH)
+    rows = pd.DataFrame({'Country': cache['country'][old:], 'Year': cache['year'][old:]})
+    rows['GDP_Growth_Rate'] = cache['y'][old:]
+    merged = rows.merge(df, on=['Country', 'Year'], suffixes=('', '_csv'))
+    assert len(merged) == len(rows)
+    assert ((merged['Year'] >= 2015) | (merged['Country'] == 'Chile')).all()
+    np.testing.assert_array_equal(merged['GDP_Growth_Rate'], merged['GDP_Growth_Rate_csv'])
+
+
+def test_warm_start_grows_forest(trained):
+    incremental_retrain(add_trees=5, compare_full=False)
+    assert len(RandomForestBackend.load().model.estimators_) == 105
+
+
+def test_replace_oldest_trees(trained):
+    trees = RandomForestBackend.load().model.estimators_
+    incremental_retrain(add_trees=0, replace_trees=10, replace_strategy='oldest', compare_full=False)
+    model = RandomForestBackend.load().model
+    assert len(model.estimators_) == 100
+    # The kept trees are the newest 90 of the original forest, in order
+    for kept, original in zip(model.estimators_[:90], trees[10:]):
+        np.testing.assert_array_equal(kept.tree_.threshold, original.tree_.threshold)
+
+
+def test_updated_rows_replaced_in_cache(trained):
+    df = pd.read_csv(DATASET_PATH)
+    revised = (df['Country'] == 'Brazil') & (df['Year'] == 2000)
+    df.loc[revised, ['GDP_Growth_Rate', 'Population_Growth_Rate']] += 1.5
+    df.to_csv(DATASET_PATH, index=False)
+    before = load_cache()
+
+    incremental_retrain(add_trees=5, compare_full=False)
+
+    cache = load_cache()
+    row = np.flatnonzero((before['country'] == 'Brazil') & (before['year'] == 2000))
+    assert len(row) == 1 and len(cache['y']) == len(before['y']) + 4 * 5 + 30
+    expected = pd.read_csv(DATASET_PATH)[revised.to_numpy()].iloc[0]
+    assert cache['y'][row[0]] == expected['GDP_Growth_Rate']
+    assert cache['X'][row[0], 1] == expected['Population_Growth_Rate']
+    assert cache['is_test'][row[0]] == before['is_test'][row[0]]
+    # Every other cached row is untouched
+    other = np.arange(len(before['y'])) != row[0]
+    np.testing.assert_array_equal(cache['X'][:len(before['y'])][other], before['X'][other])
+
+
+def test_forest_capped_at_max_trees(trained):
+    trees = RandomForestBackend.load().model.estimators_
+    incremental_retrain(add_trees=20, replace_strategy='oldest', max_trees=110, compare_full=False)
+    model = RandomForestBackend.load().model
+    assert len(model.estimators_) == 110
+    np.testing.assert_array_equal(model.estimators_[0].tree_.threshold, trees[10].tree_.threshold)
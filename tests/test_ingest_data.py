@@ -0,0 +1,155 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import DATASET_PATH, RAW_DATA_PATH, DATA_STORE_DIR
+from history_store import DATA_COLUMNS, HistoryStore
+from ingest_data import (
+    GROWTH_COLUMNS,
+    KEY_COLUMNS,
+    RAW_INDICATORS,
+    changed_rows,
+    country_file,
+    derive_growth,
+    ingest,
+    validate_raw,
+)
+
+
+def raw_levels(countries=('Brazil', 'India'), years=range(2000, 2005), seed=0):
+    """Indicator levels growing 1-5% a year"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for country in countries:
+        level = rng.uniform(50, 150, len(RAW_INDICATORS))
+        for year in years:
+            rows.append([country, year, *level])
+            level = level * rng.uniform(1.01, 1.05, len(RAW_INDICATORS))
+    return pd.DataFrame(rows, columns=KEY_COLUMNS + RAW_INDICATORS)
+
+
+def growth_of(raw, country, year):
+    rows = raw.set_index(KEY_COLUMNS)
+    return (rows.loc[(country, year)].to_numpy() / rows.loc[(country, year - 1)].to_numpy() - 1) * 100
+
+
+@pytest.fixture
+def ingested(workdir):
+    """Dataset, raw levels and store as left by an earlier ingestion of 2000-2004"""
+    raw = raw_levels()
+    raw.to_csv(RAW_DATA_PATH, index=False)
+    derived, _ = derive_growth(raw, raw[KEY_COLUMNS])
+    derived.to_csv(DATASET_PATH, index=False)
+    return raw
+
+
+def test_validate_raw_reports_lines():
+    raw = raw_levels()
+    raw.loc[1, 'GDP'] = -3.0
+    raw.loc[3, 'Year'] = 1850
+    raw.loc[4, 'Country'] = ' '
+    raw = pd.concat([raw, raw.iloc[[0]]], ignore_index=True)
+    errors = validate_raw(raw)
+    assert any(e.startswith('Indicator level must be positive: lines [3]') for e in errors)
+    assert any(e.startswith('Invalid year: lines [5]') for e in errors)
+    assert any(e.startswith('Empty country: lines [6]') for e in errors)
+    assert any(e.startswith('Duplicate country-year: lines [2, 12]') for e in errors)
+    assert validate_raw(raw.drop(columns='GDP')) == ['Missing columns: GDP']
+    assert validate_raw(raw_levels()) == []
+
+
+def test_changed_rows():
+    raw = raw_levels()
+    new = raw.copy()
+    new.loc[2, 'Population'] *= 1.1
+    extra = raw_levels(countries=('Chile',), years=[2004])
+    new = pd.concat([new, extra], ignore_index=True)
+    changed = changed_rows(new, raw)
+    assert changed[KEY_COLUMNS].values.tolist() == [['Brazil', 2002], ['Chile', 2004]]
+
+
+def test_derive_growth_needs_previous_year():
+    raw = raw_levels().drop(index=2)  # Brazil 2002 missing
+    keys = pd.DataFrame({'Country': ['Brazil', 'Brazil', 'India'], 'Year': [2001, 2003, 2000]})
+    derived, underived = derive_growth(raw, keys)
+    assert derived[KEY_COLUMNS].values.tolist() == [['Brazil', 2001]]
+    np.testing.assert_allclose(derived[GROWTH_COLUMNS].iloc[0], growth_of(raw, 'Brazil', 2001))
+    assert sorted(underived.values.tolist()) == [['Brazil', 2003], ['India', 2000]]
+
+
+def test_country_file_is_stable_and_safe():
+    name = country_file("Côte d'Ivoire")
+    assert name == country_file("Côte d'Ivoire")
+    assert name.endswith('.npy') and '/' not in name and "'" not in name
+    assert country_file('Korea, Rep.') != country_file('Korea Rep')
+
+
+def test_ingest_adds_and_updates_only_affected_years(ingested):
+    new = ingested[(ingested['Country'] == 'Brazil') & (ingested['Year'] == 2004)].copy()
+    new['Year'] = 2005
+    new[RAW_INDICATORS] *= 1.03
+    revised = ingested[(ingested['Country'] == 'India') & (ingested['Year'] == 2002)].copy()
+    revised['Exports of goods and services'] *= 1.2
+    pd.concat([new, revised]).to_csv('new_rows.csv', index=False)
+
+    assert ingest(['new_rows.csv'])
+
+    with open(f'{DATA_STORE_DIR}/manifest.json') as f:
+        entry = json.load(f)['entries'][-1]
+    assert entry['action'] == 'ingest'
+    assert entry['countries']['Brazil']['added'] == [2005]
+    assert 'updated' not in entry['countries']['Brazil']
+    # A revised level changes its own growth rate and the next year's
+    assert entry['countries']['India']['updated'] == [2002, 2003]
+    assert 'added' not in entry['countries']['India']
+
+    raw = pd.read_csv(RAW_DATA_PATH)
+    df = pd.read_csv(DATASET_PATH, float_precision='round_trip').set_index(KEY_COLUMNS)
+    assert len(df) == 9
+    for country, year in (('Brazil', 2005), ('India', 2002), ('India', 2003)):
+        np.testing.assert_allclose(df.loc[(country, year), GROWTH_COLUMNS], growth_of(raw, country, year))
+
+    # The binary store holds exactly the updated dataset
+    store = HistoryStore.from_directory(DATA_STORE_DIR)
+    expected = HistoryStore.from_frame(df.reset_index())
+    assert store.countries == expected.countries
+    for column in DATA_COLUMNS:
+        np.testing.assert_array_equal(store.column(column), expected.column(column))
+    assert store.version == entry['version']
+
+
+def test_ingest_clips_extreme_growth(ingested):
+    new = ingested[(ingested['Country'] == 'Brazil') & (ingested['Year'] == 2004)].copy()
+    new['Year'] = 2005
+    new['GDP'] *= 3
+    new.to_csv('new_rows.csv', index=False)
+    assert ingest(['new_rows.csv'])
+    df = pd.read_csv(DATASET_PATH).set_index(KEY_COLUMNS)
+    assert df.loc[('Brazil', 2005), 'GDP_Growth_Rate'] == 100.0
+    with open(f'{DATA_STORE_DIR}/manifest.json') as f:
+        assert json.load(f)['entries'][-1]['clipped_values'] == 1
+
+
+def test_ingest_is_idempotent(ingested):
+    ingested.to_csv('same.csv', index=False)
+    before = open(DATASET_PATH).read()
+    assert ingest(['same.csv'])
+    assert open(DATASET_PATH).read() == before
+
+
+def test_ingest_rejects_invalid_file(ingested):
+    bad = raw_levels(years=[2005])
+    bad.loc[0, 'GDP'] = 'n/a'
+    bad.to_csv('bad.csv', index=False)
+    before = open(DATASET_PATH).read()
+    assert not ingest(['bad.csv'])
+    assert open(DATASET_PATH).read() == before
+
+
+def test_dry_run_writes_nothing(ingested):
+    raw_levels(years=[2005]).to_csv('new_rows.csv', index=False)
+    before = open(DATASET_PATH).read()
+    assert ingest(['new_rows.csv'], dry_run=True)
+    assert open(DATASET_PATH).read() == before
@@ -0,0 +1,150 @@
+import fcntl
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+import jobs
+from config import SCENARIO_INPUT_FIELDS
+from jobs import CHUNK_FILE, LOCK_FILE, JobManager
+
+
+class LinearModel:
+    """Served-model stand-in: GDP growth = sum of the inputs (optionally slow)"""
+
+    delay = 0.0
+
+    def predict_batch(self, X):
+        time.sleep(self.delay)
+        return np.asarray(X, dtype=np.float64)[:, 1:].sum(axis=1)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # Pool workers are forked from the test process and inherit the stand-in
+    monkeypatch.setitem(jobs._worker_cache, 'model', LinearModel())
+    monkeypatch.setattr(jobs, 'JOB_CHUNK_ROWS', 10)
+    monkeypatch.setattr(jobs, 'JOB_POLL_INTERVAL', 0.05)
+    return JobManager(str(tmp_path / 'jobs'), workers=1, model_version='v1')
+
+
+def sweep_params(steps=5):
+    return {
+        'Country': 'India',
+        'country_code': 3,
+        'base': {field: 1.0 for field in SCENARIO_INPUT_FIELDS},
+        'axes': [
+            {'field': 'Exports_Growth_Rate', 'min': -10, 'max': 10, 'steps': steps},
+            {'field': 'Investment_Growth_Rate', 'min': 0, 'max': 20, 'steps': steps}
+        ]
+    }
+
+
+def wait_for(manager, job_id, statuses=jobs.FINAL_STATUSES, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {manager.get(job_id)['status']}")
+
+
+def summary(manager, job_id):
+    with open(manager.result_path(job_id)) as f:
+        return json.load(f)
+
+
+def test_sweep_runs_in_chunks(manager):
+    job, deduplicated = manager.submit('sweep', sweep_params())
+    assert not deduplicated
+    job = wait_for(manager, job['id'])
+    assert job['status'] == 'done'
+    assert job['chunks_total'] == 3 and job['chunks_done'] == 3 and job['progress'] == 1.0
+
+    result = summary(manager, job['id'])
+    assert result['shape'] == [5, 5] and result['points'] == 25
+    # Other inputs at 1.0: extremes at the axis corners
+    assert result['max']['inputs'] == {'Exports_Growth_Rate': 10.0, 'Investment_Growth_Rate': 20.0}
+    assert result['max']['predicted_gdp_growth'] == 34.0
+    assert result['min']['predicted_gdp_growth'] == -6.0
+    with np.load(manager.result_path(job['id'], jobs.ARRAYS_FILE)) as arrays:
+        assert arrays['grid'].shape == (5, 5)
+    # Chunk files are removed once combined
+    assert not [name for name in os.listdir(manager.job_dir(job['id'])) if name.startswith('chunk-')]
+
+
+def test_identical_submission_deduplicated(manager):
+    job, _ = manager.submit('sweep', sweep_params())
+    again, deduplicated = manager.submit('sweep', sweep_params())
+    assert deduplicated and again['id'] == job['id']
+    wait_for(manager, job['id'])
+    assert manager.submit('sweep', sweep_params())[1]
+    other, deduplicated = manager.submit('sweep', sweep_params(steps=6))
+    assert not deduplicated and other['id'] != job['id']
+    wait_for(manager, other['id'])
+
+
+@pytest.mark.parametrize('params, message', [
+    ({**sweep_params(), 'axes': []}, '"axes"'),
+    ({**sweep_params(), 'axes': [{'field': 'GDP', 'min': 0, 'max': 1, 'steps': 2}]}, 'Unknown axis field'),
+    ({**sweep_params(), 'base': {}}, 'missing'),
+    ({key: value for key, value in sweep_params().items() if key != 'country_code'}, 'country_code'),
+])
+def test_invalid_params(manager, params, message):
+    with pytest.raises(ValueError, match=message):
+        manager.submit('sweep', params)
+    with pytest.raises(ValueError, match='Unknown job type'):
+        manager.submit('forecast', {})
+
+
+def test_cancel_running_job(manager, monkeypatch):
+    monkeypatch.setattr(LinearModel, 'delay', 0.2)
+    job, _ = manager.submit('sweep', sweep_params(steps=10))
+    wait_for(manager, job['id'], statuses=('running',))
+    manager.cancel(job['id'])
+    job = wait_for(manager, job['id'])
+    assert job['status'] == 'cancelled'
+    assert job['chunks_done'] < job['chunks_total']
+
+
+def test_cancel_queued_job(manager):
+    with open(os.path.join(manager.jobs_dir, LOCK_FILE), 'a') as lock:
+        # Another worker holds the runner lock: the job stays queued
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        job, _ = manager.submit('sweep', sweep_params())
+        time.sleep(0.2)
+        assert manager.get(job['id'])['status'] == 'queued'
+        assert manager.cancel(job['id'])['status'] == 'cancelled'
+
+
+def test_shared_queue_and_orphaned_jobs(manager, tmp_path):
+    with open(os.path.join(manager.jobs_dir, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # A second worker on the same directory sees the job queued by the first
+        other = JobManager(manager.jobs_dir, workers=1, model_version='v1')
+        job, _ = manager.submit('sweep', sweep_params())
+        assert other.get(job['id'])['status'] == 'queued'
+        # 'running' under a runner that exited with the lock
+        orphan, _ = other.submit('sweep', sweep_params(steps=6))
+        manager._update(orphan['id'], status='running')
+
+    assert wait_for(manager, job['id'])['status'] == 'done'
+    orphan = wait_for(manager, orphan['id'])
+    assert orphan['status'] == 'failed' and 'exited' in orphan['error']
+
+
+def test_resubmitted_job_resumes_from_chunks(manager):
+    with open(os.path.join(manager.jobs_dir, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        job, _ = manager.submit('sweep', sweep_params())
+        # Chunk 0 was written by an earlier run of the same job
+        os.makedirs(manager.job_dir(job['id']), exist_ok=True)
+        manager._write_chunk(job['id'], 0, {'predictions': np.full(10, 99.0, dtype=np.float32)})
+
+    job = wait_for(manager, job['id'])
+    assert job['status'] == 'done'
+    assert summary(manager, job['id'])['max']['predicted_gdp_growth'] == 99.0
+    assert not os.path.exists(manager.result_path(job['id'], CHUNK_FILE.format(0)))
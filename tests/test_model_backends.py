@@ -0,0 +1,68 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from config import SCENARIO_MODEL_PATH
+from model_backends import BACKENDS, RandomForestBackend, get_backend, load_backend
+from train_scenario_model import prepare_features
+
+
+@pytest.fixture
+def features(dataset):
+    X, y, _, _ = prepare_features(dataset)
+    return X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+
+
+def small(name):
+    # Fewer trees / iterations keep the tests fast
+    overrides = {'random_forest': {'n_estimators': 10}, 'hist_gradient_boosting': {'max_iter': 20}}
+    return get_backend(name)(**overrides.get(name, {}))
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='Unknown model backend'):
+        get_backend('xgboost')
+
+
+@pytest.mark.parametrize('name', list(BACKENDS))
+def test_fit_save_load_round_trip(name, features, workdir):
+    X, y = features
+    backend = small(name).fit(X, y)
+    predictions = backend.predict_batch(X)
+    assert predictions.shape == (len(X),)
+    assert np.corrcoef(predictions, y)[0, 1] > 0.8
+
+    path = backend.save()
+    assert os.path.exists(path)
+    loaded = load_backend(name)
+    np.testing.assert_array_equal(loaded.predict_batch(X), predictions)
+    assert loaded.metadata()['backend'] == name
+    assert loaded.params == backend.params
+
+    importances = loaded.feature_importances()
+    if importances is not None:  # gradient boosting has none
+        assert len(importances) == X.shape[1]
+        assert np.isclose(np.sum(importances), 1.0)
+
+
+def test_linear_ignores_country(features):
+    X, y = features
+    backend = small('linear').fit(X, y)
+    shifted = X.copy()
+    shifted[:, 0] += 3
+    np.testing.assert_allclose(backend.predict_batch(shifted), backend.predict_batch(X))
+    assert backend.feature_importances()[0] == 0
+
+
+def test_plain_forest_pickle_loads_as_random_forest(features, workdir):
+    # Artifacts written before the backends existed are bare scikit-learn estimators
+    X, y = features
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0).fit(X, y)
+    joblib.dump(model, SCENARIO_MODEL_PATH)
+    backend = RandomForestBackend.load()
+    np.testing.assert_array_equal(backend.predict_batch(X), model.predict(X))
+    assert backend.params['max_depth'] == 4
+    assert backend.metadata()['n_trees'] == 5
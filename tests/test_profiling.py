@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+
+from profiling import StageTimer, format_collapsed, sample_stacks, start_sampling
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_other_threads():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_worker, args=(stop,))
+    thread.start()
+    try:
+        stacks, rounds = sample_stacks(0.2, 0.005)
+    finally:
+        stop.set()
+        thread.join()
+    assert rounds > 5
+    worker_samples = sum(count for stack, count in stacks.items() if ':busy_worker:' in stack)
+    assert 0 < worker_samples <= rounds
+    # The sampler never records itself
+    assert not any(':sample_stacks:' in stack for stack in stacks)
+
+
+def test_background_threads_excluded():
+    stop = threading.Event()
+    threads = [threading.Thread(target=busy_worker, args=(stop,), name=name)
+               for name in ('job-dispatcher', 'request-worker')]
+    for thread in threads:
+        thread.start()
+    try:
+        samples = [sample_stacks(0.1, 0.005, **kwargs) for kwargs in ({}, {'exclude': ()})]
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    # Both threads run busy_worker: one sample per round unless job-dispatcher is sampled too
+    for (stacks, rounds), threads_sampled in zip(samples, (1, 2)):
+        busy = sum(count for stack, count in stacks.items() if ':busy_worker:' in stack)
+        assert busy == threads_sampled * rounds
+
+
+def test_collapsed_format():
+    stacks = sample_stacks(0.0, 0.0)[0]
+    stacks.update({'a.py:main:1;a.py:f:2': 3, 'a.py:main:1': 1})
+    lines = format_collapsed(stacks).splitlines()
+    assert lines[0] == 'a.py:main:1;a.py:f:2 3'
+    assert lines[1] == 'a.py:main:1 1'
+
+
+def test_stage_timer_accumulates():
+    timer = StageTimer()
+    for _ in range(2):
+        with timer.stage('predict'):
+            time.sleep(0.01)
+    with timer.stage('encode'):
+        pass
+    assert timer.timings['predict'] >= 20
+    assert set(timer.timings) == {'predict', 'encode'}
+
+
+def test_start_sampling_writes_result(tmp_path):
+    path = str(tmp_path / 'profile')
+    thread = start_sampling(0.05, 0.005, path)
+    assert os.path.exists(path + '.running')
+    thread.join()
+    assert not os.path.exists(path + '.running')
+    with open(path + '.json') as f:
+        assert json.load(f)['samples'] > 0
+    assert os.path.exists(path)
@@ -0,0 +1,94 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from replay_traffic import body_agreement, replay, summarize
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echoes method, path, client header and body; /fail answers 500"""
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.received.append((self.path, self.headers.get('X-Client-Id')))
+        content = json.dumps({'method': self.command, 'path': self.path, 'body': body,
+                              'offset': self.server.offset}).encode()
+        self.send_response(500 if self.path == '/fail' else 200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    def start(offset=0):
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        httpd.received = []
+        httpd.offset = offset
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        return httpd
+
+    servers = []
+    yield start
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def target(httpd):
+    return f'http://127.0.0.1:{httpd.server_address[1]}'
+
+
+def entries():
+    return [
+        {'ts': 100.0, 'method': 'POST', 'route': '/simulate', 'path': '/simulate', 'query': '',
+         'body': {'Country': 'India'}, 'client': 'a', 'status': 200},
+        {'ts': 100.1, 'method': 'GET', 'route': '/api/history', 'path': '/api/history',
+         'query': 'country=India', 'body': None, 'client': None, 'status': 200},
+        {'ts': 100.2, 'method': 'GET', 'route': '/fail', 'path': '/fail', 'query': '',
+         'body': None, 'client': 'b', 'status': 200}
+    ]
+
+
+def test_replay_sends_captured_requests(server):
+    httpd = server()
+    results, elapsed = replay(entries(), target(httpd), speed=0, concurrency=1, timeout=5)
+    assert httpd.received == [('/simulate', 'a'), ('/api/history?country=India', None), ('/fail', 'b')]
+    assert [r['status'] for r in results] == [200, 200, 500]
+
+    summary = summarize(entries(), results, elapsed)
+    assert summary['requests'] == 3 and summary['failed'] == 0
+    assert summary['status_changed'] == 1
+    assert set(summary['routes']) == {'/simulate', '/api/history', '/fail'}
+
+
+def test_replay_follows_schedule(server):
+    results, elapsed = replay(entries(), target(server()), speed=1, concurrency=2, timeout=5)
+    assert elapsed >= 0.2
+    assert all(r['lag_ms'] is not None for r in results)
+
+
+def test_unreachable_target_counts_failures():
+    results, elapsed = replay(entries(), 'http://127.0.0.1:9', speed=0, concurrency=2, timeout=1)
+    summary = summarize(entries(), results, elapsed)
+    assert summary['failed'] == 3 and summary['latency_ms']['p50'] is None
+
+
+def test_body_agreement_between_targets(server):
+    same, changed = server(), server(offset=1)
+    baseline, _ = replay(entries(), target(same), speed=0, concurrency=1, timeout=5)
+    again, _ = replay(entries(), target(same), speed=0, concurrency=1, timeout=5)
+    other, _ = replay(entries(), target(changed), speed=0, concurrency=1, timeout=5)
+    assert body_agreement(entries(), baseline, again)['identical'] == 1.0
+    agreement = body_agreement(entries(), baseline, other)
+    assert agreement['identical'] == 0.0
+    assert agreement['routes']['/simulate'] == 0.0
@@ -0,0 +1,66 @@
+import numpy as np
+
+from config import RESPONSE_GRID_POINTS, RESPONSE_ICE_SAMPLES
+from train_scenario_model import prepare_features, compute_response_curves
+
+
+COEF = np.array([0.5, 0.2, -0.15, 0.25, 0.4, 0.1])
+
+
+class LinearModel:
+    """Known response: country code plus weighted inputs"""
+
+    def predict_batch(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return X[:, 0] + X[:, 1:] @ COEF
+
+    predict = predict_batch
+
+
+def curves_for(dataset):
+    _, _, encoder, feature_columns = prepare_features(dataset)
+    curves, meta = compute_response_curves(LinearModel(), dataset, encoder, feature_columns)
+    return curves, meta, encoder, feature_columns
+
+
+def test_shape_and_grid(dataset):
+    curves, meta, encoder, feature_columns = curves_for(dataset)
+    assert curves.shape == (len(encoder.classes_), 6, 2 + RESPONSE_ICE_SAMPLES, RESPONSE_GRID_POINTS)
+    assert curves.dtype == np.float32
+    assert not np.isnan(curves).any()
+    for j, column in enumerate(feature_columns[1:]):
+        lo, hi = np.percentile(dataset[column], [1, 99])
+        assert np.isclose(meta['grid'][j, 0], lo, rtol=1e-5)
+        assert np.isclose(meta['grid'][j, -1], hi, rtol=1e-5)
+
+
+def test_baseline_curve_varies_one_input(dataset):
+    curves, meta, encoder, feature_columns = curves_for(dataset)
+    code = int(encoder.transform(['India'])[0])
+    rows = dataset[dataset['Country'] == 'India']
+    baseline = rows[feature_columns[1:]].mean().to_numpy()
+    np.testing.assert_allclose(meta['baselines'][code], baseline, rtol=1e-5)
+
+    for j in range(6):
+        X = np.tile(np.r_[code, baseline], (RESPONSE_GRID_POINTS, 1))
+        X[:, 1 + j] = meta['grid'][j]
+        np.testing.assert_allclose(curves[code, j, 0], LinearModel().predict_batch(X), rtol=1e-5, atol=1e-5)
+
+
+def test_partial_dependence_and_ice(dataset):
+    curves, meta, encoder, feature_columns = curves_for(dataset)
+    code = int(encoder.transform(['China'])[0])
+    rows = dataset[dataset['Country'] == 'China'].sort_values('Year')
+
+    # Linear model: the mean ICE curve is the curve at the mean inputs
+    np.testing.assert_allclose(curves[code, :, 1], curves[code, :, 0], rtol=1e-4, atol=1e-4)
+
+    # ICE years are evenly spaced and include the first and last year
+    years = meta['ice_years'][code]
+    assert years[0] == rows['Year'].min() and years[-1] == rows['Year'].max()
+    assert (np.diff(years) > 0).all()
+
+    first = rows[feature_columns].to_numpy(dtype=np.float64)[0]
+    X = np.tile(first, (RESPONSE_GRID_POINTS, 1))
+    X[:, 2] = meta['grid'][1]
+    np.testing.assert_allclose(curves[code, 1, 2], LinearModel().predict_batch(X), rtol=1e-5, atol=1e-5)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from config import SCENARIO_INPUT_FIELDS
+from scenario_store import (
+    ScenarioStore,
+    artifacts_version,
+    main,
+    normalize_scenario,
+    read_scenario_file,
+    scenario_hash,
+    write_scenario_file,
+)
+
+
+def scenario(country='India', *values, label=None):
+    values = values or (1.0, 5.0, 4.0, 6.0, 5.0, 3.0)
+    result = dict(zip(['Country'] + SCENARIO_INPUT_FIELDS, [country, *values]))
+    if label is not None:
+        result['label'] = label
+    return result
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScenarioStore(str(tmp_path / 'scenarios.db'))
+
+
+def test_hash_ignores_formatting_noise():
+    a = normalize_scenario(scenario(' India ', 1.0, 5.0, 4.0, 6.0, 5.0, -0.0))
+    b = normalize_scenario(scenario('India', '1', 5.0000001, 4, 6.0, 5.0, 0.0))
+    assert scenario_hash(a) == scenario_hash(b)
+    assert scenario_hash(a) != scenario_hash(normalize_scenario(scenario('India', 1.0, 5.0, 4.0, 6.0, 5.0, 3.1)))
+
+
+def test_save_and_get_set(store):
+    summary = store.save_set('s', [scenario(label='base'), scenario('China'), scenario(label='again')],
+                             description='test')
+    assert summary['count'] == 3
+    # Identical scenarios are stored once
+    assert summary['new_scenarios'] == 2
+    assert summary['hashes'][0] == summary['hashes'][2]
+
+    saved = store.get_set('s')
+    assert saved['description'] == 'test'
+    assert [s['Country'] for s in saved['scenarios']] == ['India', 'China', 'India']
+    assert [s.get('label') for s in saved['scenarios']] == ['base', None, 'again']
+    assert store.list_sets()[0]['count'] == 3
+    assert store.get_set('missing') is None
+
+    # Saving again replaces the members
+    assert store.save_set('s', [scenario('China')])['new_scenarios'] == 0
+    assert len(store.get_set('s')['scenarios']) == 1
+
+
+def test_invalid_scenario_rejected(store):
+    with pytest.raises(ValueError, match='Scenario 1'):
+        store.save_set('s', [scenario(), {'Country': 'India'}])
+
+
+def test_results_cached_per_model_version(store):
+    hashes = store.save_set('s', [scenario(), scenario('China')])['hashes']
+    assert [row['predicted'] for row in store.set_results('s', 'v1')] == [None, None]
+
+    intervals = [[{'level': 0.9, 'lower': 1.0, 'upper': 3.0}], None]
+    store.store_results('v1', hashes, np.array([2.0, 4.5]), intervals)
+    rows = store.set_results('s', 'v1')
+    assert [row['predicted'] for row in rows] == [2.0, 4.5]
+    assert rows[0]['intervals'] == intervals[0] and rows[1]['intervals'] is None
+    # Another model version has nothing cached
+    assert [row['predicted'] for row in store.set_results('s', 'v2')] == [None, None]
+    assert store.set_results('missing', 'v1') is None
+
+
+def test_prune_keeps_one_model_version(store, monkeypatch):
+    hashes = store.save_set('s', [scenario(), scenario('China')])['hashes']
+    store.store_results('v1', hashes, [1.0, 2.0])
+    store.store_results('v2', hashes, [1.5, 2.5])
+    monkeypatch.setattr('sys.argv', ['scenario_store.py', '--db', store.path, 'prune', '--keep', 'v2'])
+    main()
+    assert [row['predicted'] for row in store.set_results('s', 'v1')] == [None, None]
+    assert [row['predicted'] for row in store.set_results('s', 'v2')] == [1.5, 2.5]
+
+
+def test_delete_keeps_shared_scenarios(store):
+    shared = store.save_set('a', [scenario(), scenario('China')])['hashes']
+    store.save_set('b', [scenario()])
+    store.store_results('v1', shared, [1.0, 2.0])
+    assert store.delete_set('a')
+    assert not store.delete_set('a')
+    rows = store.set_results('b', 'v1')
+    assert len(rows) == 1 and rows[0]['predicted'] == 1.0
+    # A set re-created with the dropped scenario finds no stale result
+    store.save_set('c', [scenario('China')])
+    assert store.set_results('c', 'v1')[0]['predicted'] is None
+
+
+@pytest.mark.parametrize('extension', ['json', 'csv'])
+def test_export_import_round_trip(store, tmp_path, extension):
+    store.save_set('s', [scenario(label='base'), scenario('China', 1, 2, 3, 4, 5, 6, label='x')])
+    path = str(tmp_path / f'set.{extension}')
+    write_scenario_file(store.get_set('s'), path)
+    scenarios, _ = read_scenario_file(path)
+    summary = store.save_set('copy', scenarios)
+    assert summary['new_scenarios'] == 0
+    assert summary['hashes'] == store.save_set('s', store.get_set('s')['scenarios'])['hashes']
+
+
+def test_artifacts_version(tmp_path):
+    a, b = tmp_path / 'model.pkl', tmp_path / 'encoder.pkl'
+    a.write_bytes(b'model')
+    version = artifacts_version([str(a), str(b)])
+    assert version == artifacts_version([str(a), str(b)])
+    b.write_bytes(b'encoder')
+    assert artifacts_version([str(a), str(b)]) != version
+    a.write_bytes(b'retrained')
+    assert artifacts_version([str(a), str(b)]) != version
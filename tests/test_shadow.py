@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+import pytest
+
+from shadow import RollingWindow, ShadowEvaluator
+
+
+class OffsetModel:
+    """Candidate stand-in: predicts the first input plus an offset"""
+
+    def __init__(self, offset):
+        self.offset = offset
+        self.calls = 0
+
+    def predict_batch(self, X):
+        self.calls += 1
+        return np.asarray(X, dtype=np.float64)[:, 1] + self.offset
+
+
+class FailingModel:
+    def predict_batch(self, X):
+        raise RuntimeError('candidate down')
+
+
+def test_rolling_window_keeps_most_recent():
+    window = RollingWindow(4)
+    window.extend([1, 2, 3])
+    assert sorted(window.recent()) == [1, 2, 3]
+    window.extend([4, 5, 6, 7, 8, 9])
+    assert sorted(window.recent()) == [6, 7, 8, 9]
+
+
+def test_routing_is_sticky_per_client():
+    evaluator = ShadowEvaluator(OffsetModel(0), traffic_fraction=0.3, shadow=False)
+    variants = [evaluator.route(f'client-{i}') for i in range(2000)]
+    assert variants == [evaluator.route(f'client-{i}') for i in range(2000)]
+    assert variants.count('candidate') / len(variants) == pytest.approx(0.3, abs=0.05)
+    assert ShadowEvaluator(OffsetModel(0), shadow=False).route('client-1') == 'primary'
+
+
+def test_shadow_comparison():
+    candidate = OffsetModel(1.0)
+    evaluator = ShadowEvaluator(candidate, traffic_fraction=0.0)
+    try:
+        X = np.column_stack([np.zeros(10), np.arange(10.0), np.zeros((10, 5))])
+        primary = X[:, 1].copy()
+        primary[0] += 0.75  # candidate 0.25 below: within the threshold
+        for _ in range(3):
+            assert evaluator.mirror(X, primary)
+        evaluator.wait_idle()
+        stats = evaluator.stats()['shadow']
+    finally:
+        evaluator.close()
+
+    assert stats['mirrored_requests'] == 3 and stats['rows_compared'] == 30
+    # Queued requests are predicted together
+    assert stats['batches'] == candidate.calls <= 3
+    assert stats['disagreement']['rows_above_threshold'] == 27
+    assert stats['disagreement']['max_abs_diff'] == 1.0
+    assert stats['disagreement']['mean_diff'] == pytest.approx((27 * 1.0 + 3 * 0.25) / 30, abs=1e-4)
+
+
+def test_full_queue_drops_mirrors():
+    evaluator = ShadowEvaluator(OffsetModel(0), queue_size=2)
+    release = threading.Event()
+    evaluator.candidate.predict_batch = lambda X: (release.wait(), np.zeros(len(X)))[1]
+    try:
+        X, primary = np.zeros((1, 7)), np.zeros(1)
+        results = [evaluator.mirror(X, primary) for _ in range(10)]
+        assert results.count(False) >= 7
+        assert evaluator.stats()['shadow']['dropped_requests'] == results.count(False)
+    finally:
+        release.set()
+        evaluator.close()
+
+
+def test_candidate_errors_counted():
+    evaluator = ShadowEvaluator(FailingModel())
+    try:
+        evaluator.mirror(np.zeros((2, 7)), np.zeros(2))
+        evaluator.wait_idle()
+        stats = evaluator.stats()['shadow']
+    finally:
+        evaluator.close()
+    assert stats['errors'] == 1 and stats['rows_compared'] == 0
+
+
+def test_served_latency_per_variant():
+    evaluator = ShadowEvaluator(OffsetModel(0), shadow=False)
+    evaluator.record_served('candidate', 2.0, rows=5)
+    evaluator.record_served('candidate', 4.0, rows=1)
+    routing = evaluator.stats()['routing']
+    assert routing['candidate']['requests'] == 2 and routing['candidate']['rows'] == 6
+    assert routing['candidate']['latency_ms']['p50'] == 3.0
+    assert routing['primary']['latency_ms'] is None
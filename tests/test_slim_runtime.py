@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from artifacts import artifact_path
+from model_backends import get_backend
+from slim_runtime import SlimEncoder, export_model, load_model
+from train_scenario_model import prepare_features
+
+
+@pytest.fixture
+def features(dataset):
+    X, y, _, _ = prepare_features(dataset)
+    return X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+
+
+@pytest.mark.parametrize('name, params', [('random_forest', {'n_estimators': 15}), ('linear', {})])
+def test_export_matches_scikit_learn(name, params, features, tmp_path):
+    X, y = features
+    backend = get_backend(name)(**params).fit(X, y)
+    path = export_model(backend, str(tmp_path / 'model.npz'))
+    slim = load_model(name, path)
+
+    # Unseen rows, including values on and around split thresholds
+    rng = np.random.default_rng(7)
+    X_new = np.column_stack([rng.integers(0, 4, 500), rng.normal(3, 6, (500, 6))])
+    if name == 'random_forest':
+        tree = backend.model.estimators_[0].tree_
+        splits = np.flatnonzero(tree.feature >= 0)[:50]
+        X_new[np.arange(len(splits)), tree.feature[splits]] = tree.threshold[splits]
+    np.testing.assert_allclose(slim.predict_batch(X_new), backend.predict_batch(X_new), rtol=1e-12, atol=1e-12)
+    assert slim.metadata() == backend.metadata()
+
+
+def test_unsupported_backend(features, tmp_path):
+    X, y = features
+    backend = get_backend('hist_gradient_boosting')(max_iter=5).fit(X, y)
+    with pytest.raises(ValueError, match='does not support'):
+        export_model(backend, str(tmp_path / 'model.npz'))
+    with pytest.raises(ValueError, match='does not support'):
+        load_model('hist_gradient_boosting')
+
+
+def test_slim_encoder_keeps_unsorted_classes():
+    # Incrementally retrained encoders append new countries at the end
+    encoder = SlimEncoder(['Brazil', 'India', 'Angola'])
+    assert encoder.transform(['Angola', 'Brazil']).tolist() == [2, 0]
+    with pytest.raises(ValueError, match='unseen'):
+        encoder.transform(['Atlantis'])
+
+
+def test_artifact_paths():
+    assert artifact_path('slim/model.npz', 'random_forest') == 'slim/model.npz'
+    assert artifact_path('slim/model.npz', 'linear') == 'slim/model_linear.npz'
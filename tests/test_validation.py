@@ -0,0 +1,36 @@
+import pytest
+
+from config import SCENARIO_INPUT_FIELDS
+from validation import validate_scenario_input, validate_scenarios
+
+
+def scenario(**overrides):
+    return {'Country': 'India', **dict.fromkeys(SCENARIO_INPUT_FIELDS, 2.5), **overrides}
+
+
+def test_valid_scenario_converted():
+    is_valid, error_msg, data = validate_scenario_input(scenario(Country=' India ', Exports_Growth_Rate='10'))
+    assert is_valid and error_msg is None
+    assert data['Country'] == 'India' and data['Exports_Growth_Rate'] == 10.0
+    assert 'label' not in data
+
+
+@pytest.mark.parametrize('data, message', [
+    ({}, 'empty'),
+    ([1], 'JSON object'),
+    ({'Country': 'India'}, 'Missing required fields'),
+    (scenario(Country='  '), 'cannot be empty'),
+    (scenario(Imports_Growth_Rate='abc'), 'must be a number'),
+    (scenario(Exports_Growth_Rate=150), 'outside reasonable range'),
+    (scenario(Exports_Growth_Rate=1e308), 'outside reasonable range'),
+])
+def test_invalid_scenario(data, message):
+    is_valid, error_msg, data = validate_scenario_input(data)
+    assert not is_valid and data is None
+    assert message in error_msg
+
+
+def test_validate_scenarios_keeps_labels_and_indexes_errors():
+    validated, errors = validate_scenarios([scenario(label='base'), scenario(Exports_Growth_Rate=-101), scenario()])
+    assert [s.get('label') for s in validated] == ['base', None]
+    assert errors == [{'index': 1, 'message': 'Exports_Growth_Rate value -101.0 is outside reasonable range (-100 to 100)'}]
@@ -12,14 +12,49 @@ GDP = Consumption + Investment + Government + (Exports - Imports)
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import joblib
+import argparse
+import json
+import os
+import shutil
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
-from config import DATASET_PATH
+from model_backends import RandomForestBackend, get_backend
+from conformal import fit_conformal_table, ConformalTable
+from artifacts import artifact_path, model_path, serving_artifacts
+from scenario_store import artifacts_version
+from slim_runtime import SLIM_MODELS, export_model
+from history_store import HistoryStore, DATA_COLUMNS
+from analogs import AnalogIndex
+from ingest_data import update_store
+from config import (
+    DATASET_PATH,
+    MODEL_BACKEND,
+    SCENARIO_ENCODER_PATH,
+    FEATURE_INFO_PATH,
+    FEATURE_CACHE_PATH,
+    CONFORMAL_PATH,
+    CONFORMAL_CALIBRATION_FRACTION,
+    RETRAIN_ADD_TREES,
+    RETRAIN_RECENT_YEARS,
+    RETRAIN_MAX_TREES,
+    SCENARIO_INPUT_FIELDS,
+    RESPONSE_CURVES_PATH,
+    RESPONSE_META_PATH,
+    RESPONSE_GRID_POINTS,
+    RESPONSE_GRID_PERCENTILES,
+    RESPONSE_ICE_SAMPLES,
+    SLIM_DIR,
+    SLIM_ENCODER_PATH,
+    SLIM_FEATURE_INFO_PATH,
+    SLIM_MANIFEST_PATH,
+    SLIM_HISTORY_DIR,
+    SLIM_ANALOG_REFERENCE_PATH
+)
 
 
 def prepare_features(df, encoder=None, fit_encoder=False):
@@ -56,13 +91,13 @@ def prepare_features(df, encoder=None, fit_encoder=False):
 
 def evaluate_model(model, X_train, y_train, X_test, y_test):
     """
-    Evaluate model performance
+    Evaluate model performance (model is a model_backends backend)
     """
     print("\n📈 Model Performance:")
     print("=" * 60)
     
     # Training performance
-    y_train_pred = model.predict(X_train)
+    y_train_pred = model.predict_batch(X_train)
     train_r2 = r2_score(y_train, y_train_pred)
     train_rmse = np.sqrt(mean_squared_error(y_train, y_train_pred))
     train_mae = mean_absolute_error(y_train, y_train_pred)
@@ -73,7 +108,7 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     print(f"   MAE: {train_mae:.4f}")
     
     # Test performance
-    y_test_pred = model.predict(X_test)
+    y_test_pred = model.predict_batch(X_test)
     test_r2 = r2_score(y_test, y_test_pred)
     test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
     test_mae = mean_absolute_error(y_test, y_test_pred)
@@ -85,23 +120,25 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     
     print("=" * 60)
     
-    # Feature importance
-    feature_importance = pd.DataFrame({
-        'Feature': [
-            'Country',
-            'Population Growth',
-            'Exports Growth',
-            'Imports Growth',
-            'Investment Growth',
-            'Consumption Growth',
-            'Government Spending Growth'
-        ],
-        'Importance': model.feature_importances_
-    }).sort_values('Importance', ascending=False)
-    
-    print("\n🔍 Feature Importance (Economic Drivers):")
-    for idx, row in feature_importance.iterrows():
-        print(f"   {row['Feature']}: {row['Importance']:.4f}")
+    # Feature importance (not every backend provides it)
+    importances = model.feature_importances()
+    if importances is not None:
+        feature_importance = pd.DataFrame({
+            'Feature': [
+                'Country',
+                'Population Growth',
+                'Exports Growth',
+                'Imports Growth',
+                'Investment Growth',
+                'Consumption Growth',
+                'Government Spending Growth'
+            ],
+            'Importance': importances
+        }).sort_values('Importance', ascending=False)
+        
+        print("\n🔍 Feature Importance (Economic Drivers):")
+        for idx, row in feature_importance.iterrows():
+            print(f"   {row['Feature']}: {row['Importance']:.4f}")
     
     return {
         'train_r2': train_r2,
@@ -111,7 +148,212 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     }
 
 
-def main():
+def compute_response_curves(model, df, encoder, feature_columns):
+    """
+    Precompute response curves for every country and scenario input
+
+    For each input the grid spans the global percentile range of that input.
+    Curve 0 holds the other inputs at the country baseline (historical mean),
+    curve 1 is the partial dependence (mean ICE over all country-years) and
+    the remaining curves are ICE curves for evenly spaced country-years.
+
+    Returns: (curves, meta) where curves is float32 with shape
+    (countries, inputs, 2 + RESPONSE_ICE_SAMPLES, RESPONSE_GRID_POINTS)
+    """
+    input_columns = feature_columns[1:]
+    n_countries = len(encoder.classes_)
+    n_inputs = len(input_columns)
+    n_grid = RESPONSE_GRID_POINTS
+    n_ice = RESPONSE_ICE_SAMPLES
+    
+    low, high = RESPONSE_GRID_PERCENTILES
+    grid = np.empty((n_inputs, n_grid), dtype=np.float32)
+    for j, column in enumerate(input_columns):
+        lo, hi = np.percentile(df[column], [low, high])
+        grid[j] = np.linspace(lo, hi, n_grid)
+    
+    curves = np.full((n_countries, n_inputs, 2 + n_ice, n_grid), np.nan, dtype=np.float32)
+    baselines = np.full((n_countries, n_inputs), np.nan, dtype=np.float32)
+    ice_years = np.full((n_countries, n_ice), -1, dtype=np.int16)
+    
+    for code, rows in df.groupby('Country_Encoded'):
+        rows = rows.sort_values('Year')
+        X_rows = rows[feature_columns].to_numpy(dtype=np.float64)
+        baseline = X_rows.mean(axis=0)
+        baselines[code] = baseline[1:]
+        
+        # Evenly spaced country-years for the stored ICE curves
+        n_samples = min(n_ice, len(rows))
+        ice_idx = np.linspace(0, len(rows) - 1, n_samples).round().astype(int)
+        ice_years[code, :n_samples] = rows['Year'].to_numpy()[ice_idx]
+        
+        # One batched predict per country: baseline + every row, per input
+        base_and_rows = np.vstack([baseline, X_rows])
+        n_points = len(base_and_rows)
+        X_grid = np.repeat(base_and_rows[None, :, :], n_inputs * n_grid, axis=0)
+        X_grid = X_grid.reshape(n_inputs, n_grid, n_points, len(feature_columns))
+        for j in range(n_inputs):
+            X_grid[j, :, :, j + 1] = grid[j][:, None]
+        
+        y_grid = model.predict_batch(X_grid.reshape(-1, len(feature_columns)))
+        y_grid = y_grid.reshape(n_inputs, n_grid, n_points)
+        
+        curves[code, :, 0, :] = y_grid[:, :, 0]
+        curves[code, :, 1, :] = y_grid[:, :, 1:].mean(axis=2)
+        curves[code, :, 2:2 + n_samples, :] = y_grid[:, :, 1 + ice_idx].transpose(0, 2, 1)
+    
+    meta = {
+        'grid': grid,
+        'baselines': baselines,
+        'ice_years': ice_years,
+        'input_fields': np.array(SCENARIO_INPUT_FIELDS)
+    }
+    return curves, meta
+
+
+def calibrate_intervals(model, X_calib, y_calib, n_countries):
+    """
+    Conformal interval table from absolute residuals on the calibration split
+    """
+    X_calib = np.asarray(X_calib, dtype=np.float64)
+    residuals = np.abs(np.asarray(y_calib, dtype=np.float64) - model.predict_batch(X_calib))
+    return fit_conformal_table(residuals, X_calib[:, 0], X_calib[:, 1:], n_countries)
+
+
+def report_interval_coverage(model, conformal_table, X_test, y_test):
+    """
+    Print empirical coverage and mean width of the intervals on the test set
+    """
+    X_test = np.asarray(X_test, dtype=np.float64)
+    y_test = np.asarray(y_test, dtype=np.float64)
+    widths = ConformalTable(conformal_table).half_widths(X_test[:, 0], X_test[:, 1:])
+    errors = np.abs(y_test - model.predict_batch(X_test))[:, None]
+    coverage = (errors <= widths).mean(axis=0)
+    for level, covered, width in zip(conformal_table['levels'], coverage, widths.mean(axis=0)):
+        print(f"   {level:.0%} interval: test coverage {covered:.1%}, mean width ±{width:.2f}")
+
+
+def save_artifacts(model, encoder, feature_columns, df, conformal_table=None):
+    """
+    Save model, encoder, feature info, interval table and the precomputed response curves
+    """
+    encoder_path = SCENARIO_ENCODER_PATH
+    
+    print(f"\n💾 Saving {model.name} model to: {model_path(model.name)}")
+    model.save()
+    
+    print(f"💾 Saving encoder to: {encoder_path}")
+    joblib.dump(encoder, encoder_path)
+    
+    # Save feature columns for API
+    feature_info = {
+        'feature_columns': feature_columns,
+        'feature_names': [
+            'Country_Encoded',
+            'Population_Growth_Rate',
+            'Exports_Growth_Rate',
+            'Imports_Growth_Rate',
+            'Investment_Growth_Rate',
+            'Consumption_Growth_Rate',
+            'Govt_Spend_Growth_Rate'
+        ]
+    }
+    joblib.dump(feature_info, FEATURE_INFO_PATH)
+    print(f"💾 Saving feature info to: {FEATURE_INFO_PATH}")
+    
+    if conformal_table is not None:
+        conformal_path = artifact_path(CONFORMAL_PATH, model.name)
+        np.savez(conformal_path, **conformal_table)
+        print(f"💾 Saving interval table to: {conformal_path}")
+    
+    # Precompute response curves for slider-driven UIs
+    print(f"\n📉 Precomputing response curves ({RESPONSE_GRID_POINTS}-point grid)...")
+    curves, curves_meta = compute_response_curves(model, df, encoder, feature_columns)
+    curves_path = artifact_path(RESPONSE_CURVES_PATH, model.name)
+    meta_path = artifact_path(RESPONSE_META_PATH, model.name)
+    np.save(curves_path, curves)
+    np.savez(meta_path, **curves_meta)
+    print(f"💾 Saving response curves to: {curves_path} ({curves.nbytes / 1e6:.1f} MB)")
+    print(f"💾 Saving response metadata to: {meta_path}")
+    
+    export_slim_artifacts(model, encoder, feature_info, df)
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def export_slim_artifacts(model, encoder, feature_info, df):
+    """
+    Export model, encoder classes, feature info and a per-country history
+    snapshot as NumPy / JSON for the slim serving runtime (SLIM_RUNTIME=1)
+    """
+    if model.name not in SLIM_MODELS:
+        print(f"⚠️ Slim export skipped: {model.name} is not supported by the slim runtime")
+        return
+    
+    os.makedirs(SLIM_DIR, exist_ok=True)
+    print(f"\n📦 Exporting slim runtime artifacts to: {SLIM_DIR}/")
+    print(f"💾 Saving slim model to: {export_model(model)}")
+    _write_json(SLIM_ENCODER_PATH, {'classes': encoder.classes_.tolist()})
+    _write_json(SLIM_FEATURE_INFO_PATH, feature_info)
+    
+    # Same rows and float parsing as the full runtime's CSV load
+    shutil.rmtree(SLIM_HISTORY_DIR, ignore_errors=True)
+    update_store(df[['Country'] + DATA_COLUMNS], df['Country'].unique().tolist(), store_dir=SLIM_HISTORY_DIR)
+    print(f"💾 Saving history snapshot to: {SLIM_HISTORY_DIR}/")
+    
+    # Nearest-neighbour distances of the snapshot, so slim startup skips the O(n^2) scan
+    snapshot = HistoryStore.from_directory(SLIM_HISTORY_DIR)
+    np.save(SLIM_ANALOG_REFERENCE_PATH, AnalogIndex.from_store(snapshot).reference_distances)
+    
+    # Cached scenario results are keyed by the full-runtime model version
+    manifest = {'models': {}}
+    if os.path.exists(SLIM_MANIFEST_PATH):
+        with open(SLIM_MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    manifest['models'][model.name] = {
+        'model_version': artifacts_version(serving_artifacts(model.name)),
+        'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+    _write_json(SLIM_MANIFEST_PATH, manifest)
+
+
+def export_existing(backend_name):
+    """Export already-trained artifacts for the slim runtime without retraining"""
+    backend = get_backend(backend_name).load()
+    encoder = joblib.load(SCENARIO_ENCODER_PATH)
+    feature_info = joblib.load(FEATURE_INFO_PATH)
+    df = pd.read_csv(DATASET_PATH)
+    export_slim_artifacts(backend, encoder, feature_info, df)
+    print("\n✅ Slim export complete!")
+
+
+def save_feature_cache(df, X, y, test_index, calib_index):
+    """
+    Cache the prepared feature matrix so incremental retraining can reuse it
+
+    Rows are keyed by (Country, Year); is_test marks the holdout split and
+    is_calib the conformal calibration split.
+    """
+    is_test = np.zeros(len(X), dtype=bool)
+    is_test[X.index.get_indexer(test_index)] = True
+    is_calib = np.zeros(len(X), dtype=bool)
+    is_calib[X.index.get_indexer(calib_index)] = True
+    np.savez(
+        FEATURE_CACHE_PATH,
+        X=X.to_numpy(dtype=np.float64),
+        y=y.to_numpy(dtype=np.float64),
+        country=df['Country'].to_numpy(dtype=str),
+        year=df['Year'].to_numpy(dtype=np.int64),
+        is_test=is_test,
+        is_calib=is_calib
+    )
+    print(f"💾 Saving feature cache to: {FEATURE_CACHE_PATH}")
+
+
+def main(backend_name=MODEL_BACKEND):
     """
     Main training pipeline for GDP Scenario Simulator
     """
@@ -145,22 +387,23 @@ def main():
         shuffle=True
     )
     
-    print(f"   Training: {len(X_train)} samples (80%)")
+    # Calibration rows for the conformal intervals are never fitted on
+    X_train, X_calib, y_train, y_calib = train_test_split(
+        X_train, y_train,
+        test_size=CONFORMAL_CALIBRATION_FRACTION,
+        random_state=42,
+        shuffle=True
+    )
+    
+    print(f"   Training: {len(X_train)} samples")
+    print(f"   Calibration: {len(X_calib)} samples (conformal intervals)")
     print(f"   Test: {len(X_test)} samples (20%)")
     
     # Train model
-    print(f"\n🤖 Training Random Forest Regressor...")
+    backend = get_backend(backend_name)()
+    print(f"\n🤖 Training {backend_name} backend ({backend.build().__class__.__name__})...")
     
-    model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=15,
-        min_samples_split=5,
-        min_samples_leaf=2,
-        random_state=42,
-        n_jobs=-1
-    )
-    
-    model.fit(X_train, y_train)
+    model = backend.fit(X_train, y_train)
     print(f"   ✅ Training complete!")
     
     # Evaluate model
@@ -174,31 +417,14 @@ def main():
     else:
         print(f"\n⚠️ Below target. Test R² = {results['test_r2']:.4f} (<80%)")
     
-    # Save model and encoder
-    model_path = "gdp_scenario_model.pkl"
-    encoder_path = "country_encoder_scenario.pkl"
+    # Conformal prediction intervals from the calibration split
+    print("\n📏 Calibrating prediction intervals...")
+    conformal_table = calibrate_intervals(model, X_calib, y_calib, len(encoder.classes_))
+    report_interval_coverage(model, conformal_table, X_test, y_test)
     
-    print(f"\n💾 Saving model to: {model_path}")
-    joblib.dump(model, model_path)
-    
-    print(f"💾 Saving encoder to: {encoder_path}")
-    joblib.dump(encoder, encoder_path)
-    
-    # Save feature columns for API
-    feature_info = {
-        'feature_columns': feature_columns,
-        'feature_names': [
-            'Country_Encoded',
-            'Population_Growth_Rate',
-            'Exports_Growth_Rate',
-            'Imports_Growth_Rate',
-            'Investment_Growth_Rate',
-            'Consumption_Growth_Rate',
-            'Govt_Spend_Growth_Rate'
-        ]
-    }
-    joblib.dump(feature_info, 'feature_info_scenario.pkl')
-    print(f"💾 Saving feature info to: feature_info_scenario.pkl")
+    # Save model, encoder, feature info, feature cache, intervals and response curves
+    save_artifacts(model, encoder, feature_columns, df, conformal_table)
+    save_feature_cache(df, X, y, X_test.index, X_calib.index)
     
     print("\n✅ Training pipeline complete!")
     print("=" * 60)
@@ -221,7 +447,7 @@ def main():
         2.0           # Government: 2%
     ]
     
-    predicted_gdp = model.predict([scenario_features])[0]
+    predicted_gdp = model.predict_batch([scenario_features])[0]
     print(f"   Country: {sample_country}")
     print(f"   Predicted GDP Growth: {predicted_gdp:.2f}%")
     
@@ -232,5 +458,205 @@ def main():
     print("   ❌ NOT for forecasting future GDP")
 
 
+def extend_encoder(encoder, countries):
+    """
+    Append unseen countries to a fitted LabelEncoder
+
+    Existing countries keep their codes; new ones get the next free codes.
+    (LabelEncoder maps object labels through a lookup table, so classes_
+    does not need to stay sorted.)
+    """
+    known = set(encoder.classes_)
+    new_countries = sorted(set(countries) - known)
+    if new_countries:
+        encoder.classes_ = np.concatenate([
+            encoder.classes_.astype(object),
+            np.array(new_countries, dtype=object)
+        ])
+    return new_countries
+
+
+def score_trees(model, X, y):
+    """Holdout MSE of every tree in the forest (oldest first)"""
+    X = np.asarray(X, dtype=np.float32)
+    return np.array([mean_squared_error(y, tree.predict(X)) for tree in model.estimators_])
+
+
+def incremental_retrain(add_trees=RETRAIN_ADD_TREES, replace_trees=0, replace_strategy='worst',
+                        recent_years=RETRAIN_RECENT_YEARS, max_trees=RETRAIN_MAX_TREES, compare_full=True):
+    """
+    Warm-start retraining: grow (and optionally refresh) the current forest
+    (random_forest backend only)
+
+    New trees are fitted on country-years missing from the feature cache,
+    cached country-years whose values changed in the dataset, and the most
+    recent `recent_years` of cached training data. Before growing,
+    `replace_trees` trees are dropped - the oldest ones or the ones with the
+    worst holdout MSE - plus as many more as needed to stay within `max_trees`.
+    """
+    print("=" * 60)
+    print("GDP ECONOMIC SCENARIO SIMULATOR - Incremental Retraining")
+    print("=" * 60)
+    
+    # Load current forest, encoder and cached feature matrix
+    backend = RandomForestBackend.load()
+    model = backend.model
+    encoder = joblib.load(SCENARIO_ENCODER_PATH)
+    feature_columns = joblib.load(FEATURE_INFO_PATH)['feature_columns']
+    with np.load(FEATURE_CACHE_PATH) as cache:
+        cache = {key: cache[key] for key in cache.files}
+    print(f"\n📂 Loaded model ({len(model.estimators_)} trees) and feature cache ({len(cache['y'])} rows)")
+    
+    # Only encode rows that are not in the cache yet or whose values changed
+    print(f"📂 Loading data from: {DATASET_PATH}")
+    df = pd.read_csv(DATASET_PATH)
+    cached_keys = pd.DataFrame({
+        'Country': cache['country'], 'Year': cache['year'], 'cache_row': np.arange(len(cache['y']))
+    })
+    cache_row = df.merge(cached_keys, on=['Country', 'Year'], how='left')['cache_row'].to_numpy()
+    is_new = np.isnan(cache_row)
+    
+    matched = np.flatnonzero(~is_new)
+    rows = cache_row[matched].astype(np.int64)
+    current = df.iloc[matched]
+    changed = ~np.isclose(current[feature_columns[1:]].to_numpy(dtype=np.float64), cache['X'][rows, 1:],
+                          rtol=1e-12, atol=0, equal_nan=True).all(axis=1)
+    changed |= ~np.isclose(current['GDP_Growth_Rate'].to_numpy(dtype=np.float64), cache['y'][rows],
+                           rtol=1e-12, atol=0, equal_nan=True)
+    df_updated = current[changed].copy()
+    updated_rows = rows[changed]
+    df_new = df[is_new].copy()
+    
+    new_countries = extend_encoder(encoder, df_new['Country'])
+    print(f"   New country-years: {len(df_new)}")
+    print(f"   Updated country-years: {len(df_updated)}")
+    print(f"   New countries: {len(new_countries)}{' (' + ', '.join(new_countries) + ')' if new_countries else ''}")
+    
+    # Revised rows keep their holdout/calibration assignment
+    if len(df_updated):
+        X_updated, y_updated, _, _ = prepare_features(df_updated, encoder=encoder)
+        cache['X'][updated_rows] = X_updated.to_numpy(dtype=np.float64)
+        cache['y'][updated_rows] = y_updated.to_numpy(dtype=np.float64)
+    
+    if len(df_new):
+        X_new, y_new, _, _ = prepare_features(df_new, encoder=encoder)
+        new_test = np.zeros(len(df_new), dtype=bool)
+        if len(df_new) >= 5:
+            _, test_idx = train_test_split(np.arange(len(df_new)), test_size=0.2, random_state=42)
+            new_test[test_idx] = True
+        cache = {
+            'X': np.vstack([cache['X'], X_new.to_numpy(dtype=np.float64)]),
+            'y': np.concatenate([cache['y'], y_new.to_numpy(dtype=np.float64)]),
+            'country': np.concatenate([cache['country'], df_new['Country'].to_numpy(dtype=str)]),
+            'year': np.concatenate([cache['year'], df_new['Year'].to_numpy(dtype=np.int64)]),
+            'is_test': np.concatenate([cache['is_test'], new_test]),
+            'is_calib': np.concatenate([cache['is_calib'], np.zeros(len(df_new), dtype=bool)])
+        }
+    
+    is_new_row = np.zeros(len(cache['y']), dtype=bool)
+    is_new_row[len(cache['y']) - len(df_new):] = True
+    is_new_row[updated_rows] = True
+    is_recent = cache['year'] > cache['year'].max() - recent_years
+    train_mask = ~cache['is_test'] & ~cache['is_calib'] & (is_new_row | is_recent)
+    
+    X_holdout = cache['X'][cache['is_test']]
+    y_holdout = cache['y'][cache['is_test']]
+    before_pred = backend.predict_batch(X_holdout)
+    before_r2 = r2_score(y_holdout, before_pred)
+    before_mae = mean_absolute_error(y_holdout, before_pred)
+    
+    start_time = time.perf_counter()
+    
+    # Drop the oldest or worst-scoring trees, including any beyond max_trees
+    n_trees = len(model.estimators_)
+    n_total = min(n_trees + add_trees, max_trees)
+    n_drop = min(replace_trees + n_trees + add_trees - n_total, n_trees)
+    if n_drop:
+        if replace_strategy == 'oldest':
+            drop = np.arange(n_drop)
+        else:
+            drop = np.argsort(score_trees(model, X_holdout, y_holdout))[-n_drop:]
+        keep = np.setdiff1d(np.arange(n_trees), drop)
+        model.estimators_ = [model.estimators_[i] for i in keep]
+        print(f"\n♻️  Dropped {len(drop)} {replace_strategy} trees")
+    
+    # Grow the forest on new + updated + recent data
+    print(f"\n🌲 Growing forest to {n_total} trees on {train_mask.sum()} new/updated/recent rows...")
+    model.set_params(warm_start=True, n_estimators=n_total)
+    model.fit(cache['X'][train_mask], cache['y'][train_mask])
+    model.set_params(warm_start=False)
+    retrain_time = time.perf_counter() - start_time
+    
+    after_pred = backend.predict_batch(X_holdout)
+    after_r2 = r2_score(y_holdout, after_pred)
+    after_mae = mean_absolute_error(y_holdout, after_pred)
+    
+    print("\n📈 Incremental Retrain Report:")
+    print("=" * 60)
+    print(f"   Retrain wall time: {retrain_time:.2f}s")
+    print(f"   Holdout R²:  {before_r2:.4f} -> {after_r2:.4f} ({after_r2 - before_r2:+.4f})")
+    print(f"   Holdout MAE: {before_mae:.4f} -> {after_mae:.4f} ({after_mae - before_mae:+.4f})")
+    
+    if compare_full:
+        full_start = time.perf_counter()
+        full_model = RandomForestBackend(**{**backend.params, 'n_estimators': n_total})
+        fit_mask = ~cache['is_test'] & ~cache['is_calib']
+        full_model.fit(cache['X'][fit_mask], cache['y'][fit_mask])
+        full_time = time.perf_counter() - full_start
+        full_r2 = r2_score(y_holdout, full_model.predict_batch(X_holdout))
+        print(f"   Full refit wall time: {full_time:.2f}s ({full_time / retrain_time:.1f}x the incremental retrain)")
+        print(f"   Full refit holdout R²: {full_r2:.4f} (incremental {after_r2 - full_r2:+.4f})")
+    print("=" * 60)
+    
+    # Recalibrate the intervals for the updated forest
+    conformal_table = calibrate_intervals(
+        backend, cache['X'][cache['is_calib']], cache['y'][cache['is_calib']], len(encoder.classes_)
+    )
+    
+    prepare_features(df, encoder=encoder)  # adds Country_Encoded for the response curves
+    save_artifacts(backend, encoder, feature_columns, df, conformal_table)
+    np.savez(FEATURE_CACHE_PATH, **cache)
+    print(f"💾 Saving feature cache to: {FEATURE_CACHE_PATH}")
+    
+    print("\n✅ Incremental retraining complete!")
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Train the GDP scenario simulator model')
+    parser.add_argument('--backend', default=MODEL_BACKEND,
+                        help='Model backend to train (random_forest, hist_gradient_boosting, linear)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Warm-start the current forest instead of refitting from scratch')
+    parser.add_argument('--add-trees', type=int, default=RETRAIN_ADD_TREES,
+                        help='Trees to add on new/recent data (incremental mode)')
+    parser.add_argument('--replace-trees', type=int, default=0,
+                        help='Trees to drop and retrain (incremental mode)')
+    parser.add_argument('--replace-strategy', choices=['worst', 'oldest'], default='worst',
+                        help='Which trees to replace: worst holdout MSE or oldest')
+    parser.add_argument('--recent-years', type=int, default=RETRAIN_RECENT_YEARS,
+                        help='Cached years included in the warm-start fit')
+    parser.add_argument('--max-trees', type=int, default=RETRAIN_MAX_TREES,
+                        help='Forest size cap; the oldest/worst trees beyond it are dropped (incremental mode)')
+    parser.add_argument('--no-compare-full', action='store_true',
+                        help='Skip the full-refit comparison')
+    parser.add_argument('--export-slim', action='store_true',
+                        help='Only export the trained artifacts for the slim runtime')
+    args = parser.parse_args()
+    
+    if args.incremental and args.backend != RandomForestBackend.name:
+        parser.error(f"--incremental warm-starts the random_forest model; "
+                     f"backend '{args.backend}' must be retrained from scratch (drop --incremental)")
+    
+    if args.export_slim:
+        export_existing(args.backend)
+    elif args.incremental:
+        incremental_retrain(
+            add_trees=args.add_trees,
+            replace_trees=args.replace_trees,
+            replace_strategy=args.replace_strategy,
+            recent_years=args.recent_years,
+            max_trees=args.max_trees,
+            compare_full=not args.no_compare_full
+        )
+    else:
+        main(args.backend)
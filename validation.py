@@ -0,0 +1,85 @@
+"""
+GDP Economic Scenario Simulator - Input Validation
+Scenario checks shared by the API (app_scenario.py) and the scenario store CLI
+"""
+
+
+def validate_scenario_input(data):
+    """
+    Validate incoming scenario simulation request
+    
+    Returns: (is_valid, error_message, validated_data)
+    """
+    required_fields = [
+        'Country',
+        'Population_Growth_Rate',
+        'Exports_Growth_Rate',
+        'Imports_Growth_Rate',
+        'Investment_Growth_Rate',
+        'Consumption_Growth_Rate',
+        'Govt_Spend_Growth_Rate'
+    ]
+    
+    # Check if data exists
+    if not data:
+        return False, 'Request body is empty', None
+    if not isinstance(data, dict):
+        return False, 'Request body must be a JSON object', None
+    
+    # Check for missing fields
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        return False, f'Missing required fields: {", ".join(missing_fields)}', None
+    
+    validated_data = {}
+    
+    # Validate country
+    try:
+        validated_data['Country'] = str(data['Country']).strip()
+        if not validated_data['Country']:
+            return False, 'Country name cannot be empty', None
+    except Exception:
+        return False, 'Invalid Country value', None
+    
+    # Validate numeric fields
+    numeric_fields = [
+        'Population_Growth_Rate',
+        'Exports_Growth_Rate',
+        'Imports_Growth_Rate',
+        'Investment_Growth_Rate',
+        'Consumption_Growth_Rate',
+        'Govt_Spend_Growth_Rate'
+    ]
+    
+    for field in numeric_fields:
+        try:
+            value = float(data[field])
+            
+            # Check for reasonable ranges (-100% to +100%)
+            if not -100 <= value <= 100:
+                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
+            
+            validated_data[field] = value
+        except (ValueError, TypeError):
+            return False, f'Invalid {field} value: must be a number', None
+    
+    return True, None, validated_data
+
+
+def validate_scenarios(scenarios):
+    """
+    Validate the scenarios of a set (labels are kept)
+
+    Returns: (validated scenarios, [{'index': ..., 'message': ...} per invalid scenario])
+    """
+    validated = []
+    errors = []
+    for index, scenario in enumerate(scenarios):
+        is_valid, error_msg, validated_data = validate_scenario_input(scenario)
+        if is_valid:
+            if scenario.get('label') is not None:
+                validated_data['label'] = str(scenario['label'])
+            validated.append(validated_data)
+        else:
+            errors.append({'index': index, 'message': error_msg})
+    return validated, errors